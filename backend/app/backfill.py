@@ -0,0 +1,202 @@
+"""Bulk universe backfill.
+
+Downloads companyfacts payloads on the shared rate-limited SEC client and feeds
+them to a process pool that runs extraction, normalization and feature
+engineering into the processed store. Progress is appended to a JSONL file so
+an interrupted run resumes where it stopped.
+
+    python -m app.backfill --universe company_tickers.json --workers 8
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+from app.config import CIK_MAPPING, DATA_PROCESSED_DIR
+from app.services.ingestion_service import IngestionService, load_company_tickers
+from app.services.pipeline_service import PipelineService
+from app.services.processed_store import ProcessedStore
+from app.services.sec_client import SECClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROGRESS_PATH = DATA_PROCESSED_DIR / "backfill_progress.jsonl"
+DONE_STATUSES = {"built", "current", "unchanged"}
+
+
+class BackfillStats:
+    """Running counters reported as tickers/s and MB/s."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.started = time.monotonic()
+        self.counts: Dict[str, int] = {}
+        self.downloaded_bytes = 0
+        self.processed_bytes = 0
+
+    def record(self, result: Dict[str, Any]) -> None:
+        self.counts[result["status"]] = self.counts.get(result["status"], 0) + 1
+        self.processed_bytes += result.get("raw_bytes", 0)
+
+    @property
+    def completed(self) -> int:
+        return sum(self.counts.values())
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "counts": dict(self.counts),
+            "elapsed_s": round(elapsed, 2),
+            "tickers_per_s": round(self.completed / elapsed, 2),
+            "download_mb_per_s": round(self.downloaded_bytes / elapsed / 1e6, 2),
+            "processed_mb_per_s": round(self.processed_bytes / elapsed / 1e6, 2),
+        }
+
+
+def read_progress(progress_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Returns the latest progress record per ticker."""
+    progress = {}
+    if not progress_path.exists():
+        return progress
+    with open(progress_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Tolerate a torn last line from an interrupted run
+                continue
+            progress[record["ticker"]] = record
+    return progress
+
+
+async def run_backfill(
+    universe: Dict[str, Optional[int]],
+    workers: int = os.cpu_count() or 1,
+    download_concurrency: int = 8,
+    progress_path: Path = DEFAULT_PROGRESS_PATH,
+    resume: bool = True,
+    refresh_raw: bool = False,
+    client: Optional[SECClient] = None,
+) -> Dict[str, Any]:
+    """Runs the download -> transform pipeline over a ticker universe."""
+    done = read_progress(progress_path) if resume else {}
+    pending = [t for t in universe if done.get(t, {}).get("status") not in DONE_STATUSES]
+    stats = BackfillStats(len(pending))
+    logger.info(f"Backfill starting | {len(pending)} pending of {len(universe)} tickers")
+
+    client = client or SECClient()
+    loop = asyncio.get_running_loop()
+    # Bounded hand-off so downloads cannot run arbitrarily far ahead of the pool
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(workers, 1) * 2)
+    download_slots = asyncio.Semaphore(download_concurrency)
+    # Spawn, not fork: this process already runs the event loop, the HTTP client and to_thread workers
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 0 else ThreadPoolExecutor(max_workers=1)
+    )
+
+    progress_path.parent.mkdir(parents=True, exist_ok=True)
+    progress_file = open(progress_path, "a")
+
+    def finish(result: Dict[str, Any]) -> None:
+        stats.record(result)
+        progress_file.write(json.dumps(result) + "\n")
+        progress_file.flush()
+        if stats.completed % 100 == 0 or stats.completed == stats.total:
+            logger.info(f"Backfill progress | {stats.summary()}")
+
+    async def download(ticker: str) -> None:
+        raw_path = IngestionService.raw_path(ticker)
+        if refresh_raw or not raw_path.exists():
+            cik = universe[ticker] or IngestionService.resolve_cik(ticker)
+            if not cik:
+                finish({"ticker": ticker, "status": "failed", "error": "unknown CIK"})
+                return
+            try:
+                async with download_slots:
+                    # Conditional on the cached copy's validators, so unchanged filers cost a 304
+                    outcome = await IngestionService.refresh_raw_async(ticker, cik, client)
+            except Exception as e:
+                outcome = None
+                logger.error(f"Backfill download failed for {ticker}: {e}")
+            if outcome is None:
+                finish({"ticker": ticker, "status": "failed", "error": "download failed"})
+                return
+            raw_path = IngestionService.raw_path(ticker)
+            if outcome == "unchanged" and ProcessedStore.is_current(ticker, ProcessedStore.source_fingerprint(raw_path)):
+                finish({"ticker": ticker, "status": "unchanged"})
+                return
+            if outcome == "downloaded":
+                stats.downloaded_bytes += raw_path.stat().st_size
+        await queue.put(ticker)
+
+    async def transform() -> None:
+        while True:
+            ticker = await queue.get()
+            try:
+                result = await loop.run_in_executor(executor, PipelineService.refresh_processed, ticker)
+            except Exception as e:
+                result = {"ticker": ticker, "status": "failed", "error": str(e)}
+            finish(result)
+            queue.task_done()
+
+    transformers = [asyncio.create_task(transform()) for _ in range(max(workers, 1))]
+    try:
+        await asyncio.gather(*(download(t) for t in pending))
+        await queue.join()
+    finally:
+        for task in transformers:
+            task.cancel()
+        executor.shutdown(wait=True)
+        progress_file.close()
+        await client.aclose()
+
+    summary = stats.summary()
+    logger.info(f"Backfill finished | {summary}")
+    return summary
+
+
+def _load_universe(args: argparse.Namespace) -> Dict[str, Optional[int]]:
+    if args.universe:
+        universe = load_company_tickers(Path(args.universe))
+    elif args.tickers:
+        universe = {t.upper(): None for t in args.tickers}
+    else:
+        universe = dict(CIK_MAPPING)
+    tickers = list(universe)[: args.limit] if args.limit else list(universe)
+    return {t: universe[t] for t in tickers}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill raw and processed data for a ticker universe.")
+    parser.add_argument("--universe", help="company_tickers.json or a ticker[,cik] per line file")
+    parser.add_argument("--tickers", nargs="*", help="Explicit tickers (defaults to CIK_MAPPING)")
+    parser.add_argument("--limit", type=int, help="Only backfill the first N tickers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Transform processes (0 = in-process)")
+    parser.add_argument("--download-concurrency", type=int, default=8)
+    parser.add_argument("--progress", default=str(DEFAULT_PROGRESS_PATH), help="Resumable progress log (JSONL)")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore previous progress")
+    parser.add_argument("--refresh-raw", action="store_true", help="Re-check cached payloads with conditional requests")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+    summary = asyncio.run(run_backfill(
+        _load_universe(args),
+        workers=args.workers,
+        download_concurrency=args.download_concurrency,
+        progress_path=Path(args.progress),
+        resume=not args.no_resume,
+        refresh_raw=args.refresh_raw,
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,29 @@
 import os
 import logging
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Base Paths (Relative to backend/app)
 APP_DIR = Path(__file__).parent
 BASE_DIR = APP_DIR.parent.parent
+
+# Load environment variables from a .env file next to or above the app (python-dotenv's
+# own search order), importing dotenv only when there is one to read
+if any((path / ".env").is_file() for path in (APP_DIR, *APP_DIR.parents)):
+    from dotenv import load_dotenv
+    load_dotenv()
+
 DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
 LOG_DIR = Path(os.getenv("LOG_DIR", BASE_DIR / "logs"))
 
 DATA_RAW_DIR = DATA_DIR / "raw"
 DATA_PROCESSED_DIR = DATA_DIR / "processed"
 DATA_TRANSCRIPTS_DIR = DATA_DIR / "transcripts"
+DATA_CACHE_DIR = DATA_DIR / "cache"
 
-# Create directories explicitly
-for path in [DATA_RAW_DIR, DATA_PROCESSED_DIR, DATA_TRANSCRIPTS_DIR, LOG_DIR]:
-    path.mkdir(parents=True, exist_ok=True)
+def ensure_data_dirs() -> None:
+    """Creates the data and log directories; called from the API startup hook and CLIs, not at import."""
+    for path in [DATA_RAW_DIR, DATA_PROCESSED_DIR, DATA_TRANSCRIPTS_DIR, DATA_CACHE_DIR, LOG_DIR]:
+        path.mkdir(parents=True, exist_ok=True)
 
 # Required Environment Variables
 def get_env(key: str, default: str = None) -> str:
@@ -34,6 +39,9 @@ momentum_limit = 3.0
 
 # SEC Ingestion Configuration
 SEC_REQUEST_RATE_LIMIT = 0.1 # seconds between requests
+SEC_BASE_URL = get_env("SEC_BASE_URL", "https://data.sec.gov")
+# Optional local copy of https://www.sec.gov/files/company_tickers.json for tickers outside CIK_MAPPING
+SEC_COMPANY_TICKERS_PATH = get_env("SEC_COMPANY_TICKERS_PATH")
 CIK_MAPPING = {
     "AAPL": 320193, "MSFT": 789019, "NVDA": 1045810,
     "TSLA": 1318605, "META": 1326801, "GOOGL": 1652044,
@@ -53,6 +61,41 @@ MOMENTUM_WEIGHTS = {
     }
 }
 
+# Named drift profiles overriding MOMENTUM_WEIGHTS and the category thresholds, as JSON:
+# {"name": {"weights": {"financial": {...}}, "thresholds": {"critical": 0.6}}}. DRIFT_PROFILE is
+# the profile used when a request does not name one ("default" is built from the values above).
+DRIFT_PROFILES_PATH = get_env("DRIFT_PROFILES_PATH")
+DRIFT_PROFILE = get_env("DRIFT_PROFILE", "default")
+
+# Upper bound on tickers per POST /v1/drift/batch request
+DRIFT_BATCH_MAX_TICKERS = 1000
+
+# Bulk export: tickers encoded per pool task, and encoded chunks kept in flight ahead of the client
+EXPORT_CHUNK_TICKERS = int(get_env("EXPORT_CHUNK_TICKERS", "50"))
+EXPORT_PREFETCH_CHUNKS = int(get_env("EXPORT_PREFETCH_CHUNKS", "2"))
+# Pause before resubmitting a chunk the saturated CPU pool turned away (up to ROUTE_TIMEOUT_SECONDS)
+EXPORT_RETRY_SECONDS = float(get_env("EXPORT_RETRY_SECONDS", "0.25"))
+
+# Route work pools: CPU-heavy transforms in processes (0 = threads), blocking I/O in threads.
+# Work beyond workers + queue depth is rejected with 429; calls past the timeout get 504.
+ROUTE_CPU_WORKERS = int(get_env("ROUTE_CPU_WORKERS", "2"))
+ROUTE_IO_THREADS = int(get_env("ROUTE_IO_THREADS", "16"))
+ROUTE_QUEUE_DEPTH = int(get_env("ROUTE_QUEUE_DEPTH", "32"))
+ROUTE_TIMEOUT_SECONDS = float(get_env("ROUTE_TIMEOUT_SECONDS", "60"))
+
+# Route response cache (LRU + TTL, keyed by ticker and raw payload version)
+RESPONSE_CACHE_MAX_ENTRIES = int(get_env("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL_SECONDS = float(get_env("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Tickers whose raw payload and processed frames are warmed in the background at startup
+PREWARM_TICKERS = [t.strip().upper() for t in get_env("PREWARM_TICKERS", "").split(",") if t.strip()]
+
+# Instrumentation: stage timings, counters and peak memory served at /metrics.
+# Server-Timing headers and tracemalloc stage peaks cost more and are opt-in.
+METRICS_ENABLED = get_env("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_SERVER_TIMING = get_env("METRICS_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+METRICS_TRACE_MEMORY = get_env("METRICS_TRACE_MEMORY", "false").lower() in ("1", "true", "yes")
+
 # LLM Parametrization
 LLM_CONFIG = {
     "model": "gpt-3.5-turbo",
@@ -60,3 +103,25 @@ LLM_CONFIG = {
     "seed": 42,
     "max_tokens": 1000
 }
+
+# LLM throughput budgets for batch transcript processing
+LLM_MAX_CONCURRENCY = int(get_env("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = int(get_env("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = int(get_env("LLM_TOKENS_PER_MINUTE", "150000"))
+# Attempts per LLM call, including the first; at least one
+LLM_MAX_RETRIES = max(1, int(get_env("LLM_MAX_RETRIES", "4")))
+# Long transcripts are scored in chunks of at most this many tokens instead of truncated
+LLM_CHUNKING = get_env("LLM_CHUNKING", "true").lower() in ("1", "true", "yes")
+LLM_CHUNK_TOKENS = int(get_env("LLM_CHUNK_TOKENS", "2500"))
+# Narrative scorer: "llm", "lexicon" (offline word lists) or "hybrid" (lexicon first,
+# escalating ambiguous transcripts to the LLM). Without an API key the lexicon is used.
+NARRATIVE_SCORER = get_env("NARRATIVE_SCORER", "llm")
+# Hybrid escalates when |optimism| is inside this band or sentiment hits are this few
+LEXICON_AMBIGUITY_BAND = float(get_env("LEXICON_AMBIGUITY_BAND", "0.2"))
+LEXICON_MIN_HITS = int(get_env("LEXICON_MIN_HITS", "5"))
+# Worker processes for CPU-bound transcript cleaning (0 = thread pool)
+NARRATIVE_CLEAN_WORKERS = int(get_env("NARRATIVE_CLEAN_WORKERS", "2"))
+
+# LLM signal cache (memory LRU in front of a size-bounded disk store)
+LLM_CACHE_MEMORY_ENTRIES = int(get_env("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+LLM_CACHE_MAX_BYTES = int(get_env("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
@@ -0,0 +1,129 @@
+import logging
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+from app.core.drift_engine import DEFAULT_THRESHOLDS, calculate_drift
+
+logger = logging.getLogger(__name__)
+
+FLAGGED_CATEGORIES = ("critical", "moderate")
+OUTCOME_FEATURES = ["revenue_growth", "ocf_growth"]
+# Upper bound on the (weight vectors x cells) float32 drift block materialized at once
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+def feature_tensor(frames: Mapping[str, pd.DataFrame], features: Sequence[str], periods: int) -> np.ndarray:
+    """Stacks the last ``periods`` rows of each ticker's feature frame into a (tickers, periods, features) tensor.
+
+    Histories are right-aligned on the latest period; shorter ones are NaN-padded at the start.
+    """
+    tensor = np.full((len(frames), periods, len(features)), np.nan)
+    for i, df in enumerate(frames.values()):
+        values = df[list(features)].to_numpy(dtype=float)[-periods:]
+        if len(values):
+            tensor[i, periods - len(values):] = values
+    return tensor
+
+def weight_grid(n_features: int, steps: int) -> np.ndarray:
+    """Every weight vector on the simplex with components in multiples of 1/steps, as (combinations, features)."""
+    combos = [c for c in itertools.product(range(steps + 1), repeat=n_features - 1) if sum(c) <= steps]
+    grid = np.array([c + (steps - sum(c),) for c in combos], dtype=float)
+    return grid / steps
+
+def forward_deterioration(outcomes: np.ndarray, horizon: int = 4, threshold: float = 0.0) -> Dict[str, np.ndarray]:
+    """Marks (ticker, period) cells whose following ``horizon`` periods deteriorated.
+
+    ``outcomes`` is (tickers, periods, outcome features); a cell deteriorated when
+    the mean of any outcome feature over the next ``horizon`` periods is below
+    ``threshold``. The last ``horizon`` periods and padded history are not valid.
+    """
+    tickers, periods, _ = outcomes.shape
+    forward = np.full(outcomes.shape, np.nan)
+    if periods > horizon:
+        windows = np.lib.stride_tricks.sliding_window_view(outcomes[:, 1:], horizon, axis=1)
+        forward[:, :periods - horizon] = windows.mean(axis=-1)
+    valid = ~np.isnan(forward).any(axis=-1)
+    deteriorated = valid & (np.nan_to_num(forward, nan=np.inf) < threshold).any(axis=-1)
+    return {"deteriorated": deteriorated, "valid": valid}
+
+def drift_surfaces(tensor: np.ndarray, weights: np.ndarray, narrative_momentum: Union[float, np.ndarray] = 0.0) -> np.ndarray:
+    """Drift for every weight vector at once: a (weights, tickers, periods) array from one matrix multiply.
+
+    Equivalent to ``calculate_drift(compute_momentum_vector(frame, w), narrative)`` per weight vector.
+    """
+    tickers, periods, n_features = tensor.shape
+    financial = (tensor.reshape(-1, n_features) @ weights.T).T.reshape(len(weights), tickers, periods)
+    return calculate_drift(financial, np.asarray(narrative_momentum, dtype=float))
+
+def sweep_weights(
+    tensor: np.ndarray,
+    weights: np.ndarray,
+    outcomes: np.ndarray,
+    narrative_momentum: Union[float, np.ndarray] = 0.0,
+    thresholds: Optional[Mapping[str, float]] = None,
+    horizon: int = 4,
+    deterioration_threshold: float = 0.0,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Dict[str, np.ndarray]:
+    """Backtests candidate momentum weights against subsequent deterioration.
+
+    ``tensor`` is (tickers, periods, features) and ``weights`` is (candidates,
+    features). For each candidate, reports how many valid cells were flagged
+    CRITICAL/MODERATE and the share of those followed by deterioration
+    (``{category}_hit_rate``, NaN when nothing was flagged), plus the base rate
+    over all valid cells. Scores are computed in float32 and candidates are
+    processed in chunks so no more than ``chunk_bytes`` of them exist at once.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    tensor = np.asarray(tensor, dtype=float)
+    if weights.shape[1] != tensor.shape[-1]:
+        raise ValueError(f"Weights have {weights.shape[1]} features, tensor has {tensor.shape[-1]}")
+
+    outcome = forward_deterioration(outcomes, horizon, deterioration_threshold)
+    valid = (outcome["valid"] & ~np.isnan(tensor).any(axis=-1)).reshape(-1)
+    narrative = np.broadcast_to(np.asarray(narrative_momentum, dtype=float), outcome["valid"].shape).reshape(-1)
+    deteriorated = outcome["deteriorated"].reshape(-1)
+    # Only cells with a known outcome are scored, deteriorated ones first so hits are a prefix count
+    order = np.concatenate([np.flatnonzero(valid & deteriorated), np.flatnonzero(valid & ~deteriorated)])
+    n_deteriorated = int((valid & deteriorated).sum())
+    cells = tensor.reshape(-1, tensor.shape[-1])[order].astype(np.float32)
+    narrative = narrative[order].astype(np.float32)
+
+    # Scores here are never NaN, so classify_drift's bins reduce to "above the category's
+    # threshold" counts: moderate = above(moderate) - above(critical)
+    bounds = dict(thresholds or DEFAULT_THRESHOLDS)
+    above = {c: (np.zeros(len(weights), dtype=np.int64), np.zeros(len(weights), dtype=np.int64)) for c in FLAGGED_CATEGORIES}
+    chunk = max(1, chunk_bytes // max(len(cells) * 4, 1))
+
+    for start in range(0, len(weights), chunk):
+        block = weights[start:start + chunk].astype(np.float32)
+        # (candidates, cells): one matrix multiply for the whole block of weight vectors
+        drift = calculate_drift(block @ cells.T, narrative)
+        for category, (flags, hits) in above.items():
+            flagged = drift > bounds[category]
+            flags[start:start + chunk] = np.count_nonzero(flagged, axis=1)
+            hits[start:start + chunk] = np.count_nonzero(flagged[:, :n_deteriorated], axis=1)
+
+    counts = {"critical": above["critical"][0], "moderate": above["moderate"][0] - above["critical"][0]}
+    hits = {"critical": above["critical"][1], "moderate": above["moderate"][1] - above["critical"][1]}
+
+    result: Dict[str, np.ndarray] = {"weights": weights}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for category in FLAGGED_CATEGORIES:
+            result[f"{category}_flags"] = counts[category]
+            result[f"{category}_hits"] = hits[category]
+            result[f"{category}_hit_rate"] = hits[category] / counts[category]
+    result["evaluated"] = np.int64(len(cells))
+    result["base_rate"] = np.float64(n_deteriorated / len(cells)) if len(cells) else np.float64(np.nan)
+    logger.info(f"Weight sweep | {len(weights)} candidates over {len(cells)} cells in chunks of {chunk}")
+    return result
+
+def top_candidates(result: Dict[str, np.ndarray], features: Sequence[str], category: str = "critical", min_flags: int = 1, n: int = 10) -> List[Dict[str, float]]:
+    """Best weight vectors by hit rate for one category, ignoring candidates with fewer than ``min_flags`` flags."""
+    rate = np.where(result[f"{category}_flags"] >= min_flags, result[f"{category}_hit_rate"], np.nan)
+    order = np.argsort(np.nan_to_num(rate, nan=-np.inf))[::-1][:n]
+    return [
+        {**dict(zip(features, result["weights"][i].tolist())),
+         "hit_rate": float(rate[i]), "flags": int(result[f"{category}_flags"][i])}
+        for i in order if not np.isnan(rate[i])
+    ]
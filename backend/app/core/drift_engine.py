@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Collection, Mapping, NamedTuple, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +17,135 @@ def calculate_drift(financial_momentum: pd.Series, narrative_momentum: pd.Series
     """Derives the drift score as the divergence between narrative and fiscal momentum."""
     return narrative_momentum - financial_momentum
 
-def generate_deterministic_explanation(row: Dict[str, Any]) -> str:
+# Drift thresholds and their explanations, checked in order
+CRITICAL_THRESHOLD = 0.5
+MODERATE_THRESHOLD = 0.2
+CONSERVATIVE_THRESHOLD = -0.2
+
+# Drift categories in score order; classification returns indices into this tuple
+CATEGORIES = ("conservative", "stable", "moderate", "critical")
+STABLE = CATEGORIES.index("stable")
+DEFAULT_THRESHOLDS = {
+    "conservative": CONSERVATIVE_THRESHOLD,
+    "moderate": MODERATE_THRESHOLD,
+    "critical": CRITICAL_THRESHOLD,
+}
+
+EXPLANATIONS = {
+    "critical": "CRITICAL DIVERGENCE: Narrative optimism significantly outpaces fundamental momentum. Risk of sentiment over-extension.",
+    "moderate": "MODERATE DIVERGENCE: Narrative leading fundamentals. Monitor accrual quality for potential decoupling.",
+    "conservative": "CONSERVATIVE BIAS: Fundamentals outpacing narrative. Potential management sandbagging or excessive risk-aversion.",
+    "stable": "STABLE ALIGNMENT: Narrative and fiscal momentum are within nominal variance.",
+}
+CATEGORY_LABELS = np.array(CATEGORIES, dtype=object)
+EXPLANATION_LABELS = np.array([EXPLANATIONS[c] for c in CATEGORIES], dtype=object)
+
+
+class DriftProfile(NamedTuple):
+    """Named momentum weights and category thresholds.
+
+    A score above a threshold of a category past "stable" (or below one before
+    it) falls into that category; the stable band itself is closed.
+    """
+    name: str
+    weights: Dict[str, Dict[str, float]]
+    thresholds: Dict[str, float]
+
+
+def make_profile(
+    name: str,
+    weights: Mapping[str, Mapping[str, float]],
+    thresholds: Optional[Mapping[str, float]] = None,
+    features: Optional[Collection[str]] = None,
+) -> DriftProfile:
+    """Validates and builds a profile; missing thresholds take the defaults.
+
+    When ``features`` is given, financial weights must name columns from it.
+    """
+    merged = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    unknown = set(merged) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Drift profile {name!r} has unknown categories: {sorted(unknown)}")
+    edges = [float(merged[c]) for c in CATEGORIES if c != "stable"]
+    if edges != sorted(edges):
+        raise ValueError(f"Drift profile {name!r} thresholds must increase in category order {CATEGORIES}")
+    for group in ("financial", "narrative"):
+        if not isinstance(weights.get(group), Mapping) or not weights[group]:
+            raise ValueError(f"Drift profile {name!r} needs {group} weights")
+    if features is not None:
+        unknown = set(weights["financial"]) - set(features)
+        if unknown:
+            raise ValueError(f"Drift profile {name!r} weights unknown financial features: {sorted(unknown)}")
+    return DriftProfile(
+        name=name,
+        weights={group: {k: float(v) for k, v in w.items()} for group, w in weights.items()},
+        thresholds={c: float(merged[c]) for c in DEFAULT_THRESHOLDS},
+    )
+
+
+def parse_profiles(spec: Mapping[str, Any], default: DriftProfile, features: Optional[Collection[str]] = None) -> Dict[str, DriftProfile]:
+    """Builds profiles from {name: {"weights": {...}, "thresholds": {...}}}, each overriding ``default``."""
+    profiles = {default.name: default}
+    for name, entry in spec.items():
+        weights = {group: {**w, **entry.get("weights", {}).get(group, {})} for group, w in default.weights.items()}
+        profiles[name] = make_profile(name, weights, {**default.thresholds, **entry.get("thresholds", {})}, features)
+    return profiles
+
+
+def _edges(thresholds: Mapping[str, float]) -> tuple:
+    lower = np.array([thresholds[c] for c in CATEGORIES[:STABLE]], dtype=float)
+    upper = np.array([thresholds[c] for c in CATEGORIES[STABLE + 1:]], dtype=float)
+    return lower, upper
+
+
+def classify_drift(drift_scores: np.ndarray, thresholds: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Category codes (indices into CATEGORIES) for an array of drift scores of any shape.
+
+    Two bin lookups instead of per-row comparisons: scores below the lower
+    edges are counted with strict inequality, scores above the upper edges
+    likewise, so the stable band keeps its boundaries. NaN scores are stable.
+    """
+    drift = np.asarray(drift_scores, dtype=float)
+    lower, upper = _edges(thresholds or DEFAULT_THRESHOLDS)
+    codes = np.digitize(drift, lower, right=False) + np.digitize(drift, upper, right=True)
+    codes = np.where(np.isnan(drift), STABLE, codes)
+    return codes.astype(np.int8)
+
+
+def explain_codes(codes: np.ndarray) -> np.ndarray:
+    """Explanation strings for category codes; attached only when a response is built."""
+    return EXPLANATION_LABELS[np.asarray(codes)]
+
+
+def generate_deterministic_explanation(row: Dict[str, Any], thresholds: Optional[Mapping[str, float]] = None) -> str:
     """Generates a structured explanation based on quantitative thresholds."""
-    drift = row.get("drift_score", 0)
-    
-    if drift > 0.5:
-        return "CRITICAL DIVERGENCE: Narrative optimism significantly outpaces fundamental momentum. Risk of sentiment over-extension."
-    elif drift > 0.2:
-        return "MODERATE DIVERGENCE: Narrative leading fundamentals. Monitor accrual quality for potential decoupling."
-    elif drift < -0.2:
-        return "CONSERVATIVE BIAS: Fundamentals outpacing narrative. Potential management sandbagging or excessive risk-aversion."
-    else:
-        return "STABLE ALIGNMENT: Narrative and fiscal momentum are within nominal variance."
+    return EXPLANATION_LABELS[classify_drift(row.get("drift_score", 0), thresholds)]
+
+def explain_drift_scores(drift_scores: np.ndarray, thresholds: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Vectorized generate_deterministic_explanation over an array of drift scores."""
+    return explain_codes(classify_drift(drift_scores, thresholds))
+
+def rolling_drift_statistics(drift_scores: np.ndarray, window: int, z_threshold: float = 2.0) -> Dict[str, np.ndarray]:
+    """Mean, std and z-score of drift against the ``window`` periods before each one, along the last axis.
+
+    Accepts a single series (periods,) or a panel (tickers, periods). Statistics
+    for the first ``window`` periods are NaN. A regime change is flagged when the
+    current drift sits ``z_threshold`` standard deviations away from the preceding
+    window; the window excludes the current period so a spike cannot damp itself.
+    """
+    drift = np.asarray(drift_scores, dtype=float)
+    shape = drift.shape
+    mean = np.full(shape, np.nan)
+    std = np.full(shape, np.nan)
+
+    if window >= 2 and shape[-1] > window:
+        # Window i covers periods i..i+window-1 and scores period i+window
+        windows = np.lib.stride_tricks.sliding_window_view(drift[..., :-1], window, axis=-1)
+        mean[..., window:] = windows.mean(axis=-1)
+        std[..., window:] = windows.std(axis=-1, ddof=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(std > 0, (drift - mean) / std, np.nan)
+    regime_change = np.abs(np.nan_to_num(zscore)) >= z_threshold
+
+    return {"rolling_mean": mean, "rolling_std": std, "rolling_zscore": zscore, "regime_change": regime_change}
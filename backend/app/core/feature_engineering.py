@@ -1,17 +1,27 @@
 import pandas as pd
 import numpy as np
 import logging
+from typing import Dict, Optional
+from app.core.normalization import PILLARS
 
 logger = logging.getLogger(__name__)
 
-def engineering_financial_features(df: pd.DataFrame, growth_limit: float = 2.0) -> pd.DataFrame:
-    """Calculates accounting quality and growth metrics for a normalized dataset."""
-    if df.empty:
-        return df
+# Growth feature -> source pillar
+GROWTH_FEATURES = {
+    "revenue_growth": "revenue",
+    "ocf_growth": "operating_cash_flow",
+    "ni_growth": "net_income",
+}
 
-    df = df.copy()
+QUALITY_FEATURES = ["free_cash_flow", "accrual_ratio", "ocf_conversion"]
+# Numeric columns of an engineered features frame, i.e. what momentum weights may reference
+FEATURE_COLUMNS = PILLARS + QUALITY_FEATURES + list(GROWTH_FEATURES)
 
-    # 1. Quality Ratios (Accounting Quality Proxies)
+# Fiscal period order within a fiscal year; unrecognised periods sort last
+FISCAL_PERIOD_ORDER = pd.Index(["Q1", "Q2", "Q3", "FY"])
+
+def _add_quality_ratios(df: pd.DataFrame) -> None:
+    """Accounting quality proxies, computed in place."""
     # FCF = OCF - Capex
     df["free_cash_flow"] = df["operating_cash_flow"] - df["capex"]
     
@@ -22,15 +32,89 @@ def engineering_financial_features(df: pd.DataFrame, growth_limit: float = 2.0)
     # OCF Conversion = OCF / NI
     df["ocf_conversion"] = df["operating_cash_flow"] / df["net_income"].replace(0, np.nan)
 
+def engineering_financial_features(
+    df: pd.DataFrame,
+    growth_limit: float = 2.0,
+    previous: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """Calculates accounting quality and growth metrics for a normalized dataset.
+
+    ``previous`` holds the un-filled pillar values of the period preceding ``df``
+    so newly filed periods can be appended without recomputing the history.
+    """
+    if df.empty:
+        return df
+
+    df = df.copy()
+
+    # 1. Quality Ratios (Accounting Quality Proxies)
+    _add_quality_ratios(df)
+
     # 2. Growth metrics (bounded for stability)
-    def pct_change_robust(series):
-        return series.pct_change().replace([np.inf, -np.inf], np.nan).clip(-growth_limit, growth_limit)
+    def pct_change_robust(series, prev_value):
+        if prev_value is not None:
+            series = pd.concat([pd.Series([prev_value], dtype=float), series], ignore_index=True)
+        # No forward fill (the pandas 2 default): a missing pillar must not borrow an older period's value
+        growth = series.pct_change(fill_method=None).replace([np.inf, -np.inf], np.nan).clip(-growth_limit, growth_limit)
+        return growth.iloc[1:].to_numpy() if prev_value is not None else growth
 
-    df["revenue_growth"] = pct_change_robust(df["revenue"])
-    df["ocf_growth"] = pct_change_robust(df["operating_cash_flow"])
-    df["ni_growth"] = pct_change_robust(df["net_income"])
+    for feature, pillar in GROWTH_FEATURES.items():
+        prev_value = None if previous is None else previous.get(pillar, np.nan)
+        df[feature] = pct_change_robust(df[pillar], prev_value)
     
     # Fill remaining NaNs for calculation stability
     df = df.fillna(0)
     
     return df
+
+def engineering_panel_features(
+    panel_df: pd.DataFrame,
+    growth_limit: float = 2.0,
+    float32: bool = False,
+) -> pd.DataFrame:
+    """Calculates the same features for a long frame of many tickers in one vectorized pass.
+
+    Rows are ordered by ticker, fy and fiscal period (Q1 < Q2 < Q3 < FY); amended
+    filings keep only the latest ``filed`` row per (ticker, fy, fp). Growth is
+    masked at ticker boundaries so it never carries from one security to the next.
+    """
+    if panel_df.empty:
+        return panel_df
+
+    # 1. Order by (ticker, fy, period, filed) with a single lexsort over codes
+    tickers = pd.factorize(panel_df["ticker"], sort=True)[0]
+    fy = panel_df["fy"].to_numpy()
+    fp_codes = pd.factorize(panel_df["fp"], sort=True)[0]
+    fp_rank = FISCAL_PERIOD_ORDER.get_indexer(panel_df["fp"])
+    fp_rank[fp_rank < 0] = len(FISCAL_PERIOD_ORDER)
+    filed = pd.factorize(panel_df["filed"], sort=True)[0]
+    order = np.lexsort((filed, fp_codes, fp_rank, fy, tickers))
+
+    # 2. Latest amendment per (ticker, fy, fp) is the last row of its run
+    t, y, p = tickers[order], fy[order], fp_codes[order]
+    latest = np.ones(len(order), dtype=bool)
+    latest[:-1] = (t[1:] != t[:-1]) | (y[1:] != y[:-1]) | (p[1:] != p[:-1])
+    order, t = order[latest], t[latest]
+    df = panel_df.take(order).reset_index(drop=True)
+
+    _add_quality_ratios(df)
+
+    # 3. Growth against the previous period of the same ticker only; like pct_change(fill_method=None),
+    #    a missing pillar yields missing growth instead of reaching back to an older period
+    first_of_ticker = np.ones(len(df), dtype=bool)
+    first_of_ticker[1:] = t[1:] != t[:-1]
+    for feature, pillar in GROWTH_FEATURES.items():
+        values = df[pillar].to_numpy(dtype=float)
+        prev = np.roll(values, 1)
+        prev[first_of_ticker] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = values / prev - 1
+        growth[np.isinf(growth)] = np.nan
+        df[feature] = np.clip(growth, -growth_limit, growth_limit)
+
+    df = df.fillna(0)
+
+    if float32:
+        float_columns = df.select_dtypes(include="float64").columns
+        df[float_columns] = df[float_columns].astype(np.float32)
+    return df
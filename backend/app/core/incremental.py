@@ -0,0 +1,91 @@
+import math
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+from app.core.normalization import pivot_pillars, OPTIONAL_PILLARS
+from app.core.feature_engineering import engineering_financial_features, GROWTH_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# Fact columns whose change in an already-seen filing means history was restated
+HISTORY_COLUMNS = ["metric", "value", "unit", "filed", "fy", "fp"]
+
+def facts_hash(facts_df: pd.DataFrame) -> str:
+    """Order-independent digest of the fact rows, so a restated value changes it even at the same row count."""
+    columns = [col for col in HISTORY_COLUMNS if col in facts_df.columns]
+    rows = np.sort(pd.util.hash_pandas_object(facts_df[columns], index=False).to_numpy())
+    return hashlib.sha256(rows.tobytes()).hexdigest()
+
+def build_incremental_state(frames: Dict[str, pd.DataFrame], filled_pillars: Optional[list] = None) -> Dict[str, Any]:
+    """Captures what an incremental update needs from a fully built set of frames."""
+    normalized = frames["normalized"]
+    last = normalized.iloc[-1]
+    if filled_pillars is None:
+        filled_pillars = list(normalized.attrs.get("filled_pillars", []))
+    return {
+        # Latest filing date seen in the facts, mapped or not
+        "last_filed": str(frames["facts"]["filed"].max()),
+        "facts_rows": len(frames["facts"]),
+        "facts_hash": facts_hash(frames["facts"]),
+        "filled_pillars": filled_pillars,
+        "previous": {
+            pillar: (None if pd.isna(last[pillar]) else float(last[pillar]))
+            for pillar in GROWTH_FEATURES.values()
+        },
+    }
+
+def incremental_update(
+    frames: Dict[str, pd.DataFrame],
+    state: Dict[str, Any],
+    facts_df: pd.DataFrame,
+    growth_limit: float = 2.0,
+) -> Optional[Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]]:
+    """Appends periods filed after ``state['last_filed']`` to previously built frames.
+
+    Returns None when the new payload cannot be applied incrementally (history was
+    revised, or a new filing introduces a pillar the history zero-filled); the
+    caller then falls back to a full rebuild. Outputs are identical to a full
+    recompute otherwise.
+    """
+    if facts_df.empty:
+        return None
+    new_mask = facts_df["filed"] > state["last_filed"]
+    if int((~new_mask).sum()) != state["facts_rows"]:
+        logger.info("Historical facts changed; incremental update not applicable")
+        return None
+    # States written before the hash was recorded take one full rebuild
+    if facts_hash(facts_df[~new_mask]) != state.get("facts_hash"):
+        logger.info("Historical facts restated; incremental update not applicable")
+        return None
+    if not new_mask.any():
+        return frames, state
+
+    new_facts = facts_df[new_mask]
+    new_norm = pivot_pillars(new_facts)
+    if new_norm.empty:
+        # New facts carry no mapped values; only the facts frame grows
+        updated = dict(frames, facts=facts_df.reset_index(drop=True))
+        return updated, dict(state, facts_rows=len(facts_df), facts_hash=facts_hash(facts_df))
+
+    base_norm = frames["normalized"]
+    if set(new_norm.columns) - set(base_norm.columns):
+        logger.info("New pillars appeared; incremental update not applicable")
+        return None
+    if set(state["filled_pillars"]) & set(new_norm.columns):
+        logger.info("Previously zero-filled pillar now reported; incremental update not applicable")
+        return None
+
+    for pillar in base_norm.columns:
+        if pillar not in new_norm.columns:
+            new_norm[pillar] = 0 if pillar in state["filled_pillars"] else float("nan")
+    new_norm = new_norm[base_norm.columns]
+
+    previous = {k: (math.nan if v is None else v) for k, v in state["previous"].items()}
+    new_features = engineering_financial_features(new_norm, growth_limit=growth_limit, previous=previous)
+
+    normalized = pd.concat([base_norm, new_norm], ignore_index=True)
+    features = pd.concat([frames["features"], new_features], ignore_index=True)
+    updated = {"facts": facts_df.reset_index(drop=True), "normalized": normalized, "features": features}
+    return updated, build_incremental_state(updated, state["filled_pillars"])
@@ -0,0 +1,102 @@
+import re
+import json
+from json.decoder import scanstring
+from typing import Any, Iterator, TextIO
+
+# Whitespace as defined by the JSON grammar
+_WS = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+class JSONStream:
+    """Incremental reader over a JSON document held in a text file handle.
+
+    Only the value currently being decoded is materialized; everything before it
+    is discarded from the buffer, so peak memory is bounded by the largest member
+    rather than by the whole document.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 20):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Drops the consumed prefix and appends at least one more chunk."""
+        if self.eof:
+            return False
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        # Grow geometrically so a large member is not re-scanned once per chunk
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next significant character."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of JSON stream", self.buf, self.pos)
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def key(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos)
+                self.pos = end
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def decode(self) -> Any:
+        """Decodes the next complete value (object, array, string or scalar)."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A scalar touching the buffer edge may be truncated (e.g. "12" of "123")
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def skip(self) -> None:
+        """Consumes the next value without retaining it."""
+        self.decode()
+
+def iter_members(stream: JSONStream) -> Iterator[str]:
+    """Yields the keys of the object at the stream position.
+
+    The caller must consume each member's value (``decode``, ``skip`` or a nested
+    ``iter_members``) before advancing the iterator.
+    """
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+        return
+    while True:
+        key = stream.key()
+        stream.expect(":")
+        yield key
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", stream.buf, stream.pos - 1)
@@ -0,0 +1,103 @@
+import re
+import logging
+import numpy as np
+from typing import Dict, Any
+from app.core.transcript_parser import SENTENCE_BOUNDARY
+
+logger = logging.getLogger(__name__)
+
+# Loughran-McDonald-style finance sentiment categories. A compact subset tuned to
+# earnings-call language, not the full dictionary.
+POSITIVE_WORDS = frozenset("""
+    achieve achieved achievement achievements achieving advance advanced advances advantage advantages
+    attractive benefit benefited benefiting benefits best better boost boosted breakthrough confident
+    delighted efficiencies efficiency efficient encouraged encouraging enhance enhanced enthusiastic
+    exceed exceeded exceeding excellent exceptional excited exciting favorable gain gained gaining gains
+    good great greater highest improve improved improvement improvements improves improving leadership
+    momentum opportunities opportunity outperform outperformed pleased positive profitable profitability
+    progress record resilient robust solid strength strengthen strengthened strong stronger strongest
+    succeed success successful successfully tailwind tailwinds upside
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+    adverse adversely challenge challenged challenges challenging closure closures concern concerned
+    concerns decline declined declines declining decrease decreased decreases decreasing default
+    deficit delay delayed delays deteriorate deteriorated deteriorating deterioration difficult
+    difficulties difficulty disappoint disappointed disappointing disruption disruptions downgrade
+    downturn drag failure failures headwind headwinds impairment impairments inability layoffs
+    litigation loss losses negative negatively pressure pressured pressures recession restructuring
+    shortfall shortage shortages slowdown slower softer softness unfavorable weak weaken weakened
+    weaker weakness worse worsening writedown
+""".split())
+
+UNCERTAINTY_WORDS = frozenset("""
+    almost anticipate apparently appear appears approximate approximately assume assumed assumes
+    assumption assumptions believe believed cautious could depend dependent depending depends
+    exposure fluctuate fluctuation fluctuations indefinite likelihood may maybe might nearly pending
+    perhaps possibility possible possibly preliminary probable probably risk risks risky roughly
+    seem seems somewhat suggest tentative uncertain uncertainties uncertainty unclear unknown
+    unpredictable unproven unusual variability variable volatile volatility
+""".split())
+
+NEGATION_WORDS = frozenset("no not never none neither nor nobody without".split())
+
+FORWARD_LOOKING_PHRASES = (
+    "anticipate", "anticipates", "expect", "expects", "expected to", "expecting", "forecast", "guidance",
+    "outlook", "going forward", "looking ahead", "look ahead", "next quarter", "next year", "next fiscal",
+    "coming quarters", "coming year", "plan to", "plans to", "intend to", "intends to", "we will",
+    "will continue", "on track", "target", "targets", "projected", "aim to", "long-term", "pipeline",
+)
+
+POSITIVE, NEGATIVE, UNCERTAINTY, NEGATION = 1, 2, 3, 4
+
+# Precompiled token index: one dict lookup per token classifies it
+TOKEN_INDEX: Dict[str, int] = {
+    **{w: UNCERTAINTY for w in UNCERTAINTY_WORDS},
+    **{w: NEGATIVE for w in NEGATIVE_WORDS},
+    **{w: POSITIVE for w in POSITIVE_WORDS},
+    **{w: NEGATION for w in NEGATION_WORDS},
+}
+TOKEN = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+FORWARD_LOOKING = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in sorted(FORWARD_LOOKING_PHRASES, key=len, reverse=True)) + r")\b"
+)
+NEGATION_WINDOW = 3
+
+def score_transcript(text: str) -> Dict[str, Any]:
+    """Scores a cleaned transcript with the finance lexicon.
+
+    Optimism is net positive tone in [-1, 1], risk counts negative and uncertainty
+    mentions, and forward-looking density is the share of sentences with a
+    forward-looking phrase. Positive words within three tokens after a negation
+    count as negative, as in the Loughran-McDonald methodology.
+    """
+    lowered = text.lower()
+    codes = np.fromiter((TOKEN_INDEX.get(t, 0) for t in TOKEN.findall(lowered)), dtype=np.int8)
+
+    negated = np.zeros(len(codes), dtype=bool)
+    negations = np.flatnonzero(codes == NEGATION)
+    for offset in range(1, NEGATION_WINDOW + 1):
+        negated[negations[negations + offset < len(codes)] + offset] = True
+
+    positive_mask = codes == POSITIVE
+    positive = int((positive_mask & ~negated).sum())
+    negative = int((codes == NEGATIVE).sum() + (positive_mask & negated).sum())
+    uncertainty = int((codes == UNCERTAINTY).sum())
+
+    sentences = [s for s in SENTENCE_BOUNDARY.split(lowered) if s.strip()]
+    forward = sum(1 for s in sentences if FORWARD_LOOKING.search(s))
+
+    hits = positive + negative
+    return {
+        "optimism": (positive - negative) / hits if hits else 0.0,
+        "risk": negative + uncertainty,
+        "forward_looking_density": forward / len(sentences) if sentences else 0.0,
+        "positive": positive,
+        "negative": negative,
+        "uncertainty": uncertainty,
+        "tokens": len(codes),
+    }
+
+def is_ambiguous(scores: Dict[str, Any], band: float = 0.2, min_hits: int = 5) -> bool:
+    """True when lexicon evidence is too thin or too balanced to trust without the LLM."""
+    return scores["positive"] + scores["negative"] < min_hits or abs(scores["optimism"]) < band
@@ -16,51 +16,119 @@ PILLAR_MAPPING = {
     "Assets": "total_assets"
 }
 
-def normalize_financial_data(long_df: pd.DataFrame) -> pd.DataFrame:
-    """Pivots SEC facts and maps them to canonical pillars."""
-    if long_df.empty:
-        return long_df
+MANDATORY_PILLARS = ["revenue", "net_income", "operating_cash_flow"]
+OPTIONAL_PILLARS = ["capex", "total_assets"]
+
+# Alternate tags for one pillar in the same filing resolve by precedence:
+# the earlier PILLAR_MAPPING entry wins, e.g. Revenues over SalesRevenueNet.
+PILLAR_TAGS = pd.Index(list(PILLAR_MAPPING))
+PILLARS = sorted(set(PILLAR_MAPPING.values()))
+TAG_PILLAR_CODES = np.array([PILLARS.index(pillar) for pillar in PILLAR_MAPPING.values()])
+PERIOD_KEYS = ["ticker", "fy", "fp", "filed"]
 
-    # 1. Map tags
+def _pivot_pillars_table(long_df: pd.DataFrame) -> pd.DataFrame:
+    """Original pivot_table implementation, kept as the reference for pivot_pillars."""
+    if long_df.empty:
+        return pd.DataFrame()
     df = long_df.copy()
     df["pillar"] = df["metric"].map(PILLAR_MAPPING)
-    
-    # Filter for mapped pillars only
     df = df.dropna(subset=["pillar"])
-    
     if df.empty:
-        logger.warning("No canonical pillars found in raw data")
         return pd.DataFrame()
-
-    # 2. Handle Scaling (using decimals field)
-    # Value = val * 10^decimals (usually decimals are negative for millions/thousands)
-    # But SEC data is usually already in ones if units=USD.
-    # However, for consistency we ensure float type.
     df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    pivot_df = df.pivot_table(index=PERIOD_KEYS, columns="pillar", values="value", aggfunc="last").reset_index()
+    return pivot_df.sort_values("filed", kind="mergesort").reset_index(drop=True)
+
+def pivot_pillars(long_df: pd.DataFrame) -> pd.DataFrame:
+    """Maps SEC tags to canonical pillars and pivots to one row per filing, without validation.
+
+    Filings are identified by factorized (ticker, fy, fp, filed) codes. Each pillar
+    takes the highest-precedence tag reported, and within that tag the last
+    non-null value, via a stable lexsort and a last-per-group mask. The winners
+    are scattered straight into a dense (filings x pillars) array.
+    """
+    if long_df.empty:
+        return pd.DataFrame()
 
-    # 3. Pivot to wide format
-    # Indexing by ticker, fy, fp, and filed date to ensure uniqueness per period
-    pivot_df = df.pivot_table(
-        index=["ticker", "fy", "fp", "filed"],
-        columns="pillar",
-        values="value",
-        aggfunc="last"
-    ).reset_index()
+    # 1. Map tags to precedence codes; unmapped tags are -1
+    tag_codes = PILLAR_TAGS.get_indexer(long_df["metric"])
+
+    # 2. SEC data is usually already in ones if units=USD; we only ensure float type
+    values = pd.to_numeric(long_df["value"], errors="coerce").to_numpy(dtype=float)
+
+    # 3. Null values never contribute, as with pivot_table(aggfunc="last"); mapped
+    # rows are selected before factorizing so unmapped tags cost nothing further
+    keep = (tag_codes >= 0) & ~np.isnan(values)
+    rows = np.flatnonzero(keep)
+    tag_codes, values = tag_codes[rows], values[rows]
+    key_codes, key_uniques = [], []
+    for key in PERIOD_KEYS:
+        codes, uniques = pd.factorize(long_df[key].take(rows), sort=True)
+        key_codes.append(codes)
+        key_uniques.append(uniques)
+    # Keyless rows are dropped, as groupby does
+    keyed = np.logical_and.reduce([codes >= 0 for codes in key_codes])
+    if not keyed.any():
+        return pd.DataFrame()
+    if not keyed.all():
+        tag_codes, values = tag_codes[keyed], values[keyed]
+        key_codes = [codes[keyed] for codes in key_codes]
+
+    pillar_codes = TAG_PILLAR_CODES[tag_codes]
+    shape = tuple(len(u) for u in key_uniques)
+    group_keys, groups = np.unique(np.ravel_multi_index(key_codes, shape), return_inverse=True)
+
+    # 4. Stable sort by (filing, pillar, precedence descending): the last row of each run wins
+    order = np.lexsort((-tag_codes, pillar_codes, groups))
+    sorted_groups, sorted_pillars = groups[order], pillar_codes[order]
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_pillars[1:] != sorted_pillars[:-1])
+    winners = order[last]
+
+    dense = np.full((len(group_keys), len(PILLARS)), np.nan)
+    dense[groups[winners], pillar_codes[winners]] = values[winners]
+
+    # 5. Keys in sorted order, then only the pillars that were reported
+    columns = {
+        key: uniques.take(positions)
+        for key, uniques, positions in zip(PERIOD_KEYS, key_uniques, np.unravel_index(group_keys, shape))
+    }
+    for code in np.unique(pillar_codes):
+        columns[PILLARS[code]] = dense[:, code]
+    pivot_df = pd.DataFrame(columns)
+    pivot_df.columns.name = "pillar"
+
+    # Sort by filing date; stable so same-day filings keep (ticker, fy, fp) order and
+    # an incremental append orders ties exactly like a full rebuild.
+    # Positional index so frames round-trip through the processed store.
+    return pivot_df.sort_values("filed", kind="mergesort").reset_index(drop=True)
+
+def normalize_financial_data(long_df: pd.DataFrame) -> pd.DataFrame:
+    """Pivots SEC facts and maps them to canonical pillars."""
+    if long_df.empty:
+        return long_df
+
+    pivot_df = pivot_pillars(long_df)
+    if pivot_df.empty:
+        logger.warning("No canonical pillars found in raw data")
+        return pd.DataFrame()
 
     # 4. Mandatory Pillar Validation (Fail-fast strategy)
-    mandatory_pillars = ["revenue", "net_income", "operating_cash_flow"]
-    missing = [p for p in mandatory_pillars if p not in pivot_df.columns]
+    missing = [p for p in MANDATORY_PILLARS if p not in pivot_df.columns]
     
     if missing:
         logger.error(f"DATA INTEGRITY FAILURE | Missing mandatory pillars: {missing}")
         return pd.DataFrame()
 
     # Fill optional pillars (like capex/assets) with 0 if missing
-    for p in ["capex", "total_assets"]:
-        if p not in pivot_df.columns:
-            pivot_df[p] = 0
+    filled = [p for p in OPTIONAL_PILLARS if p not in pivot_df.columns]
+    for p in filled:
+        pivot_df[p] = 0
+    # Recorded so incremental updates can tell zero-filled pillars from reported ones
+    pivot_df.attrs["filled_pillars"] = filled
 
-    # Sort by filing date
-    pivot_df = pivot_df.sort_values("filed")
-    
     return pivot_df
+
+def period_labels(df: pd.DataFrame) -> pd.Series:
+    """Fiscal period labels such as '2023-Q3' or '2023-FY' from the fy/fp columns."""
+    return df["fy"].astype("int64").astype(str) + "-" + df["fp"].astype(str)
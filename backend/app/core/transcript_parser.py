@@ -1,26 +1,184 @@
 import re
+import hashlib
 import pandas as pd
 import numpy as np
 import logging
+from typing import Dict, Any, List, Sequence, Iterable, Iterator, TextIO, Union
 
 logger = logging.getLogger(__name__)
 
-def clean_transcript_text(raw_text: str) -> str:
-    """Standardizes transcript text by removing boilerplate and speaker labels."""
+# Cleaner patterns, compiled once. A speaker label ends at the first character
+# outside [a-zA-Z\s.-], so only that character can decide whether it is a label:
+# ':' is outside the class, so backtracking tests it once per position and a
+# match attempt stays linear without possessive quantifiers (Python 3.11+ only).
+SPEAKER_LABEL = re.compile(r'\s*[A-Z][a-zA-Z\s.-]+:')
+LABEL_STOP = re.compile(r'[^a-zA-Z\s.-]')
+NON_SPACE = re.compile(r'\S')
+QA_SECTION = re.compile(r'Question-and-Answer Session', re.IGNORECASE)
+CLEAN_BLOCK_CHARS = 1 << 16
+
+TranscriptSource = Union[str, TextIO, Iterable[str]]
+
+def _clean_transcript_text_regex(raw_text: str) -> str:
+    """Original three-pass implementation, kept as the reference for the streaming cleaner."""
     if not raw_text:
         return ""
-        
-    # Remove speaker labels (e.g., "John Doe:", "Operator:")
     text = re.sub(r'^\s*[A-Z][a-zA-Z\s.-]+:', '', raw_text, flags=re.MULTILINE)
-    
-    # Remove analyst questions/interjections (Q&A section patterns)
     text = re.sub(r'Question-and-Answer Session.*', '', text, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _iter_lines(source: TranscriptSource) -> Iterator[str]:
+    """Yields newline-terminated lines from a string, a text file or any iterable of text chunks."""
+    chunks = (source,) if isinstance(source, str) else source
+    tail = ""
+    for chunk in chunks:
+        if tail:
+            chunk = tail + chunk
+        start = 0
+        end = chunk.find("\n")
+        while end >= 0:
+            yield chunk[start:end + 1]
+            start = end + 1
+            end = chunk.find("\n", start)
+        tail = chunk[start:]
+    if tail:
+        yield tail
+
+def _strip_label(lines: List[str]) -> str:
+    """Removes the speaker label, if any, from lines whose first label-stopping character is in the last line."""
+    text = "".join(lines)
+    stop = LABEL_STOP.search(text, len(text) - len(lines[-1]))
+    if stop is None or stop.group() != ":":
+        return text
+
+    # The earliest line whose first non-space character is a capital starts the label
+    colon = stop.start()
+    pos, first = 0, -1
+    for line in lines:
+        if first < pos:
+            first = NON_SPACE.search(text, pos).start()
+        if first < colon - 1 and "A" <= text[first] <= "Z":
+            return text[:pos] + text[colon + 1:]
+        pos += len(line)
     return text
 
+def _strip_speaker_labels(lines: Iterable[str]) -> Iterator[str]:
+    # Lines without a stopping character may belong to a label that ends further down
+    pending: List[str] = []
+    for line in lines:
+        if LABEL_STOP.search(line) is None:
+            pending.append(line)
+            continue
+        if pending:
+            pending.append(line)
+            yield _strip_label(pending)
+            pending = []
+        else:
+            label = SPEAKER_LABEL.match(line)
+            yield line[label.end():] if label else line
+    if pending:
+        yield _strip_label(pending)
+
+def iter_clean_transcript(source: TranscriptSource) -> Iterator[str]:
+    """Streams cleaned transcript text in a single pass over the input's lines.
+
+    Speaker labels are removed line by line, everything from the Q&A session
+    header on is dropped without reading further, and whitespace is collapsed
+    across block boundaries. Joined, the fragments equal ``clean_transcript_text``.
+    """
+    emitted, gap = False, False
+    block: List[str] = []
+    size = 0
+    pieces = _strip_speaker_labels(_iter_lines(source))
+    done = False
+    while not done:
+        for piece in pieces:
+            block.append(piece)
+            size += len(piece)
+            if size >= CLEAN_BLOCK_CHARS:
+                break
+        else:
+            done = True
+        text = "".join(block)
+        block, size = [], 0
+
+        # The Q&A header holds no newline, so it never straddles two blocks
+        qa = QA_SECTION.search(text)
+        if qa:
+            text, done = text[:qa.start()], True
+        if not text:
+            continue
+        words = text.split()
+        if not words:
+            gap = True
+            continue
+        if emitted and (gap or text[0].isspace()):
+            yield " "
+        yield " ".join(words)
+        emitted, gap = True, text[-1].isspace()
+
+def clean_transcript_text(raw_text: TranscriptSource) -> str:
+    """Standardizes transcript text by removing boilerplate and speaker labels."""
+    if not raw_text:
+        return ""
+    return "".join(iter_clean_transcript(raw_text))
+
+# Sentence ends, or blank lines in text that still carries paragraph breaks
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+CHARS_PER_TOKEN = 4
+
+def _is_content_boundary(sentence: str, divisor: int) -> bool:
+    digest = hashlib.blake2b(sentence.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % divisor == 0
+
+def chunk_transcript(text: str, max_tokens: int = 2500, min_fraction: float = 0.25, boundary_divisor: int = 8) -> List[str]:
+    """Splits cleaned text into chunks of at most ``max_tokens`` on sentence boundaries.
+
+    Chunk ends are content-defined: once a chunk holds ``min_fraction`` of the
+    budget it closes after any sentence whose hash falls on ``boundary_divisor``.
+    An edit therefore only reshapes the chunks around it, so unchanged chunks
+    keep their cache keys.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    # Sentences longer than the budget are hard-split on whitespace
+    pieces = []
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+
+    min_chars = int(max_chars * min_fraction)
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + 1 + len(piece) > max_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        size += len(piece) + (1 if current else 0)
+        current.append(piece)
+        if size >= min_chars and _is_content_boundary(piece, boundary_divisor):
+            chunks.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def aggregate_chunk_signals(signals: Sequence[Dict[str, Any]], lengths: Sequence[int]) -> Dict[str, Any]:
+    """Combines per-chunk signals: length-weighted optimism, summed risk."""
+    if not signals:
+        return {"optimism": 0.0, "risk": 0}
+    weights = np.asarray(lengths, dtype=float)
+    optimism = np.asarray([float(s.get("optimism", 0.0)) for s in signals])
+    risk = sum(int(s.get("risk", 0)) for s in signals)
+    total = weights.sum()
+    return {"optimism": float((optimism * weights).sum() / total) if total else 0.0, "risk": risk}
+
 def normalize_narrative_signals(df: pd.DataFrame) -> pd.DataFrame:
     """Ensures narrative signals are within bounded limits for drift comparison."""
     if df.empty:
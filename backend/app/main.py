@@ -1,9 +1,21 @@
+import time
+
+# Taken before the remaining imports so the startup log covers them
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
+from typing import List
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import financials, narrative, drift
+from app.config import PREWARM_TICKERS, ensure_data_dirs
+from app.routers import financials, narrative, drift, export
 from app.models.schemas import HealthResponse, DriftResponse
+from app.services import metrics
+from app.services.executors import shutdown_pools
+from app.services.response_cache import get_response_cache
+from app.services.warmup import prewarm
 
 # Structured Logging
 logging.basicConfig(
@@ -27,10 +39,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request timings and Server-Timing headers; not installed at all when metrics are disabled
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Routers
 app.include_router(financials.router, prefix="/v1/financials", tags=["Financials"])
 app.include_router(narrative.router, prefix="/v1/narrative", tags=["Narrative"])
 app.include_router(drift.router, prefix="/v1/drift", tags=["Drift"])
+app.include_router(export.router, prefix="/v1/export", tags=["Export"])
 
 @app.get("/", include_in_schema=False)
 async def root_redirect():
@@ -40,6 +57,41 @@ async def root_redirect():
 async def health_check():
     return HealthResponse(status="healthy", version="1.0.0")
 
+@app.get("/cache/stats", include_in_schema=False)
+async def cache_stats():
+    """Response cache hit ratio and occupancy."""
+    return get_response_cache().stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Stage timings, cache/SEC/LLM counters and peak memory in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+_background_tasks: List[asyncio.Task] = []
+
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Drift Engine API Initialized")
+    from app.services.sec_client import get_sec_client
+
+    from app.services.drift_service import load_drift_profiles
+
+    ensure_data_dirs()
+    # Validated before serving: a bad profile configuration must stop startup, not 404 every drift request
+    try:
+        await asyncio.to_thread(load_drift_profiles)
+    except (OSError, ValueError) as e:
+        logger.error(f"Invalid drift profiles: {e}")
+        raise
+    get_sec_client()
+    # Heavy imports and hot tickers warm up while the app already answers requests
+    _background_tasks.append(asyncio.create_task(prewarm(PREWARM_TICKERS)))
+    logger.info(f"Drift Engine API Initialized in {(time.perf_counter() - IMPORT_STARTED) * 1000:.0f} ms")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.sec_client import get_sec_client
+
+    for task in _background_tasks:
+        task.cancel()
+    await get_sec_client().aclose()
+    shutdown_pools()
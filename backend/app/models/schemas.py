@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from app.config import DRIFT_BATCH_MAX_TICKERS
 
 class FinancialsResponse(BaseModel):
     ticker: str
@@ -7,7 +8,23 @@ class FinancialsResponse(BaseModel):
     revenue_growth: List[float]
     ocf_growth: List[float]
     accrual_ratio: List[float]
-    free_cash_flow: List[float]
+    # Dollar amounts: float32 would be off by thousands at this scale
+    free_cash_flow: List[float] = Field(json_schema_extra={"compact_dtype": "float64"})
+
+class PackedArray(BaseModel):
+    """A float series in the compact encoding: base64 of little-endian ``dtype`` values."""
+    dtype: Literal["float32", "float64"]
+    shape: List[int]
+    data: str
+
+class FinancialsCompactResponse(BaseModel):
+    """FinancialsResponse with ?encoding=compact: ratios as float32, dollar amounts as float64."""
+    ticker: str
+    quarterly_index: List[str]
+    revenue_growth: PackedArray
+    ocf_growth: PackedArray
+    accrual_ratio: PackedArray
+    free_cash_flow: PackedArray
 
 class NarrativeResponse(BaseModel):
     ticker: str
@@ -15,6 +32,34 @@ class NarrativeResponse(BaseModel):
     risk_mentions: List[int]
     forward_looking_density: List[float]
     narrative_momentum: List[float]
+    periods: Optional[List[str]] = None
+
+class NarrativeCompactResponse(BaseModel):
+    """NarrativeResponse with ?encoding=compact."""
+    ticker: str
+    optimism_score: PackedArray
+    risk_mentions: List[int]
+    forward_looking_density: PackedArray
+    narrative_momentum: PackedArray
+    periods: Optional[List[str]] = None
+
+class TranscriptItem(BaseModel):
+    ticker: str
+    fiscal_period: str
+    text: str
+
+class TranscriptBatchRequest(BaseModel):
+    items: List[TranscriptItem] = Field(..., min_length=1)
+
+class TranscriptSignals(BaseModel):
+    ticker: str
+    fiscal_period: str
+    optimism: float
+    risk: int
+    error: Optional[str] = None
+
+class TranscriptBatchResponse(BaseModel):
+    results: List[TranscriptSignals]
 
 class DriftResponse(BaseModel):
     ticker: str
@@ -24,6 +69,40 @@ class DriftResponse(BaseModel):
     drift_score: float
     explanation: str
 
+class DriftBatchRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=DRIFT_BATCH_MAX_TICKERS)
+    profile: Optional[str] = None
+
+class DriftBatchResponse(BaseModel):
+    """Column-oriented drift table; row i of every list belongs to tickers[i]."""
+    tickers: List[str]
+    quarter: List[str]
+    financial_momentum: List[float]
+    narrative_momentum: List[float]
+    drift_score: List[float]
+    explanation: List[str]
+    errors: Dict[str, str] = {}
+
+class DriftHistoryResponse(BaseModel):
+    """Column-oriented drift history; row i of every list belongs to periods[i]."""
+    ticker: str
+    window: int
+    periods: List[str]
+    financial_momentum: List[float]
+    narrative_momentum: List[float]
+    drift_score: List[float]
+    rolling_mean: List[Optional[float]]
+    rolling_std: List[Optional[float]]
+    rolling_zscore: List[Optional[float]]
+    regime_change: List[bool]
+    explanation: List[str]
+
 class HealthResponse(BaseModel):
     status: str
     version: str
+
+class ExportRequest(BaseModel):
+    """Bulk export of engineered features and drift; omit tickers to export every cached ticker."""
+    tickers: Optional[List[str]] = None
+    format: Literal["csv", "arrow", "ndjson"] = "csv"
+    profile: Optional[str] = None
@@ -1,15 +1,102 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import DriftResponse
-from app.services.drift_service import DriftService
+import asyncio
+import logging
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from app.models.schemas import DriftResponse, DriftBatchRequest, DriftBatchResponse, DriftHistoryResponse
+from app.services.executors import PoolSaturatedError, run_cpu
+from app.services.response_cache import get_response_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+@router.post("/batch", response_model=DriftBatchResponse)
+async def get_batch_drift_analysis(request: DriftBatchRequest):
+    """Calculates the current drift score for many securities in one pass."""
+    from app.services.drift_service import DriftService
+    from app.services.ingestion_service import IngestionService
+
+    tickers = list(dict.fromkeys(request.tickers))
+    try:
+        # Cold tickers download concurrently; the shared client enforces SEC rate limits.
+        # A failed download is that ticker's error, not the batch's.
+        available = await asyncio.gather(*(IngestionService.ensure_raw_async(t) for t in tickers), return_exceptions=True)
+        errors = {}
+        for ticker, ok in zip(tickers, available):
+            if isinstance(ok, BaseException) and not isinstance(ok, Exception):
+                raise ok
+            if isinstance(ok, Exception):
+                logger.warning(f"Batch drift download failed for {ticker}: {ok!r}")
+            if ok is not True:
+                errors[ticker] = f"Data unavailable for {ticker}"
+        result = await run_cpu(DriftService.get_batch_drift, [t for t in tickers if t not in errors], request.profile)
+        result.errors.update(errors)
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out computing batch drift")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{ticker}", response_model=DriftResponse)
-async def get_drift_analysis(ticker: str):
+async def get_drift_analysis(
+    ticker: str,
+    profile: Optional[str] = Query(None, description="Named weight/threshold profile (defaults to DRIFT_PROFILE)"),
+    if_none_match: Optional[str] = Header(None),
+):
     """Calculates the current narrative drift score for a security."""
+    # Service modules load pandas; importing them on first use keeps app startup light
+    from app.services.drift_service import DriftService
+    from app.services.ingestion_service import IngestionService
+
+    # Cold tickers are downloaded on the pooled async client instead of blocking the loop
+    if not await IngestionService.ensure_raw_async(ticker):
+        raise HTTPException(status_code=404, detail=f"Data unavailable for {ticker}")
+
+    try:
+        entry = await get_response_cache().get_or_compute(
+            ("drift", ticker, profile), IngestionService.raw_version(ticker),
+            lambda: run_cpu(DriftService.get_latest_drift, ticker, profile),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out computing drift for {ticker}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return entry.to_response(if_none_match)
+
+@router.get("/{ticker}/history", response_model=DriftHistoryResponse)
+async def get_drift_history(
+    ticker: str,
+    window: int = Query(8, ge=2, le=80, description="Trailing window length in fiscal periods"),
+    z_threshold: float = Query(2.0, gt=0, description="|z| at which a period is flagged as a regime change"),
+    profile: Optional[str] = Query(None, description="Named weight/threshold profile (defaults to DRIFT_PROFILE)"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Returns drift for every fiscal period with rolling statistics and regime-change flags."""
+    from app.services.drift_service import DriftService
+    from app.services.ingestion_service import IngestionService
+
+    if not await IngestionService.ensure_raw_async(ticker):
+        raise HTTPException(status_code=404, detail=f"Data unavailable for {ticker}")
+
     try:
-        return DriftService.get_latest_drift(ticker)
+        entry = await get_response_cache().get_or_compute(
+            ("drift_history", ticker, window, z_threshold, profile), IngestionService.raw_version(ticker),
+            lambda: run_cpu(DriftService.get_drift_history, ticker, window, z_threshold, profile),
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out computing drift for {ticker}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return entry.to_response(if_none_match)
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.config import EXPORT_CHUNK_TICKERS, EXPORT_PREFETCH_CHUNKS, EXPORT_RETRY_SECONDS, ROUTE_TIMEOUT_SECONDS
+from app.models.schemas import ExportRequest
+from app.services.executors import PoolSaturatedError, run_cpu
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+async def _encode_chunk(chunk: List[str], fmt: str, profile: Optional[str]) -> Tuple[Any, Dict[str, str]]:
+    """Encodes one chunk, waiting for CPU pool capacity; a chunk that still fails is skipped, not fatal."""
+    from app.services.export_service import ExportService
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + ROUTE_TIMEOUT_SECONDS
+    while True:
+        try:
+            return await run_cpu(ExportService.encode_chunk, chunk, fmt, profile)
+        except PoolSaturatedError as e:
+            # Backpressure: interactive routes keep their 429s, the export waits its turn
+            if loop.time() + EXPORT_RETRY_SECONDS > deadline:
+                reason = str(e)
+                break
+            await asyncio.sleep(EXPORT_RETRY_SECONDS)
+        except asyncio.TimeoutError:
+            reason = "timed out"
+            break
+        except Exception as e:
+            reason = str(e)
+            break
+    logger.error(f"Export chunk of {len(chunk)} tickers failed: {reason}")
+    return None, {ticker: f"export failed: {reason}" for ticker in chunk}
+
+async def _stream_export(tickers: List[str], fmt: str, profile: Optional[str]) -> AsyncIterator[bytes]:
+    """Yields the export chunk by chunk, encoding the next chunks on the CPU pool while one is sent."""
+    from app.services.export_service import ExportWriter
+
+    chunks = [tickers[i:i + EXPORT_CHUNK_TICKERS] for i in range(0, len(tickers), EXPORT_CHUNK_TICKERS)]
+    writer = ExportWriter(fmt)
+    pending: deque = deque()
+    try:
+        yield writer.open()
+        for chunk in chunks:
+            pending.append(asyncio.ensure_future(_encode_chunk(chunk, fmt, profile)))
+            if len(pending) > EXPORT_PREFETCH_CHUNKS:
+                yield writer.write(*await pending.popleft())
+        while pending:
+            yield writer.write(*await pending.popleft())
+        yield writer.close()
+    except Exception as e:
+        # Headers are already sent: the missing trailer is how the client tells the body was cut short
+        logger.error(f"Export aborted after {len(tickers)} requested tickers: {e}")
+        raise
+    finally:
+        for task in pending:
+            task.cancel()
+    if writer.skipped:
+        logger.warning(f"Export finished without data for {len(writer.skipped)} tickers: {list(writer.skipped)[:20]}")
+
+@router.post("")
+async def export_bulk(request: ExportRequest):
+    """Streams engineered features and drift for many tickers as CSV, Arrow IPC stream or NDJSON."""
+    # Service modules load pandas; importing them on first use keeps app startup light
+    from app.services.drift_service import get_drift_profile
+    from app.services.export_service import ExportService, MEDIA_TYPES
+    from app.services.raw_store import RawStore
+
+    try:
+        get_drift_profile(request.profile)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    tickers = list(dict.fromkeys(request.tickers)) if request.tickers else await asyncio.to_thread(RawStore.tickers)
+    fmt = ExportService.resolve_format(request.format)
+    return StreamingResponse(
+        _stream_export(tickers, fmt, request.profile),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="drift_export.{fmt}"',
+            "X-Export-Format": fmt,
+            "X-Export-Tickers": str(len(tickers)),
+        },
+    )
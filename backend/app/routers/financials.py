@@ -1,21 +1,39 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import FinancialsResponse
-from app.services.financial_service import FinancialService
-import pandas as pd # Mocking data feed for skeleton
-from app.services.ingestion_service import IngestionService
+import asyncio
+from typing import Optional, Union
+from fastapi import APIRouter, Header, HTTPException, Query
+from app.models.schemas import FinancialsResponse, FinancialsCompactResponse
+from app.services.executors import PoolSaturatedError, run_cpu
+from app.services.response_cache import get_response_cache
 
 router = APIRouter()
 
-@router.get("/{ticker}", response_model=FinancialsResponse)
-async def get_financial_metrics(ticker: str):
+@router.get("/{ticker}", response_model=Union[FinancialsResponse, FinancialsCompactResponse])
+async def get_financial_metrics(
+    ticker: str,
+    encoding: str = Query("json", pattern="^(json|compact)$", description="compact: float arrays as base64 little-endian float32"),
+    if_none_match: Optional[str] = Header(None),
+):
     """Retrieves quarterly financial quality and growth metrics."""
+    # Service modules load pandas; importing them on first use keeps app startup light
+    from app.services.financial_service import FinancialService
+    from app.services.ingestion_service import IngestionService
+
+    # Cold tickers are downloaded on the pooled async client instead of blocking the loop
+    if not await IngestionService.ensure_raw_async(ticker):
+        raise HTTPException(status_code=404, detail=f"Data unavailable for {ticker}")
+
     try:
-        # In a real app, this would fetch from a database or IngestionService
-        raw_data = IngestionService.fetch_raw_sec_data(ticker)
-        if not raw_data:
-            raise HTTPException(status_code=404, detail=f"Data for {ticker} not found.")
-            
-        raw_df = IngestionService.extract_facts_to_df(ticker, raw_data)
-        return FinancialService.get_financial_metrics(ticker, raw_df)
+        # Served from the response cache, else the processed store, rebuilt from the raw payload when stale
+        entry = await get_response_cache().get_or_compute(
+            ("financials", ticker, encoding), IngestionService.raw_version(ticker),
+            lambda: run_cpu(FinancialService.get_financials_payload, ticker, encoding),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out computing metrics for {ticker}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return entry.to_response(if_none_match)
@@ -1,19 +1,53 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import NarrativeResponse
+import asyncio
+from typing import Union
+from fastapi import APIRouter, HTTPException, Query
+from app.models.schemas import NarrativeResponse, NarrativeCompactResponse, TranscriptBatchRequest, TranscriptBatchResponse
+from app.services.executors import PoolSaturatedError, run_io
+from app.services.serialization import json_response
 # In a real app, we would inject a database/data-access layer here
 # For this skeleton, we assume data retrieval happens inside the service or is passed
 
 router = APIRouter()
 
-@router.get("/{ticker}", response_model=NarrativeResponse)
-async def get_narrative_signals(ticker: str):
+@router.post("/batch", response_model=TranscriptBatchResponse)
+async def process_transcript_batch(request: TranscriptBatchRequest):
+    """Cleans and scores many transcripts concurrently; results follow request order."""
+    # The narrative service loads pandas (and openai when a key is set); import on first use
+    from app.services.narrative_service import get_narrative_service
+
+    items = [(i.ticker, i.fiscal_period, i.text) for i in request.items]
+    try:
+        results = await get_narrative_service().process_batch(items)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return TranscriptBatchResponse(results=results)
+
+@router.get("/{ticker}", response_model=Union[NarrativeResponse, NarrativeCompactResponse])
+async def get_narrative_signals(
+    ticker: str,
+    encoding: str = Query("json", pattern="^(json|compact)$", description="compact: float arrays as base64 little-endian float32"),
+):
     """Retrieves sentiment metrics and narrative trajectory for a given security."""
-    # Placeholder for actual data retrieval logic
-    # In a production app, this would call NarrativeService
-    return NarrativeResponse(
+    from app.services.narrative_service import get_narrative_service
+
+    try:
+        # File reads and, outside lexicon mode, LLM calls: blocking I/O kept off the loop
+        history = await run_io(get_narrative_service().get_narrative_history, ticker)
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out scoring transcripts for {ticker}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if history is not None:
+        # The service already produces typed columns; skip per-element validation
+        return json_response(NarrativeResponse.model_construct(ticker=ticker, **history), encoding)
+
+    # Placeholder until transcripts for this ticker have been processed
+    return json_response(NarrativeResponse.model_construct(
         ticker=ticker,
         optimism_score=[0.2, 0.4, 0.35],
         risk_mentions=[5, 8, 7],
         forward_looking_density=[0.12, 0.15, 0.14],
-        narrative_momentum=[0.1, 0.25, 0.15]
-    )
+        narrative_momentum=[0.1, 0.25, 0.15],
+    ), encoding)
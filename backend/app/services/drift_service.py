@@ -1,56 +1,186 @@
+import json
+import logging
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
-from app.core.normalization import normalize_financial_data
-from app.core.feature_engineering import engineering_financial_features
-from app.core.drift_engine import calculate_drift, generate_deterministic_explanation, compute_momentum_vector
+from typing import Dict, Any, List, Optional
+from app.core.drift_engine import (
+    DriftProfile, calculate_drift, classify_drift, compute_momentum_vector, explain_codes, make_profile,
+    parse_profiles, rolling_drift_statistics,
+)
+from app.core.feature_engineering import FEATURE_COLUMNS
+from app.core.normalization import period_labels
 from app.core.transcript_parser import normalize_narrative_signals
-from app.services.ingestion_service import IngestionService
-from app.models.schemas import DriftResponse
-from app.config import MOMENTUM_WEIGHTS
+from app.services.pipeline_service import PipelineService
+from app.services.metrics import span
+from app.models.schemas import DriftResponse, DriftBatchResponse, DriftHistoryResponse
+from app.config import DRIFT_PROFILE, DRIFT_PROFILES_PATH, MOMENTUM_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+PERIOD_COLUMNS = ["fy", "fp"]
+
+_profiles: Optional[Dict[str, DriftProfile]] = None
+
+def load_drift_profiles(path: Optional[str] = None) -> Dict[str, DriftProfile]:
+    """Reads and validates the named profiles once per process; "default" is built from MOMENTUM_WEIGHTS.
+
+    Raises OSError or ValueError for an unreadable or invalid DRIFT_PROFILES_PATH or DRIFT_PROFILE;
+    the app runs this at startup so a misconfiguration stops it there.
+    """
+    global _profiles
+    path = DRIFT_PROFILES_PATH if path is None else path
+    spec = {}
+    if path:
+        with open(path, "r") as f:
+            spec = json.load(f)
+    profiles = parse_profiles(spec, make_profile("default", MOMENTUM_WEIGHTS, features=FEATURE_COLUMNS), FEATURE_COLUMNS)
+    if DRIFT_PROFILE not in profiles:
+        raise ValueError(f"DRIFT_PROFILE {DRIFT_PROFILE!r} is not among the drift profiles {sorted(profiles)}")
+    _profiles = profiles
+    logger.info(f"Loaded drift profiles: {sorted(profiles)}")
+    return profiles
+
+def get_drift_profile(name: Optional[str] = None) -> DriftProfile:
+    """A named profile; ValueError (404 in routes) for unknown names."""
+    profiles = _profiles
+    if profiles is None:
+        # Worker processes load lazily; a broken configuration is a server error, not a missing profile
+        try:
+            profiles = load_drift_profiles()
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Invalid drift profiles: {e}") from e
+    name = name or DRIFT_PROFILE
+    if name not in profiles:
+        raise ValueError(f"Unknown drift profile {name}")
+    return profiles[name]
+
+def _financial_columns(profile: DriftProfile) -> List[str]:
+    return list(profile.weights["financial"])
+
+def drift_columns(df: pd.DataFrame, drift_profile: DriftProfile) -> Dict[str, np.ndarray]:
+    """Momentum, drift score and category code for every row of a features frame."""
+    fin_momentum = compute_momentum_vector(df, drift_profile.weights["financial"]).to_numpy()
+    nar_momentum = DriftService.narrative_momentum(len(df), drift_profile)
+    drift_scores = calculate_drift(fin_momentum, nar_momentum)
+    return {
+        "financial_momentum": fin_momentum,
+        "narrative_momentum": nar_momentum,
+        "drift_score": drift_scores,
+        "drift_category": classify_drift(drift_scores, drift_profile.thresholds),
+    }
 
 class DriftService:
     @staticmethod
-    def get_latest_drift(ticker: str) -> DriftResponse:
-        """Computes current drift state for a ticker by orchestrating data feeds."""
-        # 1. Fetch raw data (orchestrated via IngestionService)
-        raw_data = IngestionService.fetch_raw_sec_data(ticker)
-        if not raw_data:
-            raise ValueError(f"Data unavailable for {ticker}")
-            
-        # 2. Financial Momentum
-        raw_df = IngestionService.extract_facts_to_df(ticker, raw_data)
-        
-        # 2.1 Normalization (Pivot long-form facts to canonical pillars)
-        normalized_df = normalize_financial_data(raw_df)
-        if normalized_df.empty:
-            raise ValueError(f"Normalization failed for {ticker}")
-
-        # 2.2 Feature Engineering
-        processed_df = engineering_financial_features(normalized_df)
-        fin_momentum = compute_momentum_vector(processed_df.iloc[-1:], MOMENTUM_WEIGHTS["financial"]).iloc[0]
-        
-        # 3. Narrative Momentum (Mocking signal extraction for this skeleton)
+    def narrative_momentum(n: int, profile: DriftProfile) -> np.ndarray:
+        """Latest narrative momentum for n securities."""
+        # Mocking signal extraction for this skeleton
         # In a real app, this would call NarrativeService.process_transcript()
         nar_signals = pd.DataFrame([{"optimism": 0.3, "risk": 5}, {"optimism": 0.4, "risk": 4}])
         nar_df = normalize_narrative_signals(nar_signals)
-        nar_momentum = compute_momentum_vector(nar_df.iloc[-1:], MOMENTUM_WEIGHTS["narrative"]).iloc[0]
+        nar_momentum = compute_momentum_vector(nar_df.iloc[-1:], profile.weights["narrative"]).iloc[0]
+        return np.full(n, nar_momentum)
+
+    @staticmethod
+    def get_latest_drift(ticker: str, profile: Optional[str] = None) -> DriftResponse:
+        """Computes current drift state for a ticker by orchestrating data feeds."""
+        drift_profile = get_drift_profile(profile)
+        columns = _financial_columns(drift_profile)
+        # 1-2. Engineered features (served from the processed store, rebuilt when the raw payload changes)
+        with span("drift.load_features"):
+            processed_df = PipelineService.load_frame(ticker, "features", columns=PERIOD_COLUMNS + columns)
+        with span("drift.financial_momentum"):
+            fin_momentum = compute_momentum_vector(processed_df.iloc[-1:], drift_profile.weights["financial"]).iloc[0]
         
-        # 4. Drift Calculation
-        drift_score = calculate_drift(fin_momentum, nar_momentum)
+        # 3. Narrative Momentum
+        with span("drift.narrative_momentum"):
+            nar_momentum = DriftService.narrative_momentum(1, drift_profile)[0]
         
-        # 5. Result Construction
-        row = {
-            "drift_score": drift_score,
-            "financial_momentum": fin_momentum,
-            "narrative_momentum": nar_momentum
-        }
-        explanation = generate_deterministic_explanation(row)
+        # 4. Drift Calculation and classification
+        with span("drift.score"):
+            drift_score = calculate_drift(fin_momentum, nar_momentum)
+            category = classify_drift(drift_score, drift_profile.thresholds)
         
+        # 5. Result Construction
         return DriftResponse(
             ticker=ticker,
-            quarter="2023-Q3", # Derived from ingestion data in full impl
+            quarter=period_labels(processed_df.iloc[-1:]).iloc[0],
             financial_momentum=float(fin_momentum),
             narrative_momentum=float(nar_momentum),
             drift_score=float(drift_score),
-            explanation=explanation
+            explanation=explain_codes(category)
+        )
+
+    @staticmethod
+    def get_batch_drift(tickers: List[str], profile: Optional[str] = None) -> DriftBatchResponse:
+        """Computes latest drift for many tickers in one vectorized pass."""
+        drift_profile = get_drift_profile(profile)
+        columns = _financial_columns(drift_profile)
+        # 1. Stack the latest engineered row of every ticker into one matrix
+        latest: Dict[str, np.ndarray] = {}
+        quarters: List[str] = []
+        errors: Dict[str, str] = {}
+        for ticker in dict.fromkeys(tickers):
+            # One unreadable or malformed frame lands in errors instead of failing the whole batch
+            try:
+                with span("drift.load_features"):
+                    df = PipelineService.load_frame(ticker, "features", columns=PERIOD_COLUMNS + columns)
+                row = df[columns].iloc[-1].to_numpy(dtype=float)
+                quarter = period_labels(df.iloc[-1:]).iloc[0]
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                logger.warning(f"Batch drift skipped {ticker}: {e!r}")
+                errors[ticker] = str(e) if isinstance(e, ValueError) else f"Data unavailable for {ticker}"
+                continue
+            latest[ticker] = row
+            quarters.append(quarter)
+
+        names = list(latest)
+        if not names:
+            return DriftBatchResponse(tickers=[], quarter=[], financial_momentum=[], narrative_momentum=[],
+                                      drift_score=[], explanation=[], errors=errors)
+        features = pd.DataFrame(np.vstack(list(latest.values())), index=names, columns=columns)
+
+        # 2-4. Whole-column momentum, drift and classification
+        with span("drift.score"):
+            fin_momentum = compute_momentum_vector(features, drift_profile.weights["financial"]).to_numpy()
+            nar_momentum = DriftService.narrative_momentum(len(names), drift_profile)
+            drift_scores = calculate_drift(fin_momentum, nar_momentum)
+            categories = classify_drift(drift_scores, drift_profile.thresholds)
+
+        return DriftBatchResponse(
+            tickers=names,
+            quarter=quarters,
+            financial_momentum=fin_momentum.tolist(),
+            narrative_momentum=nar_momentum.tolist(),
+            drift_score=drift_scores.tolist(),
+            explanation=explain_codes(categories).tolist(),
+            errors=errors
+        )
+
+    @staticmethod
+    def get_drift_history(ticker: str, window: int = 8, z_threshold: float = 2.0, profile: Optional[str] = None) -> DriftHistoryResponse:
+        """Drift for every fiscal period plus trailing-window statistics and regime flags."""
+        drift_profile = get_drift_profile(profile)
+        with span("drift.load_features"):
+            df = PipelineService.load_frame(ticker, "features", columns=PERIOD_COLUMNS + _financial_columns(drift_profile))
+
+        with span("drift.score"):
+            drift = drift_columns(df, drift_profile)
+        with span("drift.rolling_statistics"):
+            stats = rolling_drift_statistics(drift["drift_score"], window, z_threshold)
+
+        def nullable(values: np.ndarray) -> List[Optional[float]]:
+            return [None if np.isnan(v) else float(v) for v in values]
+
+        return DriftHistoryResponse(
+            ticker=ticker,
+            window=window,
+            periods=period_labels(df).tolist(),
+            financial_momentum=drift["financial_momentum"].tolist(),
+            narrative_momentum=drift["narrative_momentum"].tolist(),
+            drift_score=drift["drift_score"].tolist(),
+            rolling_mean=nullable(stats["rolling_mean"]),
+            rolling_std=nullable(stats["rolling_std"]),
+            rolling_zscore=nullable(stats["rolling_zscore"]),
+            regime_change=stats["regime_change"].tolist(),
+            explanation=explain_codes(drift["drift_category"]).tolist()
         )
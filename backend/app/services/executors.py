@@ -0,0 +1,152 @@
+import os
+import asyncio
+import logging
+import contextvars
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.config import NARRATIVE_CLEAN_WORKERS, ROUTE_CPU_WORKERS, ROUTE_IO_THREADS, ROUTE_QUEUE_DEPTH, ROUTE_TIMEOUT_SECONDS
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a pool already holds its maximum pending work; routes answer 429."""
+
+
+class BoundedPool:
+    """Executor with admission control and per-call timeouts.
+
+    At most ``max_pending`` calls are queued or running. A slot is released when
+    the work itself finishes, not when a caller times out, so saturation reflects
+    what the workers are actually doing.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor], max_pending: int, timeout: float):
+        self.name = name
+        self.factory = factory
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self.factory()
+            return self._executor
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Runs ``fn(*args)`` on the pool; raises PoolSaturatedError or asyncio.TimeoutError."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                metrics.inc("drift_pool_rejections_total", pool=self.name)
+                raise PoolSaturatedError(f"{self.name} pool saturated ({self.pending} pending)")
+            self.pending += 1
+        try:
+            executor = self._get_executor()
+            # Worker processes ship their spans and counters back with the result;
+            # threads share the registry and only need the request's context
+            collect = metrics.ENABLED and isinstance(executor, ProcessPoolExecutor)
+            if collect:
+                future = executor.submit(metrics.run_collected, fn, *args)
+            else:
+                future = executor.submit(contextvars.copy_context().run, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            metrics.inc("drift_pool_timeouts_total", pool=self.name)
+            logger.warning(f"{self.name} pool call {getattr(fn, '__qualname__', fn)} timed out")
+            raise
+        return metrics.merge_collected(result) if collect else result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"pending": self.pending, "max_pending": self.max_pending, "rejected": self.rejected, "timeouts": self.timeouts}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _cpu_workers() -> int:
+    return ROUTE_CPU_WORKERS if ROUTE_CPU_WORKERS > 0 else os.cpu_count() or 1
+
+
+def _cpu_executor() -> Executor:
+    if ROUTE_CPU_WORKERS <= 0:
+        return ThreadPoolExecutor(max_workers=_cpu_workers(), thread_name_prefix="route-cpu")
+    # Spawned, not forked: the server process already runs event-loop and client threads
+    return ProcessPoolExecutor(max_workers=ROUTE_CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _io_executor() -> Executor:
+    return ThreadPoolExecutor(max_workers=ROUTE_IO_THREADS, thread_name_prefix="route-io")
+
+
+_cpu_pool: Optional[BoundedPool] = None
+_io_pool: Optional[BoundedPool] = None
+_clean_executor: Optional[Executor] = None
+_clean_lock = threading.Lock()
+
+def get_cpu_pool() -> BoundedPool:
+    """Pool for pandas extraction, normalization and feature work."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = BoundedPool("cpu", _cpu_executor, _cpu_workers() + ROUTE_QUEUE_DEPTH, ROUTE_TIMEOUT_SECONDS)
+    return _cpu_pool
+
+def get_io_pool() -> BoundedPool:
+    """Pool for blocking file and network calls."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = BoundedPool("io", _io_executor, ROUTE_IO_THREADS + ROUTE_QUEUE_DEPTH, ROUTE_TIMEOUT_SECONDS)
+    return _io_pool
+
+def get_clean_executor() -> Optional[Executor]:
+    """Process pool shared by transcript batches for cleaning, created once; None when NARRATIVE_CLEAN_WORKERS is 0.
+
+    Unbounded, unlike the route pools: every transcript of an accepted batch is cleaned.
+    """
+    global _clean_executor
+    if NARRATIVE_CLEAN_WORKERS <= 0:
+        return None
+    with _clean_lock:
+        if _clean_executor is None:
+            _clean_executor = ProcessPoolExecutor(max_workers=NARRATIVE_CLEAN_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _clean_executor
+
+async def run_cpu(fn: Callable[..., Any], *args: Any) -> Any:
+    return await get_cpu_pool().run(fn, *args)
+
+async def run_io(fn: Callable[..., Any], *args: Any) -> Any:
+    return await get_io_pool().run(fn, *args)
+
+def shutdown_pools() -> None:
+    global _clean_executor
+    for pool in (_cpu_pool, _io_pool):
+        if pool is not None:
+            pool.shutdown()
+    with _clean_lock:
+        executor, _clean_executor = _clean_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
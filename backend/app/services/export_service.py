@@ -0,0 +1,135 @@
+import io
+import json
+import logging
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.drift_engine import CATEGORY_LABELS
+from app.core.normalization import period_labels
+from app.services.drift_service import drift_columns, get_drift_profile
+from app.services.pipeline_service import PipelineService
+from app.services.metrics import span
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: Arrow exports fall back to NDJSON
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = [
+    "fy", "fp", "revenue", "net_income", "operating_cash_flow", "capex", "total_assets",
+    "free_cash_flow", "accrual_ratio", "ocf_conversion", "revenue_growth", "ocf_growth", "ni_growth",
+]
+DRIFT_COLUMNS = ["financial_momentum", "narrative_momentum", "drift_score", "drift_category"]
+EXPORT_COLUMNS = ["ticker", "period"] + FEATURE_COLUMNS + DRIFT_COLUMNS
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+def _arrow_schema() -> "pa.Schema":
+    types = {"ticker": pa.string(), "period": pa.string(), "fy": pa.int64(), "fp": pa.string(), "drift_category": pa.string()}
+    return pa.schema([(col, types.get(col, pa.float64())) for col in EXPORT_COLUMNS])
+
+
+class ExportService:
+    """Encodes processed frames for many tickers as CSV, Arrow IPC stream or NDJSON chunks."""
+
+    @staticmethod
+    def resolve_format(requested: str) -> str:
+        if requested == "arrow" and pa is None:
+            logger.warning("pyarrow is not installed; exporting NDJSON instead of Arrow")
+            return "ndjson"
+        return requested
+
+    @staticmethod
+    def export_frame(ticker: str) -> pd.DataFrame:
+        """Engineered features of one ticker in FEATURE_COLUMNS order, keyed by ticker and period."""
+        df = PipelineService.load_frame(ticker, "features")
+        out = df.reindex(columns=FEATURE_COLUMNS)
+        out.insert(0, "period", period_labels(df).to_numpy())
+        out.insert(0, "ticker", ticker)
+        return out
+
+    @staticmethod
+    def encode_chunk(tickers: List[str], fmt: str, profile: Optional[str] = None) -> Tuple[Any, Dict[str, str]]:
+        """Encodes the rows of several tickers; returns the payload and the skipped tickers with the reason.
+
+        The payload is bytes for CSV and NDJSON and a pyarrow Table for Arrow, which
+        ExportWriter appends to its single IPC stream.
+        """
+        frames, skipped = [], {}
+        for ticker in tickers:
+            try:
+                frames.append(ExportService.export_frame(ticker))
+            except ValueError as e:
+                logger.warning(f"Export skipped {ticker}: {e}")
+                skipped[ticker] = str(e)
+        if not frames:
+            return None, skipped
+
+        with span("export.encode"):
+            df = pd.concat(frames, ignore_index=True)
+            # Drift for the whole chunk in one vectorized pass
+            drift = drift_columns(df, get_drift_profile(profile))
+            for col in DRIFT_COLUMNS[:-1]:
+                df[col] = drift[col]
+            # Category codes become labels only here, as one vectorized lookup
+            df["drift_category"] = CATEGORY_LABELS[drift["drift_category"]]
+            if fmt == "csv":
+                return df.to_csv(index=False, header=False).encode(), skipped
+            if fmt == "ndjson":
+                body = df.to_json(orient="records", lines=True).encode()
+                return (body if body.endswith(b"\n") else body + b"\n"), skipped
+            return pa.Table.from_pandas(df, schema=_arrow_schema(), preserve_index=False), skipped
+
+
+class ExportWriter:
+    """Turns encoded chunks into the response body, ending with a trailer that marks a complete export.
+
+    The trailer lists skipped tickers: a ``#``-prefixed last line for CSV, a final
+    ``{"export": ...}`` record for NDJSON, and the custom metadata of a final empty
+    record batch for Arrow. A body without it was cut short.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.skipped: Dict[str, str] = {}
+        self._sink = io.BytesIO()
+        self._writer = None
+
+    def _drain(self) -> bytes:
+        body = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return body
+
+    def open(self) -> bytes:
+        """Bytes sent before the first chunk: the CSV header or the Arrow schema message."""
+        if self.fmt == "csv":
+            return (",".join(EXPORT_COLUMNS) + "\n").encode()
+        if self.fmt == "arrow":
+            self._writer = pa.ipc.new_stream(self._sink, _arrow_schema())
+            return self._drain()
+        return b""
+
+    def write(self, payload: Any, skipped: Dict[str, str]) -> bytes:
+        self.skipped.update(skipped)
+        if payload is None:
+            return b""
+        if self.fmt == "arrow":
+            self._writer.write_table(payload)
+            return self._drain()
+        return payload
+
+    def close(self) -> bytes:
+        summary = {"complete": True, "skipped": self.skipped}
+        if self.fmt == "csv":
+            return f"# export {json.dumps(summary)}\n".encode()
+        if self.fmt == "ndjson":
+            return (json.dumps({"export": summary}) + "\n").encode()
+        empty = pa.RecordBatch.from_pylist([], schema=_arrow_schema())
+        self._writer.write_batch(empty, custom_metadata={"export": json.dumps(summary)})
+        self._writer.close()
+        return self._drain()
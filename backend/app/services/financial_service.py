@@ -1,26 +1,46 @@
 import pandas as pd
-from typing import List
-from app.core.normalization import normalize_financial_data
+from typing import List, Optional
+from app.core.normalization import normalize_financial_data, period_labels
 from app.core.feature_engineering import engineering_financial_features
+from app.services.pipeline_service import PipelineService
+from app.services.metrics import span
+from app.services.serialization import render
 from app.models.schemas import FinancialsResponse
 
+FINANCIAL_COLUMNS = ["fy", "fp", "revenue_growth", "ocf_growth", "accrual_ratio", "free_cash_flow"]
+
 class FinancialService:
     @staticmethod
-    def get_financial_metrics(ticker: str, raw_df: pd.DataFrame) -> FinancialsResponse:
+    def get_financial_metrics(ticker: str, raw_df: Optional[pd.DataFrame] = None) -> FinancialsResponse:
         """Processes raw financial data into structured metrics."""
-        # 1. Pivot and Map to Canonical Pillars
-        normalized_df = normalize_financial_data(raw_df)
-        if normalized_df.empty:
-            raise ValueError(f"Failed to normalize financial data for {ticker}")
+        if raw_df is None:
+            # Warm path: read only the engineered columns from the processed store
+            with span("financials.load_features"):
+                df = PipelineService.load_frame(ticker, "features", columns=FINANCIAL_COLUMNS)
+        else:
+            # 1. Pivot and Map to Canonical Pillars
+            with span("financials.normalize"):
+                normalized_df = normalize_financial_data(raw_df)
+            if normalized_df.empty:
+                raise ValueError(f"Failed to normalize financial data for {ticker}")
 
-        # 2. Compute Engineering Features
-        df = engineering_financial_features(normalized_df)
+            # 2. Compute Engineering Features
+            with span("financials.features"):
+                df = engineering_financial_features(normalized_df)
         
-        return FinancialsResponse(
-            ticker=ticker,
-            quarterly_index=df.index.astype(str).tolist(),
-            revenue_growth=df["revenue_growth"].fillna(0).tolist(),
-            ocf_growth=df["ocf_growth"].fillna(0).tolist(),
-            accrual_ratio=df["accrual_ratio"].fillna(0).tolist(),
-            free_cash_flow=df["free_cash_flow"].fillna(0).tolist()
-        )
+        with span("financials.serialize"):
+            # Columns are float arrays by construction, so per-element validation is skipped;
+            # the arrays are handed to orjson as-is
+            return FinancialsResponse.model_construct(
+                ticker=ticker,
+                quarterly_index=period_labels(df).tolist(),
+                revenue_growth=df["revenue_growth"].fillna(0).to_numpy(dtype=float),
+                ocf_growth=df["ocf_growth"].fillna(0).to_numpy(dtype=float),
+                accrual_ratio=df["accrual_ratio"].fillna(0).to_numpy(dtype=float),
+                free_cash_flow=df["free_cash_flow"].fillna(0).to_numpy(dtype=float)
+            )
+
+    @staticmethod
+    def get_financials_payload(ticker: str, encoding: str = "json") -> bytes:
+        """Serialized metrics, so workers return bytes instead of the model."""
+        return render(FinancialService.get_financial_metrics(ticker), encoding)
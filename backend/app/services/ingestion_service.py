@@ -1,90 +1,280 @@
-import requests
 import json
-import logging
 import time
+import asyncio
+import logging
+import threading
+import requests
 import pandas as pd
-from typing import Optional, Dict, Any
-from app.config import CIK_MAPPING, SEC_REQUEST_RATE_LIMIT, DATA_RAW_DIR, SEC_USER_AGENT
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Iterable, List, TextIO, Union
+from app.core.json_stream import JSONStream, iter_members
+from app.services import metrics
+from app.services.metrics import span
+from app.services.raw_store import RawStore
+from app.services.sec_client import SECClient, SEC_RATE_LIMITER, RETRYABLE_STATUS, companyfacts_url, get_sec_client, retry_after_seconds
+from app.config import CIK_MAPPING, SEC_USER_AGENT, SEC_COMPANY_TICKERS_PATH
 
 logger = logging.getLogger(__name__)
 
+_session_local = threading.local()
+
+def _get_session() -> requests.Session:
+    """Per-thread keep-alive session for the synchronous fetch path."""
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"User-Agent": SEC_USER_AGENT})
+        _session_local.session = session
+    return session
+
+# Callbacks run with the ticker whenever a newer raw payload is persisted (e.g. cache invalidation)
+RAW_PERSISTED_LISTENERS: List[Callable[[str], None]] = []
+
+def _notify_raw_persisted(ticker: str) -> None:
+    for listener in RAW_PERSISTED_LISTENERS:
+        try:
+            listener(ticker)
+        except Exception as e:
+            logger.error(f"Raw persistence listener failed for {ticker}: {e}")
+
+def load_company_tickers(path: Path) -> Dict[str, int]:
+    """Reads a ticker -> CIK universe from SEC's company_tickers.json or a plain ticker,cik list."""
+    with open(path, 'r') as f:
+        if path.suffix == ".json":
+            payload = json.load(f)
+            entries = payload.values() if isinstance(payload, dict) else payload
+            return {str(e["ticker"]).upper(): int(e["cik_str"]) for e in entries}
+
+        universe = {}
+        for line in f:
+            parts = [p.strip() for p in line.split(",")]
+            if not parts[0] or parts[0].startswith("#"):
+                continue
+            cik = int(parts[1]) if len(parts) > 1 and parts[1] else CIK_MAPPING.get(parts[0].upper())
+            universe[parts[0].upper()] = cik
+        return universe
+
+_company_registry: Optional[Dict[str, int]] = None
+
 class IngestionService:
     @staticmethod
-    def fetch_raw_sec_data(ticker: str) -> Optional[Dict[str, Any]]:
-        """Retrieves raw XBRL facts from SEC with caching and rate limiting."""
+    def resolve_cik(ticker: str) -> Optional[int]:
+        """Looks up a CIK in the static mapping, then in the SEC company_tickers registry if configured."""
+        global _company_registry
         cik = CIK_MAPPING.get(ticker)
-        if not cik:
-            logger.error(f"Incomplete CIK mapping for {ticker}")
+        if cik or not SEC_COMPANY_TICKERS_PATH:
+            return cik
+        if _company_registry is None:
+            try:
+                _company_registry = load_company_tickers(Path(SEC_COMPANY_TICKERS_PATH))
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Failed to load company tickers from {SEC_COMPANY_TICKERS_PATH}: {e}")
+                _company_registry = {}
+        return _company_registry.get(ticker.upper())
+
+    @staticmethod
+    def raw_path(ticker: str) -> Path:
+        """Location of the cached raw companyfacts payload for a ticker."""
+        return RawStore.locate(ticker)
+
+    @staticmethod
+    def raw_version(ticker: str) -> Optional[str]:
+        """Identity of the cached raw payload; changes whenever a newer payload is persisted."""
+        fingerprint = RawStore.fingerprint(IngestionService.raw_path(ticker))
+        if fingerprint is None:
             return None
+        if "sha256" in fingerprint:
+            return fingerprint["sha256"][:16]
+        return f"{fingerprint['size']:x}-{fingerprint['mtime_ns']:x}"
 
+    @staticmethod
+    def fetch_raw_sec_data(ticker: str) -> Optional[Dict[str, Any]]:
+        """Retrieves raw XBRL facts from SEC with caching and rate limiting."""
         # check cache first
-        raw_path = DATA_RAW_DIR / f"{ticker}_raw.json"
+        raw_path = IngestionService.raw_path(ticker)
         if raw_path.exists():
             logger.info(f"Loading cached raw data for {ticker} from {raw_path}")
-            with open(raw_path, 'r') as f:
-                return json.load(f)
+            with span("ingest.load_raw"):
+                return RawStore.load(raw_path)
 
-        # SEC limits requests to 10 per second
-        time.sleep(SEC_REQUEST_RATE_LIMIT)
-
-        cik_padded = str(cik).zfill(10)
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik_padded}.json"
-        headers = {"User-Agent": SEC_USER_AGENT}
+        cik = IngestionService.resolve_cik(ticker)
+        if not cik:
+            logger.error(f"Incomplete CIK mapping for {ticker}")
+            return None
 
-        max_retries = 3
+        url = companyfacts_url(cik)
         backoff = 1.0 # initial backoff in seconds
+        max_retries = 3
 
         for attempt in range(max_retries):
+            # SEC limits requests to 10 per second, shared with the async client
+            SEC_RATE_LIMITER.acquire()
+            if attempt:
+                metrics.inc("drift_sec_retries_total")
             try:
                 logger.info(f"Fetching raw data from SEC for {ticker} (Attempt {attempt+1})")
-                response = requests.get(url, headers=headers)
+                with span("ingest.sec_download"):
+                    response = _get_session().get(url, timeout=30)
+                metrics.inc("drift_sec_requests_total", status=response.status_code)
                 response.raise_for_status()
                 data = response.json()
                 
-                # Persistence discipline: save raw payload
-                with open(raw_path, 'w') as f:
-                    json.dump(data, f)
+                # Persistence discipline: save the raw payload as received
+                raw_path = RawStore.path(ticker)
+                RawStore.save(ticker, response.content, cik, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                _notify_raw_persisted(ticker)
                 logger.info(f"Raw data persisted for {ticker} at {raw_path}")
                 
                 return data
             except requests.exceptions.RequestException as e:
-                if hasattr(e.response, 'status_code') and e.response.status_code == 429: # Too many requests
-                    logger.warning(f"Rate limited by SEC. Backing off for {backoff}s")
-                    time.sleep(backoff)
-                    backoff *= 2 # Exponential backoff
-                else:
+                status = getattr(e.response, 'status_code', None)
+                if status is None:
+                    metrics.inc("drift_sec_requests_total", status="error")
+                if status is not None and status not in RETRYABLE_STATUS:
                     logger.error(f"Ingestion failed for {ticker}: {e}")
-                    if attempt == max_retries - 1:
-                        return None
-                    time.sleep(backoff)
+                    return None
+                delay = retry_after_seconds(e.response.headers.get("Retry-After") if status else None, backoff)
+                logger.warning(f"Ingestion attempt failed for {ticker}: {e}. Backing off for {delay:.2f}s")
+                if attempt < max_retries - 1:
+                    time.sleep(delay)
+                    backoff *= 2 # Exponential backoff
         return None
 
     @staticmethod
-    def extract_facts_to_df(ticker: str, data: Dict[str, Any]) -> pd.DataFrame:
-        """Converts raw JSON facts to a flattened DataFrame for normalization."""
-        facts = data.get("facts", {}).get("us-gaap", {})
-        records = []
-        
-        # Extraction logic with unit and scaling awareness
-        for metric_name, metric_data in facts.items():
-            units_dict = metric_data.get("units", {})
-            # Prioritize USD for financial metrics, fall back to pure numbers if applicable
-            target_unit = "USD" if "USD" in units_dict else next(iter(units_dict)) if units_dict else None
-            
-            if not target_unit: continue
-            
-            for entry in units_dict[target_unit]:
-                if entry.get("form") in ["10-K", "10-Q"]:
-                    records.append({
-                        "ticker": ticker,
-                        "metric": metric_name,
-                        "value": entry.get("val"),
-                        "unit": target_unit,
-                        "decimals": entry.get("decimals"),
-                        "filed": entry.get("filed"),
-                        "fy": entry.get("fy"),
-                        "fp": entry.get("fp")
-                    })
-        
-        df = pd.DataFrame(records)
-        return df
+    async def fetch_raw_sec_data_async(ticker: str) -> Optional[Dict[str, Any]]:
+        """Non-blocking variant of fetch_raw_sec_data using the pooled async SEC client."""
+        raw_path = IngestionService.raw_path(ticker)
+        if raw_path.exists():
+            logger.info(f"Loading cached raw data for {ticker} from {raw_path}")
+            return await asyncio.to_thread(RawStore.load, raw_path)
+
+        cik = IngestionService.resolve_cik(ticker)
+        if not cik:
+            logger.error(f"Incomplete CIK mapping for {ticker}")
+            return None
+
+        return await IngestionService.download_raw_async(ticker, cik)
+
+    @staticmethod
+    async def download_raw_async(ticker: str, cik: int, client: Optional[SECClient] = None) -> Optional[Dict[str, Any]]:
+        """Downloads and persists a payload regardless of the cache state."""
+        result = await (client or get_sec_client()).fetch_companyfacts_raw(cik)
+        if result is None:
+            return None
+        raw_path = RawStore.path(ticker)
+        await asyncio.to_thread(RawStore.save, ticker, result.body, cik, result.etag, result.last_modified)
+        _notify_raw_persisted(ticker)
+        logger.info(f"Raw data persisted for {ticker} at {raw_path}")
+        return await asyncio.to_thread(json.loads, result.body)
+
+    @staticmethod
+    async def refresh_raw_async(ticker: str, cik: int, client: Optional[SECClient] = None) -> Optional[str]:
+        """Re-fetches a payload conditionally on the cached copy's ETag/Last-Modified.
+
+        Returns "downloaded" when a new payload was persisted, "unchanged" when SEC
+        answered 304 or sent identical content, and None when the fetch failed.
+        """
+        meta = await asyncio.to_thread(RawStore.read_meta, RawStore.path(ticker))
+        etag, last_modified = (meta["etag"], meta["last_modified"]) if meta else (None, None)
+        result = await (client or get_sec_client()).fetch_companyfacts_raw(cik, etag, last_modified)
+        if result is None:
+            return None
+
+        if result.not_modified:
+            await asyncio.to_thread(RawStore.mark_fetched, ticker, result.etag, result.last_modified)
+            changed = False
+        else:
+            changed = await asyncio.to_thread(RawStore.update, ticker, result.body, cik, result.etag, result.last_modified)
+        status = "downloaded" if changed else "unchanged"
+        metrics.inc("drift_raw_refresh_total", result=status)
+        if changed:
+            _notify_raw_persisted(ticker)
+        logger.info(f"Raw refresh for {ticker} | {status}")
+        return status
+
+    @staticmethod
+    async def ensure_raw_async(ticker: str) -> bool:
+        """Makes sure the raw payload is cached without blocking the event loop."""
+        if IngestionService.raw_path(ticker).exists():
+            return True
+        return await IngestionService.fetch_raw_sec_data_async(ticker) is not None
+
+    @staticmethod
+    def extract_facts_to_df(ticker: str, data: Dict[str, Any], tags: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Converts raw JSON facts to a flattened DataFrame for normalization.
+
+        When ``tags`` is given, only those us-gaap tags are materialized.
+        """
+        with span("ingest.extract_facts"):
+            facts = data.get("facts", {}).get("us-gaap", {})
+            wanted = set(tags) if tags is not None else None
+            columns = _new_fact_columns()
+
+            for metric_name, metric_data in facts.items():
+                if wanted is None or metric_name in wanted:
+                    _append_metric(columns, metric_name, metric_data)
+
+            return _fact_columns_to_df(ticker, columns)
+
+    @staticmethod
+    def stream_facts_to_df(ticker: str, source: Union[Path, TextIO], tags: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Incrementally parses a companyfacts payload, decoding only the requested us-gaap tags.
+
+        Unrequested tags and taxonomies are skipped member by member, so the full
+        document is never held as Python objects.
+        """
+        if isinstance(source, Path):
+            with span("ingest.stream_facts"), RawStore.open_text(source) as f:
+                return IngestionService.stream_facts_to_df(ticker, f, tags)
+
+        wanted = set(tags) if tags is not None else None
+        columns = _new_fact_columns()
+        stream = JSONStream(source)
+
+        for key in iter_members(stream):
+            if key != "facts":
+                stream.skip()
+                continue
+            for taxonomy in iter_members(stream):
+                if taxonomy != "us-gaap":
+                    stream.skip()
+                    continue
+                for metric_name in iter_members(stream):
+                    if wanted is None or metric_name in wanted:
+                        _append_metric(columns, metric_name, stream.decode())
+                    else:
+                        stream.skip()
+
+        return _fact_columns_to_df(ticker, columns)
+
+
+FACT_COLUMNS = ["metric", "value", "unit", "decimals", "filed", "fy", "fp"]
+
+def _new_fact_columns() -> Dict[str, List[Any]]:
+    return {col: [] for col in FACT_COLUMNS}
+
+def _append_metric(columns: Dict[str, List[Any]], metric_name: str, metric_data: Dict[str, Any]) -> None:
+    """Appends the 10-K/10-Q entries of one tag to the column arrays."""
+    # Extraction logic with unit and scaling awareness
+    units_dict = metric_data.get("units", {})
+    # Prioritize USD for financial metrics, fall back to pure numbers if applicable
+    target_unit = "USD" if "USD" in units_dict else next(iter(units_dict)) if units_dict else None
+    if not target_unit:
+        return
+
+    entries = [e for e in units_dict[target_unit] if e.get("form") in ("10-K", "10-Q")]
+    if not entries:
+        return
+
+    columns["metric"].extend([metric_name] * len(entries))
+    columns["value"].extend([e.get("val") for e in entries])
+    columns["unit"].extend([target_unit] * len(entries))
+    columns["decimals"].extend([e.get("decimals") for e in entries])
+    columns["filed"].extend([e.get("filed") for e in entries])
+    columns["fy"].extend([e.get("fy") for e in entries])
+    columns["fp"].extend([e.get("fp") for e in entries])
+
+def _fact_columns_to_df(ticker: str, columns: Dict[str, List[Any]]) -> pd.DataFrame:
+    if not columns["metric"]:
+        return pd.DataFrame()
+    return pd.DataFrame({"ticker": [ticker] * len(columns["metric"]), **columns})
@@ -0,0 +1,272 @@
+import sys
+import time
+import bisect
+import logging
+import threading
+import contextvars
+import tracemalloc
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import METRICS_ENABLED, METRICS_SERVER_TIMING, METRICS_TRACE_MEMORY
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Module flags rather than per-call config lookups: a disabled span is one attribute check
+ENABLED = METRICS_ENABLED
+SERVER_TIMING = METRICS_ENABLED and METRICS_SERVER_TIMING
+if METRICS_ENABLED and METRICS_TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "drift_stage_seconds": "Wall time of pipeline stages.",
+    "drift_http_request_seconds": "Wall time of HTTP requests by route template.",
+    "drift_stage_peak_memory_bytes": "Peak traced Python heap while a stage ran (METRICS_TRACE_MEMORY).",
+    "drift_worker_peak_rss_bytes": "Highest peak RSS reported by route worker processes.",
+    "drift_cache_requests_total": "Cache lookups by cache and result.",
+    "drift_sec_requests_total": "SEC companyfacts requests by outcome.",
+    "drift_sec_retries_total": "SEC companyfacts requests that were retries.",
+    "drift_raw_refresh_total": "Raw payload refreshes by result (downloaded or unchanged).",
+    "drift_llm_calls_total": "LLM completions by outcome.",
+    "drift_pool_rejections_total": "Route pool submissions rejected as saturated.",
+    "drift_pool_timeouts_total": "Route pool calls that exceeded their timeout.",
+    "process_peak_rss_bytes": "Peak resident set size of the API process.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, Labels]
+
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class MetricsRegistry:
+    """Counters, max-gauges and fixed-bucket histograms, renderable as Prometheus text."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[SeriesKey, float] = {}
+        self.gauges: Dict[SeriesKey, float] = {}
+        # [per-bucket counts..., +Inf count, sum]
+        self.histograms: Dict[SeriesKey, List[float]] = {}
+
+    def inc(self, name: str, amount: float, labels: Labels) -> None:
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + amount
+
+    def set_max(self, name: str, value: float, labels: Labels) -> None:
+        key = (name, labels)
+        with self._lock:
+            if value > self.gauges.get(key, float("-inf")):
+                self.gauges[key] = value
+
+    def observe(self, name: str, value: float, labels: Labels) -> None:
+        key = (name, labels)
+        slot = bisect.bisect_left(BUCKETS, value)
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0.0] * (len(BUCKETS) + 2)
+            series[slot] += 1
+            series[-1] += value
+
+    def drain(self) -> Dict[str, Dict[SeriesKey, Any]]:
+        """Returns everything recorded so far and starts over; worker processes ship this to the parent."""
+        with self._lock:
+            snapshot = {"counters": self.counters, "gauges": self.gauges, "histograms": self.histograms}
+            self.counters, self.gauges, self.histograms = {}, {}, {}
+        return snapshot
+
+    def merge(self, snapshot: Dict[str, Dict[SeriesKey, Any]]) -> None:
+        with self._lock:
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0.0) + value
+            for key, value in snapshot["gauges"].items():
+                if value > self.gauges.get(key, float("-inf")):
+                    self.gauges[key] = value
+            for key, values in snapshot["histograms"].items():
+                series = self.histograms.setdefault(key, [0.0] * len(values))
+                for i, value in enumerate(values):
+                    series[i] += value
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        with self._lock:
+            counters, gauges = dict(self.counters), dict(self.gauges)
+            histograms = {key: list(values) for key, values in self.histograms.items()}
+
+        lines: List[str] = []
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in series}):
+                _header(lines, name, kind)
+                for (metric, labels), value in sorted(series.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name in sorted({name for name, _ in histograms}):
+            _header(lines, name, "histogram")
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(BUCKETS + (float("inf"),), values):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(values[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+def _header(lines: List[str], name: str, kind: str) -> None:
+    lines.append(f"# HELP {name} {HELP.get(name, name)}")
+    lines.append(f"# TYPE {name} {kind}")
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    """Increments a counter; a no-op when metrics are disabled."""
+    if ENABLED:
+        REGISTRY.inc(name, amount, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+
+_memory_stack = threading.local()
+
+class _Span:
+    __slots__ = ("stage", "started", "peak")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.peak: Optional[int] = None
+
+    def __enter__(self) -> "_Span":
+        if tracemalloc.is_tracing():
+            # Peaks are process-wide, so they are approximate when stages run concurrently
+            stack = _memory_stack.__dict__.setdefault("frames", [])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.peak = 0
+            stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.started
+        labels = (("stage", self.stage),)
+        REGISTRY.observe("drift_stage_seconds", elapsed, labels)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((self.stage, elapsed))
+        if self.peak is not None:
+            stack = _memory_stack.frames
+            stack.pop()
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            REGISTRY.set_max("drift_stage_peak_memory_bytes", peak, labels)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+
+_NOOP_SPAN = nullcontext()
+
+def span(stage: str) -> Any:
+    """Times a block as ``stage`` in drift_stage_seconds and the request's Server-Timing header."""
+    return _Span(stage) if ENABLED else _NOOP_SPAN
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_collected(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Optional[List[Tuple[str, float]]], Dict[str, Any]]:
+    """Runs ``fn`` in a worker process and returns its result with the metrics it recorded."""
+    timings: Optional[List[Tuple[str, float]]] = [] if SERVER_TIMING else None
+    token = _request_timings.set(timings)
+    try:
+        result = fn(*args)
+    finally:
+        _request_timings.reset(token)
+    rss = peak_rss_bytes()
+    if rss is not None:
+        REGISTRY.set_max("drift_worker_peak_rss_bytes", rss, ())
+    return result, timings, REGISTRY.drain()
+
+def merge_collected(payload: Tuple[Any, Optional[List[Tuple[str, float]]], Dict[str, Any]]) -> Any:
+    """Folds a run_collected payload into this process and returns the call's result."""
+    result, timings, snapshot = payload
+    REGISTRY.merge(snapshot)
+    current = _request_timings.get()
+    if current is not None and timings:
+        current.extend(timings)
+    return result
+
+
+def render() -> str:
+    rss = peak_rss_bytes()
+    if ENABLED and rss is not None:
+        REGISTRY.set_max("process_peak_rss_bytes", rss, ())
+    return REGISTRY.render()
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    """Server-Timing value with repeated stages summed, in first-seen order."""
+    merged: Dict[str, float] = {}
+    for stage, seconds in timings:
+        merged[stage] = merged.get(stage, 0.0) + seconds
+    merged["total"] = total
+    return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in merged.items())
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the matched route (router prefix included), so series stay bounded per route."""
+    # Newer FastAPI keeps included routes unprefixed in scope["route"] and records the prefixed one here
+    route = (scope.get("fastapi") or {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Times requests by route template and, when enabled, adds a Server-Timing header."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Optional[List[Tuple[str, float]]] = [] if SERVER_TIMING else None
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if timings is not None and message["type"] == "http.response.start":
+                value = server_timing_header(timings, time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", value.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REGISTRY.observe("drift_http_request_seconds", time.perf_counter() - started, (("route", _route_template(scope)),))
+            _request_timings.reset(token)
@@ -1,49 +1,308 @@
 import os
+import re
 import json
+import random
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-import openai
-from app.config import LLM_CONFIG, OPENAI_API_KEY, DATA_TRANSCRIPTS_DIR
-from app.core.transcript_parser import clean_transcript_text
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import pandas as pd
+from app.config import (
+    LLM_CONFIG, OPENAI_API_KEY, DATA_TRANSCRIPTS_DIR, LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE, LLM_MAX_RETRIES, LLM_CHUNKING, LLM_CHUNK_TOKENS,
+    NARRATIVE_SCORER, LEXICON_AMBIGUITY_BAND, LEXICON_MIN_HITS, MOMENTUM_WEIGHTS,
+)
+from app.core.drift_engine import compute_momentum_vector
+from app.core.lexicon import score_transcript, is_ambiguous
+from app.core.transcript_parser import (
+    clean_transcript_text, chunk_transcript, aggregate_chunk_signals, normalize_narrative_signals,
+)
+from app.services import metrics
+from app.services.executors import get_clean_executor
+from app.services.metrics import span
+from app.services.rate_limiter import TokenBucket
+from app.services.signal_cache import SignalCache, get_signal_cache
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "Analytical Quant. JSON only. Extract: optimism (float -1 to 1), risk (int)."
+MAX_PROMPT_CHARS = 10000
+NEUTRAL_SIGNALS = {"optimism": 0.0, "risk": 0}
+RETRY_BASE_DELAY = 1.0
+SCORERS = ("llm", "lexicon", "hybrid")
+CLEAN_SUFFIX = "_clean.txt"
+SIGNALS_SUFFIX = "_signals.json"
+# Fiscal period tokens in stored transcript names, in reporting order
+PERIOD_RANKS = {"q1": 0, "q2": 1, "q3": 2, "q4": 3, "fy": 4}
+
+# Provider budgets are per API key, so they are shared by every service instance
+LLM_REQUEST_LIMITER = TokenBucket(rate=LLM_REQUESTS_PER_MINUTE / 60, capacity=LLM_REQUESTS_PER_MINUTE)
+LLM_TOKEN_LIMITER = TokenBucket(rate=LLM_TOKENS_PER_MINUTE / 60, capacity=LLM_TOKENS_PER_MINUTE)
+
+def period_sort_key(period: str) -> Tuple[int, int, str]:
+    """(fiscal year, period rank, name) for a stored period such as "2023_q1", so FY follows Q1-Q4."""
+    year = re.search(r"\d{4}", period)
+    token = re.search(r"q[1-4]|fy", period)
+    rank = PERIOD_RANKS[token.group()] if token else len(PERIOD_RANKS)
+    return (int(year.group()) if year else -1, rank, period)
+
+def coerce_signals(signals: Dict[str, Any]) -> Dict[str, Any]:
+    """Signals in the declared types: LLM replies may carry a fractional or string risk count."""
+    return {"optimism": float(signals.get("optimism", 0.0)), "risk": int(round(float(signals.get("risk", 0))))}
+
+def estimate_tokens(prompt_text: str) -> int:
+    """Rough prompt + completion token cost used against the per-minute token budget."""
+    return (len(SYSTEM_PROMPT) + len(prompt_text)) // 4 + LLM_CONFIG["max_tokens"]
+
 class NarrativeService:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Optional[Any] = None,
+        cache: Optional[SignalCache] = None,
+        chunking: bool = LLM_CHUNKING,
+        chunk_tokens: int = LLM_CHUNK_TOKENS,
+        scorer: str = NARRATIVE_SCORER,
+    ):
+        """``client`` may be any object exposing ``chat.completions.create`` (e.g. a local fake in tests)."""
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown narrative scorer {scorer!r}; expected one of {SCORERS}")
         self.api_key = api_key or OPENAI_API_KEY
-        self.client = None
-        if self.api_key:
+        self.scorer = scorer
+        self.chunking = chunking
+        self.chunk_tokens = chunk_tokens
+        self.client = client
+        if self.client is None and self.api_key:
+            # The SDK takes longer to import than the rest of the service; only load it when a key is set
+            import openai
             self.client = openai.OpenAI(api_key=self.api_key)
+        self.cache = cache if cache is not None else get_signal_cache()
+
+    @staticmethod
+    def _transcript_path(ticker: str, fiscal_period: str, suffix: str):
+        safe_period = fiscal_period.replace(" ", "_").lower()
+        return DATA_TRANSCRIPTS_DIR / f"{ticker}_{safe_period}{suffix}"
+
+    @staticmethod
+    def _persist_clean_text(ticker: str, fiscal_period: str, clean_text: str) -> None:
+        clean_path = NarrativeService._transcript_path(ticker, fiscal_period, CLEAN_SUFFIX)
+        clean_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(clean_path, 'w', encoding='utf-8') as f:
+            f.write(clean_text)
+
+    @staticmethod
+    def _persist_signals(ticker: str, fiscal_period: str, clean_text: str, signals: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores the extracted signals with the lexicon counts next to the clean text; history reads these."""
+        lexicon = score_transcript(clean_text)
+        row = {
+            **coerce_signals(signals),
+            "risk_mentions": lexicon["risk"],
+            "forward_looking_density": lexicon["forward_looking_density"],
+        }
+        signals_path = NarrativeService._transcript_path(ticker, fiscal_period, SIGNALS_SUFFIX)
+        signals_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(signals_path, 'w', encoding='utf-8') as f:
+            json.dump(row, f)
+        return row
 
     def process_transcript(self, ticker: str, fiscal_period: str, raw_text: str) -> Dict[str, Any]:
         """Cleans transcript and extracts structured signals."""
-        clean_text = clean_transcript_text(raw_text)
+        with span("narrative.clean"):
+            clean_text = clean_transcript_text(raw_text)
         
         # Persist clean text
-        safe_period = fiscal_period.replace(" ", "_").lower()
-        clean_path = DATA_TRANSCRIPTS_DIR / f"{ticker}_{safe_period}_clean.txt"
-        with open(clean_path, 'w', encoding='utf-8') as f:
-            f.write(clean_text)
-            
-        return self.extract_signals(clean_text)
+        self._persist_clean_text(ticker, fiscal_period, clean_text)
+
+        signals = self.extract_signals(clean_text)
+        self._persist_signals(ticker, fiscal_period, clean_text, signals)
+        return signals
+
+    async def process_batch(
+        self,
+        items: Sequence[Tuple[str, str, str]],
+        clean_in_processes: bool = True,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Processes many (ticker, fiscal_period, raw_text) items concurrently.
+
+        Cleaning runs on the shared clean process pool (or the loop's thread pool),
+        LLM calls are bounded by ``max_concurrency`` and the shared request/token
+        budgets, and results come back in input order.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_clean_executor() if clean_in_processes else None
+        llm_slots = asyncio.Semaphore(max_concurrency)
+
+        async def run(ticker: str, fiscal_period: str, raw_text: str) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"ticker": ticker, "fiscal_period": fiscal_period}
+            try:
+                clean_text = await loop.run_in_executor(executor, clean_transcript_text, raw_text)
+                await asyncio.to_thread(self._persist_clean_text, ticker, fiscal_period, clean_text)
+                signals = coerce_signals(await self.extract_signals_async(clean_text, llm_slots))
+                await asyncio.to_thread(self._persist_signals, ticker, fiscal_period, clean_text, signals)
+                result.update(signals, error=None)
+            except Exception as e:
+                logger.error(f"TRANSCRIPT BATCH ERROR | {ticker} {fiscal_period} | {e}")
+                result.update(NEUTRAL_SIGNALS, error=str(e))
+            return result
+
+        return list(await asyncio.gather(*(run(*item) for item in items)))
+
+    def _local_signals(self, text: str) -> Optional[Dict[str, Any]]:
+        """Lexicon signals when they settle the score locally, None when the LLM should decide."""
+        if self.scorer == "llm" and self.client:
+            return None
+        with span("narrative.lexicon"):
+            scores = score_transcript(text)
+        if self.scorer == "hybrid" and self.client and is_ambiguous(scores, LEXICON_AMBIGUITY_BAND, LEXICON_MIN_HITS):
+            return None
+        return {"optimism": scores["optimism"], "risk": scores["risk"]}
+
+    def _prompt_chunks(self, text: str) -> List[str]:
+        """Prompt texts to score: sentence-aligned chunks, or the legacy truncated prefix."""
+        if self.chunking:
+            return chunk_transcript(text, max_tokens=self.chunk_tokens)
+        return [text[:MAX_PROMPT_CHARS]]
+
+    async def extract_signals_async(self, text: str, slots: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """Budgeted, retrying counterpart of extract_signals for concurrent callers; raises once retries are exhausted."""
+        local = self._local_signals(text)
+        if local is not None:
+            return local
+
+        chunks = self._prompt_chunks(text)
+        if not chunks:
+            return dict(NEUTRAL_SIGNALS)
+        # Chunks share the caller's slots, so a long transcript costs concurrency, not latency
+        slots = slots or asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        signals = await asyncio.gather(*(self._extract_chunk_async(chunk, slots) for chunk in chunks))
+        if len(chunks) == 1:
+            return signals[0]
+        return aggregate_chunk_signals(signals, [len(chunk) for chunk in chunks])
+
+    async def _extract_chunk_async(self, prompt_text: str, slots: asyncio.Semaphore) -> Dict[str, Any]:
+        key = self.cache_key(prompt_text)
+        cached = self.cache.get(key, LLM_CONFIG["model"])
+        metrics.inc("drift_cache_requests_total", cache="signal", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+        for attempt in range(LLM_MAX_RETRIES):
+            async with slots:
+                await LLM_REQUEST_LIMITER.acquire_async()
+                await LLM_TOKEN_LIMITER.acquire_async(estimate_tokens(prompt_text))
+                try:
+                    signals = await asyncio.to_thread(self._complete, prompt_text)
+                    break
+                except Exception as e:
+                    if attempt == LLM_MAX_RETRIES - 1:
+                        raise
+                    logger.warning(f"LLM attempt {attempt + 1} failed: {e}")
+            # Full jitter outside the slot so a backing-off call does not hold concurrency
+            await asyncio.sleep(random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt))
+
+        self.cache.put(key, LLM_CONFIG["model"], signals)
+        return signals
+
+    def _complete(self, prompt_text: str) -> Dict[str, Any]:
+        """Single chat completion; raises on transport or parsing errors."""
+        try:
+            with span("narrative.llm"):
+                response = self.client.chat.completions.create(
+                    model=LLM_CONFIG["model"],
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": f"TEXT: {prompt_text}"}
+                    ],
+                    temperature=LLM_CONFIG["temperature"],
+                    seed=LLM_CONFIG["seed"],
+                    response_format={"type": "json_object"}
+                )
+                signals = coerce_signals(json.loads(response.choices[0].message.content))
+        except Exception:
+            metrics.inc("drift_llm_calls_total", outcome="error")
+            raise
+        metrics.inc("drift_llm_calls_total", outcome="ok")
+        return signals
+
+    def cache_key(self, prompt_text: str) -> str:
+        return SignalCache.make_key(prompt_text, LLM_CONFIG["model"], SYSTEM_PROMPT, LLM_CONFIG)
+
+    def _extract_chunk(self, prompt_text: str) -> Dict[str, Any]:
+        """Cached single-prompt extraction; raises on failure so errors are never cached."""
+        key = self.cache_key(prompt_text)
+        cached = self.cache.get(key, LLM_CONFIG["model"])
+        metrics.inc("drift_cache_requests_total", cache="signal", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+        LLM_REQUEST_LIMITER.acquire()
+        LLM_TOKEN_LIMITER.acquire(estimate_tokens(prompt_text))
+        signals = self._complete(prompt_text)
+        self.cache.put(key, LLM_CONFIG["model"], signals)
+        return signals
 
     def extract_signals(self, text: str) -> Dict[str, Any]:
-        """Deterministic signal extraction using LLM."""
-        if not self.client:
-            return {"optimism": 0.0, "risk": 0}
+        """Deterministic signal extraction using the configured scorer."""
+        local = self._local_signals(text)
+        if local is not None:
+            return local
+
+        # temperature=0 and a pinned seed make completions a pure function of the prompt
+        chunks = self._prompt_chunks(text)
+        if not chunks:
+            return dict(NEUTRAL_SIGNALS)
 
         try:
-            response = self.client.chat.completions.create(
-                model=LLM_CONFIG["model"],
-                messages=[
-                    {"role": "system", "content": "Analytical Quant. JSON only. Extract: optimism (float -1 to 1), risk (int)."},
-                    {"role": "user", "content": f"TEXT: {text[:10000]}"}
-                ],
-                temperature=LLM_CONFIG["temperature"],
-                seed=LLM_CONFIG["seed"],
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
+            if len(chunks) == 1:
+                return self._extract_chunk(chunks[0])
+            with ThreadPoolExecutor(max_workers=min(LLM_MAX_CONCURRENCY, len(chunks))) as pool:
+                signals = list(pool.map(self._extract_chunk, chunks))
         except Exception as e:
             logger.error(f"LLM EXTRACTION ERROR | {e}")
-            return {"optimism": 0.0, "risk": 0}
+            return dict(NEUTRAL_SIGNALS)
+        return aggregate_chunk_signals(signals, [len(chunk) for chunk in chunks])
+
+    def get_narrative_history(self, ticker: str) -> Optional[Dict[str, List[float]]]:
+        """Per-period signals from the stored transcripts of a ticker, oldest first; None if there are none.
+
+        Signals persisted when a transcript was processed are read back; transcripts
+        stored before that are scored once and their signals persisted.
+        """
+        periods = sorted(
+            (path.name[len(ticker) + 1:-len(CLEAN_SUFFIX)] for path in DATA_TRANSCRIPTS_DIR.glob(f"{ticker}_*{CLEAN_SUFFIX}")),
+            key=period_sort_key,
+        )
+        if not periods:
+            return None
+
+        rows = []
+        for period in periods:
+            signals_path = self._transcript_path(ticker, period, SIGNALS_SUFFIX)
+            try:
+                with open(signals_path, "r", encoding="utf-8") as f:
+                    row = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                text = self._transcript_path(ticker, period, CLEAN_SUFFIX).read_text(encoding="utf-8")
+                row = self._persist_signals(ticker, period, text, self.extract_signals(text))
+            rows.append(dict(row, period=period))
+
+        df = normalize_narrative_signals(pd.DataFrame(rows))
+        momentum = compute_momentum_vector(df, MOMENTUM_WEIGHTS["narrative"])
+        return {
+            "periods": df["period"].tolist(),
+            "optimism_score": df["optimism"].tolist(),
+            "risk_mentions": df["risk_mentions"].tolist(),
+            "forward_looking_density": df["forward_looking_density"].tolist(),
+            "narrative_momentum": momentum.tolist(),
+        }
+
+
+_default_service: Optional[NarrativeService] = None
+
+def get_narrative_service() -> NarrativeService:
+    """Process-wide service shared by the narrative routes."""
+    global _default_service
+    if _default_service is None:
+        _default_service = NarrativeService()
+    return _default_service
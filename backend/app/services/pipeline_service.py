@@ -0,0 +1,93 @@
+import logging
+import pandas as pd
+from typing import Optional, Dict, Any, List, Tuple
+from app.core.normalization import normalize_financial_data, PILLAR_MAPPING
+from app.core.feature_engineering import engineering_financial_features
+from app.core.incremental import build_incremental_state, incremental_update
+from app.services.ingestion_service import IngestionService
+from app.services.processed_store import ProcessedStore
+from app.services import metrics
+from app.services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineService:
+    @staticmethod
+    def build_frames(ticker: str, facts_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Runs normalization and feature engineering on extracted long-form facts."""
+        with span("pipeline.normalize"):
+            normalized_df = normalize_financial_data(facts_df)
+        if normalized_df.empty:
+            raise ValueError(f"Normalization failed for {ticker}")
+
+        with span("pipeline.features"):
+            features_df = engineering_financial_features(normalized_df)
+        return {"facts": facts_df, "normalized": normalized_df, "features": features_df}
+
+    @staticmethod
+    def _incremental_frames(ticker: str, facts_df: pd.DataFrame) -> Optional[Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]]:
+        """Appends newly filed periods to the stored frames when the store allows it."""
+        state = ProcessedStore.load_state(ticker)
+        if state is None:
+            return None
+        stored = {name: ProcessedStore.load_frame(ticker, name) for name in ("facts", "normalized", "features")}
+        if any(frame is None for frame in stored.values()):
+            return None
+        return incremental_update(stored, state, facts_df)
+
+    @staticmethod
+    def rebuild(ticker: str, facts_df: pd.DataFrame, fingerprint: Optional[Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+        """Refreshes processed frames, incrementally when possible, and persists them."""
+        result = PipelineService._incremental_frames(ticker, facts_df)
+        if result is not None:
+            frames, state = result
+            logger.info(f"Incremental refresh for {ticker} | {state['last_filed']}")
+        else:
+            frames = PipelineService.build_frames(ticker, facts_df)
+            state = build_incremental_state(frames)
+
+        if fingerprint is not None:
+            with span("store.save"):
+                ProcessedStore.save(ticker, fingerprint, frames, state)
+        return frames
+
+    @staticmethod
+    def refresh_processed(ticker: str, force: bool = False) -> Dict[str, Any]:
+        """Rebuilds the processed store for a ticker from its cached raw payload if it is stale."""
+        raw_path = IngestionService.raw_path(ticker)
+        fingerprint = ProcessedStore.source_fingerprint(raw_path)
+        if fingerprint is None:
+            raise ValueError(f"Raw payload missing for {ticker}")
+        if not force and ProcessedStore.is_current(ticker, fingerprint):
+            return {"ticker": ticker, "status": "current", "raw_bytes": fingerprint["size"]}
+
+        facts_df = IngestionService.stream_facts_to_df(ticker, raw_path, tags=PILLAR_MAPPING)
+        frames = PipelineService.rebuild(ticker, facts_df, fingerprint)
+        return {"ticker": ticker, "status": "built", "periods": len(frames["normalized"]), "raw_bytes": fingerprint["size"]}
+
+    @staticmethod
+    def load_frame(ticker: str, frame: str = "features", columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Serves a processed frame from the columnar store, rebuilding it when the raw payload changed."""
+        raw_path = IngestionService.raw_path(ticker)
+        data = None
+        if not raw_path.exists():
+            data = IngestionService.fetch_raw_sec_data(ticker)
+            if not data:
+                raise ValueError(f"Data unavailable for {ticker}")
+
+        fingerprint = ProcessedStore.source_fingerprint(raw_path)
+        with span("store.load"):
+            cached = ProcessedStore.load_frame(ticker, frame, columns, fingerprint)
+        metrics.inc("drift_cache_requests_total", cache="processed", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
+        if data is None:
+            # Cached payload: stream it, decoding only the tags normalization maps
+            facts_df = IngestionService.stream_facts_to_df(ticker, raw_path, tags=PILLAR_MAPPING)
+        else:
+            facts_df = IngestionService.extract_facts_to_df(ticker, data, tags=PILLAR_MAPPING)
+
+        df = PipelineService.rebuild(ticker, facts_df, fingerprint)[frame]
+        return df[columns] if columns is not None else df
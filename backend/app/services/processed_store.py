@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from app.config import DATA_PROCESSED_DIR
+from app.services.raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or the upstream transforms change so stale
+# entries are rebuilt instead of served.
+STORE_VERSION = 3
+MANIFEST_NAME = "manifest.json"
+
+
+def _encode_column(series: pd.Series, path: Path) -> Dict[str, Any]:
+    """Writes one column as a .npy file; non-numeric columns become category codes."""
+    dtype = str(series.dtype)
+    if series.dtype.kind in "biufM":
+        np.save(path, series.to_numpy(), allow_pickle=False)
+        return {"file": path.name, "dtype": dtype, "encoding": "raw"}
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    categories = [v.item() if isinstance(v, np.generic) else v for v in uniques]
+    np.save(path, codes.astype(np.int32), allow_pickle=False)
+    return {"file": path.name, "dtype": dtype, "encoding": "categorical", "categories": categories}
+
+
+def _decode_column(meta: Dict[str, Any], path: Path) -> Any:
+    """Reads a column back; only the requested columns' files are opened."""
+    if meta["encoding"] == "raw":
+        # Read fully: the DataFrame copies columns into its own blocks, so a memory map would save nothing
+        return np.load(path, allow_pickle=False)
+
+    codes = np.load(path, allow_pickle=False)
+    categories = np.empty(len(meta["categories"]) + 1, dtype=object)
+    categories[:-1] = meta["categories"]
+    categories[-1] = None
+    return pd.Series(categories[codes], dtype=meta["dtype"])
+
+
+class ProcessedStore:
+    """Columnar per-ticker cache of extracted, normalized and engineered frames."""
+
+    @staticmethod
+    def ticker_dir(ticker: str) -> Path:
+        return DATA_PROCESSED_DIR / ticker
+
+    @staticmethod
+    def source_fingerprint(raw_path: Path) -> Optional[Dict[str, Any]]:
+        """Identity of a raw payload (content hash, or size + mtime for legacy files) used to key processed frames."""
+        fingerprint = RawStore.fingerprint(raw_path)
+        if fingerprint is None:
+            return None
+        return {**fingerprint, "store_version": STORE_VERSION}
+
+    @staticmethod
+    def read_manifest(ticker: str) -> Optional[Dict[str, Any]]:
+        manifest_path = ProcessedStore.ticker_dir(ticker) / MANIFEST_NAME
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def is_current(ticker: str, fingerprint: Optional[Dict[str, Any]]) -> bool:
+        manifest = ProcessedStore.read_manifest(ticker)
+        return bool(manifest) and fingerprint is not None and manifest.get("source") == fingerprint
+
+    @staticmethod
+    def save(
+        ticker: str,
+        fingerprint: Dict[str, Any],
+        frames: Dict[str, pd.DataFrame],
+        state: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Persists frames column-by-column and atomically swaps the manifest.
+
+        ``state`` is small JSON bookkeeping kept alongside the frames (e.g. what
+        incremental feature engineering needs to append new filings).
+        """
+        ticker_dir = ProcessedStore.ticker_dir(ticker)
+        token = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:16]
+        version_dir = ticker_dir / f"v{token}-{os.getpid()}"
+        if version_dir.exists():
+            shutil.rmtree(version_dir)
+
+        schema = {}
+        for name, frame in frames.items():
+            frame_dir = version_dir / name
+            frame_dir.mkdir(parents=True, exist_ok=True)
+            frame = frame.reset_index(drop=True)
+            schema[name] = {
+                "rows": len(frame),
+                "columns_name": frame.columns.name,
+                "columns": {
+                    str(col): _encode_column(frame[col], frame_dir / f"c{i}.npy")
+                    for i, col in enumerate(frame.columns)
+                },
+            }
+
+        manifest = {
+            "ticker": ticker,
+            "source": fingerprint,
+            "version_dir": version_dir.name,
+            "frames": schema,
+            "state": state or {},
+        }
+        tmp_path = ticker_dir / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, ticker_dir / MANIFEST_NAME)
+        logger.info(f"Processed frames persisted for {ticker} at {version_dir}")
+
+        # Best-effort cleanup of superseded versions
+        for stale in ticker_dir.glob("v*"):
+            if stale.is_dir() and stale.name != version_dir.name:
+                shutil.rmtree(stale, ignore_errors=True)
+
+    @staticmethod
+    def load_state(ticker: str) -> Optional[Dict[str, Any]]:
+        """Bookkeeping saved with the current frames, if they were written by this store version."""
+        manifest = ProcessedStore.read_manifest(ticker)
+        if not manifest or manifest.get("source", {}).get("store_version") != STORE_VERSION:
+            return None
+        return manifest.get("state") or None
+
+    @staticmethod
+    def load_frame(
+        ticker: str,
+        frame: str,
+        columns: Optional[List[str]] = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Reads selected columns of a stored frame; returns None when missing or stale."""
+        manifest = ProcessedStore.read_manifest(ticker)
+        if not manifest or frame not in manifest["frames"]:
+            return None
+        if fingerprint is not None and manifest.get("source") != fingerprint:
+            logger.info(f"Processed frames for {ticker} are stale, rebuilding")
+            return None
+
+        schema = manifest["frames"][frame]
+        frame_dir = ProcessedStore.ticker_dir(ticker) / manifest["version_dir"] / frame
+        selected = list(schema["columns"]) if columns is None else columns
+        missing = [c for c in selected if c not in schema["columns"]]
+        if missing:
+            logger.warning(f"Processed {frame} frame for {ticker} lacks columns {missing}")
+            return None
+
+        try:
+            data = {
+                col: _decode_column(schema["columns"][col], frame_dir / schema["columns"][col]["file"])
+                for col in selected
+            }
+        except FileNotFoundError:
+            # Manifest swapped underneath us by a concurrent writer
+            return None
+        df = pd.DataFrame(data, index=pd.RangeIndex(schema["rows"]))
+        df.columns.name = schema.get("columns_name")
+        return df
@@ -0,0 +1,38 @@
+import time
+import asyncio
+import threading
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by sync and async callers.
+
+    Callers reserve a token up front (the bucket may go into debt) and then sleep
+    for the returned delay, so waiting never happens while holding the lock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Takes ``cost`` tokens and returns how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, cost: float = 1.0) -> None:
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, cost: float = 1.0) -> None:
+        delay = self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,176 @@
+import os
+import io
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, TextIO
+from app.config import DATA_RAW_DIR
+
+logger = logging.getLogger(__name__)
+
+# companyfacts JSON compresses roughly 8-10x; level 6 keeps writes well under the download time
+COMPRESSLEVEL = 6
+RAW_SUFFIX = "_raw.json.gz"
+LEGACY_SUFFIX = "_raw.json"
+META_SUFFIX = "_raw.meta.json"
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Writes through a temporary file so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class RawStore:
+    """Gzip-compressed cache of SEC companyfacts payloads.
+
+    Each payload sits next to a small metadata file (CIK, fetch time, HTTP
+    validators, content hash) so refreshes can send conditional requests and
+    unchanged filers keep their downstream caches.
+    """
+
+    @staticmethod
+    def path(ticker: str) -> Path:
+        return DATA_RAW_DIR / f"{ticker}{RAW_SUFFIX}"
+
+    @staticmethod
+    def legacy_path(ticker: str) -> Path:
+        return DATA_RAW_DIR / f"{ticker}{LEGACY_SUFFIX}"
+
+    @staticmethod
+    def meta_path(raw_path: Path) -> Path:
+        ticker = raw_path.name.removesuffix(RAW_SUFFIX).removesuffix(LEGACY_SUFFIX)
+        return raw_path.with_name(f"{ticker}{META_SUFFIX}")
+
+    @staticmethod
+    def locate(ticker: str) -> Path:
+        """The compressed payload, an uncompressed one written by older versions, or where a new one goes."""
+        path = RawStore.path(ticker)
+        if path.exists():
+            return path
+        legacy = RawStore.legacy_path(ticker)
+        return legacy if legacy.exists() else path
+
+    @staticmethod
+    def open_text(raw_path: Path) -> TextIO:
+        if raw_path.name.endswith(".gz"):
+            return gzip.open(raw_path, "rt", encoding="utf-8")
+        return open(raw_path, "r", encoding="utf-8")
+
+    @staticmethod
+    def load(raw_path: Path) -> Dict[str, Any]:
+        with RawStore.open_text(raw_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def read_meta(raw_path: Path) -> Optional[Dict[str, Any]]:
+        """Metadata for a payload, or None when it is missing or no longer describes the file on disk."""
+        try:
+            with open(RawStore.meta_path(raw_path), "r") as f:
+                meta = json.load(f)
+            size = raw_path.stat().st_size
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return meta if meta.get("stored_bytes") == size else None
+
+    @staticmethod
+    def fingerprint(raw_path: Path) -> Optional[Dict[str, Any]]:
+        """Content hash when the metadata is valid, else size + mtime (legacy files)."""
+        meta = RawStore.read_meta(raw_path)
+        if meta is not None:
+            return {"size": meta["bytes"], "sha256": meta["sha256"]}
+        try:
+            stat = raw_path.stat()
+        except FileNotFoundError:
+            return None
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def save(
+        ticker: str,
+        body: bytes,
+        cik: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Compresses a response body as received and records its metadata; returns the metadata."""
+        path = RawStore.path(ticker)
+        buffer = io.BytesIO()
+        # mtime=0 keeps the output byte-identical for identical payloads
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=COMPRESSLEVEL, mtime=0) as gz:
+            gz.write(body)
+        compressed = buffer.getvalue()
+        _atomic_write(path, lambda f: f.write(compressed))
+
+        meta = {
+            "ticker": ticker,
+            "cik": cik,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "bytes": len(body),
+            "stored_bytes": len(compressed),
+        }
+        RawStore._write_meta(path, meta)
+        RawStore.legacy_path(ticker).unlink(missing_ok=True)
+        return meta
+
+    @staticmethod
+    def update(
+        ticker: str,
+        body: bytes,
+        cik: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Saves a freshly fetched body unless it matches the cached content hash; returns whether it changed."""
+        meta = RawStore.read_meta(RawStore.path(ticker))
+        if meta is not None and meta["sha256"] == hashlib.sha256(body).hexdigest():
+            RawStore.mark_fetched(ticker, etag, last_modified)
+            return False
+        RawStore.save(ticker, body, cik, etag, last_modified)
+        return True
+
+    @staticmethod
+    def mark_fetched(ticker: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Refreshes the fetch time and validators of an unchanged payload without rewriting it."""
+        path = RawStore.path(ticker)
+        meta = RawStore.read_meta(path)
+        if meta is None:
+            return None
+        meta["fetched_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        meta["etag"] = etag or meta.get("etag")
+        meta["last_modified"] = last_modified or meta.get("last_modified")
+        RawStore._write_meta(path, meta)
+        return meta
+
+    @staticmethod
+    def _write_meta(raw_path: Path, meta: Dict[str, Any]) -> None:
+        encoded = json.dumps(meta).encode()
+        _atomic_write(RawStore.meta_path(raw_path), lambda f: f.write(encoded))
+
+    @staticmethod
+    def tickers() -> List[str]:
+        """Every ticker with a cached payload, compressed or legacy."""
+        names = {p.name.removesuffix(RAW_SUFFIX) for p in DATA_RAW_DIR.glob(f"*{RAW_SUFFIX}")}
+        names.update(p.name.removesuffix(LEGACY_SUFFIX) for p in DATA_RAW_DIR.glob(f"*{LEGACY_SUFFIX}"))
+        return sorted(names)
+
+    @staticmethod
+    def index() -> List[Dict[str, Any]]:
+        """Metadata of every compressed payload in the cache."""
+        entries = []
+        for meta_path in sorted(DATA_RAW_DIR.glob(f"*{META_SUFFIX}")):
+            ticker = meta_path.name.removesuffix(META_SUFFIX)
+            meta = RawStore.read_meta(RawStore.path(ticker))
+            if meta is not None:
+                entries.append(meta)
+        return entries
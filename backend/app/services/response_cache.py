@@ -0,0 +1,163 @@
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from fastapi import Response
+from pydantic import BaseModel
+from app.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from app.services import metrics
+from app.services.serialization import dump_json
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Any, ...]
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    expires: float
+
+    def to_response(self, if_none_match: Optional[str] = None) -> Response:
+        """JSON response, or 304 when the client already holds this ETag."""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if if_none_match and (if_none_match.strip() == "*" or self.etag in (t.strip() for t in if_none_match.split(","))):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Serialized route results in a bounded LRU with TTL.
+
+    Keys are ``(route, ticker, *params)``; each entry also records the raw payload
+    version it was computed from, so a newer payload is a miss even before the
+    ticker is invalidated. Concurrent misses for one key share a single computation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[CacheKey, Optional[str]], CachedResponse]" = OrderedDict()
+        self._inflight: Dict[Tuple[CacheKey, Optional[str]], asyncio.Future] = {}
+        # Invalidation arrives from ingestion threads as well as the event loop
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, slot: Tuple[CacheKey, Optional[str]]) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is None:
+                return None
+            if entry.expires <= self.clock():
+                del self._entries[slot]
+                return None
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            return entry
+
+    def _store(self, slot: Tuple[CacheKey, Optional[str]], value: Any) -> CachedResponse:
+        body = dump_json(value) if isinstance(value, BaseModel) else value
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        entry = CachedResponse(body, etag, self.clock() + self.ttl)
+        with self._lock:
+            self._entries[slot] = entry
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    async def get_or_compute(
+        self, key: CacheKey, version: Optional[str], compute: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        """Returns the cached entry for ``key`` at ``version``, awaiting ``compute()`` on a miss.
+
+        ``compute`` resolves to a pydantic model (or JSON bytes); exceptions propagate
+        to every waiter and are never cached. It runs in its own task, so it finishes
+        for the remaining waiters even if the request that started it is cancelled.
+        """
+        slot = (key, version)
+        entry = self._lookup(slot)
+        if entry is not None:
+            metrics.inc("drift_cache_requests_total", cache="response", result="hit")
+            return entry
+
+        task = self._inflight.get(slot)
+        if task is not None:
+            with self._lock:
+                self.coalesced += 1
+            metrics.inc("drift_cache_requests_total", cache="response", result="coalesced")
+            return await asyncio.shield(task)
+
+        with self._lock:
+            self.misses += 1
+        metrics.inc("drift_cache_requests_total", cache="response", result="miss")
+        # Detached from the leader, so a client disconnect does not cancel the result its waiters share
+        task = asyncio.ensure_future(self._compute(slot, compute))
+        self._inflight[slot] = task
+        task.add_done_callback(lambda done: self._settle(slot, done))
+        return await asyncio.shield(task)
+
+    async def _compute(self, slot: Tuple[CacheKey, Optional[str]], compute: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        return self._store(slot, await compute())
+
+    def _settle(self, slot: Tuple[CacheKey, Optional[str]], task: asyncio.Future) -> None:
+        if self._inflight.get(slot) is task:
+            del self._inflight[slot]
+        # Retrieved here so a failure whose waiters all went away does not log "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, ticker: Optional[str] = None) -> int:
+        """Drops every entry for a ticker, or everything when ticker is None."""
+        with self._lock:
+            if ticker is None:
+                dropped = list(self._entries)
+            else:
+                dropped = [slot for slot in self._entries if slot[0][1] == ticker]
+            for slot in dropped:
+                del self._entries[slot]
+            self.invalidations += len(dropped)
+        if dropped:
+            logger.info(f"Response cache invalidated {len(dropped)} entries for {ticker or 'all tickers'}")
+        return len(dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache shared by the routers; invalidated whenever ingestion persists a payload."""
+    global _default_cache
+    if _default_cache is None:
+        # Imported here: ingestion pulls in pandas, which the app defers until a data route runs
+        from app.services.ingestion_service import RAW_PERSISTED_LISTENERS
+
+        _default_cache = ResponseCache()
+        RAW_PERSISTED_LISTENERS.append(_default_cache.invalidate)
+    return _default_cache
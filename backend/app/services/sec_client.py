@@ -0,0 +1,185 @@
+import json
+import time
+import random
+import asyncio
+import logging
+import httpx
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, NamedTuple, Tuple
+from app.config import SEC_BASE_URL, SEC_REQUEST_RATE_LIMIT, SEC_USER_AGENT
+from app.services import metrics
+from app.services.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+# SEC limits requests to 10 per second per host, across every caller in the process
+SEC_RATE_LIMITER = TokenBucket(rate=1.0 / SEC_REQUEST_RATE_LIMIT)
+
+
+def companyfacts_url(cik: int, base_url: str = SEC_BASE_URL) -> str:
+    return f"{base_url.rstrip('/')}/api/xbrl/companyfacts/CIK{str(cik).zfill(10)}.json"
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Parses a Retry-After header given either as delta-seconds or an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+def conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+    """Request headers that let the server answer 304 when the payload is unchanged."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class CompanyFacts(NamedTuple):
+    """A companyfacts response as received; ``body`` is None when the server answered 304 Not Modified."""
+    body: Optional[bytes]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
+
+
+class SECClient:
+    """Async companyfacts client with keep-alive pooling, shared rate limiting and request coalescing."""
+
+    def __init__(
+        self,
+        base_url: str = SEC_BASE_URL,
+        user_agent: str = SEC_USER_AGENT,
+        rate_limiter: TokenBucket = SEC_RATE_LIMITER,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url
+        self.user_agent = user_agent
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[Tuple[int, Optional[str], Optional[str]], asyncio.Task] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Connection pools and in-flight tasks are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            stale, stale_loop = self._client, self._loop
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=self.timeout,
+            )
+            self._loop = loop
+            self._inflight = {}
+            if stale is not None:
+                await self._close_stale(stale, stale_loop)
+        return self._client
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Releases the connection pool of a client created on a previous event loop."""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it there, where its sockets live
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except (RuntimeError, OSError) as e:
+            # A loop that is already closed cannot run the transports' close; their sockets go with the client
+            logger.debug(f"Closing SEC client from a previous event loop failed: {e}")
+
+    async def fetch_companyfacts(self, cik: int) -> Optional[Dict[str, Any]]:
+        """Downloads and decodes a companyfacts payload."""
+        result = await self.fetch_companyfacts_raw(cik)
+        # Payloads run to several MB, so decode off the event loop
+        return None if result is None else await asyncio.to_thread(json.loads, result.body)
+
+    async def fetch_companyfacts_raw(
+        self, cik: int, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> Optional[CompanyFacts]:
+        """Downloads a companyfacts body; with validators from an earlier fetch the request is conditional.
+
+        Concurrent calls for the same CIK and validators share one request.
+        """
+        await self._get_client()
+        key = (cik, etag, last_modified)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(cik, etag, last_modified))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not abort the shared download
+        return await asyncio.shield(task)
+
+    async def _download(self, cik: int, etag: Optional[str], last_modified: Optional[str]) -> Optional[CompanyFacts]:
+        client = await self._get_client()
+        url = companyfacts_url(cik, self.base_url)
+        headers = conditional_headers(etag, last_modified)
+        backoff = self.backoff
+
+        for attempt in range(self.max_retries):
+            await self.rate_limiter.acquire_async()
+            if attempt:
+                metrics.inc("drift_sec_retries_total")
+            try:
+                logger.info(f"Fetching raw data from SEC for CIK {cik} (Attempt {attempt+1})")
+                response = await client.get(url, headers=headers)
+            except httpx.HTTPError as e:
+                metrics.inc("drift_sec_requests_total", status="error")
+                logger.error(f"Ingestion failed for CIK {cik}: {e}")
+                delay = backoff
+            else:
+                metrics.inc("drift_sec_requests_total", status=response.status_code)
+                if response.status_code == 304:
+                    return CompanyFacts(None, response.headers.get("ETag", etag), response.headers.get("Last-Modified", last_modified))
+                if response.status_code == 200:
+                    return CompanyFacts(response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                if response.status_code not in RETRYABLE_STATUS:
+                    logger.error(f"Ingestion failed for CIK {cik}: HTTP {response.status_code}")
+                    return None
+                delay = retry_after_seconds(response.headers.get("Retry-After"), backoff)
+                logger.warning(f"SEC responded {response.status_code} for CIK {cik}. Backing off for {delay:.2f}s")
+
+            if attempt < self.max_retries - 1:
+                # Jitter keeps coalesced retries from different CIKs from re-synchronizing
+                await asyncio.sleep(delay + random.uniform(0, 0.1 * delay))
+                backoff *= 2
+        return None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_default_client: Optional[SECClient] = None
+
+def get_sec_client() -> SECClient:
+    """Process-wide client so every route shares one connection pool and rate limiter."""
+    global _default_client
+    if _default_client is None:
+        _default_client = SECClient()
+    return _default_client
@@ -0,0 +1,63 @@
+import base64
+import orjson
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from fastapi import Response
+from pydantic import BaseModel
+
+# "json" sends float arrays as JSON lists; "compact" packs them as base64 little-endian floats
+ENCODINGS = ("json", "compact")
+# float32 unless a field declares json_schema_extra={"compact_dtype": "float64"}
+COMPACT_DTYPES = {"float32": "<f4", "float64": "<f8"}
+FLOAT_ARRAY_ANNOTATIONS = (List[float], Optional[List[float]], List[Optional[float]], Optional[List[Optional[float]]])
+
+
+def _default(value: Any) -> Any:
+    # Models built with model_construct are serialized from their fields without re-validation
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    # Non-contiguous or non-native numpy arrays, pandas arrays and numpy scalars
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(value: Any) -> bytes:
+    """orjson serialization; numpy arrays are written directly instead of via .tolist()."""
+    return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@lru_cache(maxsize=None)
+def float_array_fields(model: type) -> Dict[str, str]:
+    """Fields of a response model declared as float lists, i.e. the ones compact encoding packs, with their dtype."""
+    return {
+        name: (field.json_schema_extra or {}).get("compact_dtype", "float32")
+        for name, field in model.model_fields.items() if field.annotation in FLOAT_ARRAY_ANNOTATIONS
+    }
+
+
+def pack_array(values: Any, dtype: str = "float32") -> Dict[str, Any]:
+    """{"dtype", "shape", "data"} with the values as base64 little-endian ``dtype``; None becomes NaN."""
+    import numpy as np
+
+    array = np.asarray([np.nan if v is None else v for v in values] if isinstance(values, list) else values, dtype=COMPACT_DTYPES[dtype])
+    return {"dtype": dtype, "shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def pack_arrays(model: BaseModel) -> Dict[str, Any]:
+    packed = float_array_fields(type(model))
+    return {
+        name: pack_array(value, packed[name]) if name in packed and value is not None else value
+        for name, value in model.__dict__.items()
+    }
+
+
+def render(value: Any, encoding: str = "json") -> bytes:
+    """Response body for a model in the requested array encoding."""
+    if encoding == "compact" and isinstance(value, BaseModel):
+        value = pack_arrays(value)
+    return dump_json(value)
+
+
+def json_response(value: Any, encoding: str = "json", status_code: int = 200) -> Response:
+    return Response(content=render(value, encoding), status_code=status_code, media_type="application/json")
@@ -0,0 +1,198 @@
+import os
+import re
+import copy
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import DATA_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_MEMORY_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+def _model_slug(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", model)
+
+
+class SignalCache:
+    """Two-tier (in-memory LRU + on-disk) cache for LLM-extracted narrative signals.
+
+    Entries are content-addressed by a hash of everything that determines the
+    completion, and grouped on disk per model so a model upgrade can be
+    invalidated by dropping one directory.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+    ):
+        self.root = Path(root) if root is not None else DATA_CACHE_DIR / "llm_signals"
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        # Keyed like the disk tier, by model as well as content hash
+        self._memory: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt: str, config: Dict[str, Any]) -> str:
+        payload = json.dumps({"text": text, "model": model, "prompt": prompt, "config": config}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, model: str) -> Path:
+        return self.root / _model_slug(model) / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, model: str, value: Dict[str, Any]) -> None:
+        self._memory[(model, key)] = value
+        self._memory.move_to_end((model, key))
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _forget(self, matches: Callable[[str, str], bool]) -> None:
+        """Drops memory entries whose (model, key) matches; callers hold ``_lock``."""
+        for slot in [slot for slot in self._memory if matches(*slot)]:
+            del self._memory[slot]
+
+    def get(self, key: str, model: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if (model, key) in self._memory:
+                self._memory.move_to_end((model, key))
+                self.hits += 1
+                return copy.deepcopy(self._memory[(model, key)])
+
+        path = self._path(key, model)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            # Touch so disk eviction is least-recently-used, not least-recently-written
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, model, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, model: str, value: Dict[str, Any]) -> None:
+        path = self._path(key, model)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = json.dumps(value)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(body)
+        try:
+            # Overwriting an entry only grows the tier by the difference
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            # A copy, so the caller mutating its dict afterwards cannot change the cached entry
+            self._remember(key, model, copy.deepcopy(value))
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(body) - replaced
+        self._enforce_size()
+
+    def _scan(self):
+        entries = []
+        for path in self.root.glob("*/*/*.json"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                # Evicted or invalidated by another thread since the glob
+                pass
+        return entries
+
+    def _enforce_size(self) -> None:
+        """Evicts least-recently-used disk entries once the cache exceeds max_bytes.
+
+        Disk scans run outside ``_lock`` so lookups never wait on directory I/O;
+        ``_evict_lock`` keeps concurrent puts from evicting the same files twice.
+        """
+        with self._lock:
+            disk_bytes = self._disk_bytes
+        if disk_bytes is not None and disk_bytes <= self.max_bytes:
+            return
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            entries = sorted(self._scan(), key=lambda e: e[1].st_mtime_ns)
+            total = sum(st.st_size for _, st in entries)
+            if disk_bytes is None:
+                with self._lock:
+                    self._disk_bytes = total
+            if total <= self.max_bytes:
+                return
+
+            # Evict down to 90% so we do not rescan on every subsequent put
+            target = int(self.max_bytes * 0.9)
+            evicted, freed = set(), 0
+            for path, st in entries:
+                if total - freed <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                evicted.add((path.parent.parent.name, path.stem))
+                freed += st.st_size
+
+            with self._lock:
+                self._forget(lambda model, key: (_model_slug(model), key) in evicted)
+                self.evictions += len(evicted)
+                # Relative, so puts that landed during the scan stay counted
+                if self._disk_bytes is not None:
+                    self._disk_bytes -= freed
+        finally:
+            self._evict_lock.release()
+
+    def invalidate(self, model: Optional[str] = None) -> None:
+        """Drops every entry for a model, or the whole cache when model is None."""
+        target = self.root / _model_slug(model) if model else self.root
+        shutil.rmtree(target, ignore_errors=True)
+        with self._lock:
+            if model:
+                # Models sharing a directory slug share its disk entries too
+                self._forget(lambda cached_model, _: _model_slug(cached_model) == _model_slug(model))
+            else:
+                self._memory.clear()
+            self._disk_bytes = None
+        logger.info(f"LLM signal cache invalidated for {model or 'all models'}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+
+_default_cache: Optional[SignalCache] = None
+
+def get_signal_cache() -> SignalCache:
+    """Process-wide cache shared by every NarrativeService instance."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SignalCache()
+    return _default_cache
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import importlib
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Imported lazily by the routers; loading them off the request path spares the first caller
+SERVICE_MODULES = [
+    "app.services.ingestion_service",
+    "app.services.pipeline_service",
+    "app.services.financial_service",
+    "app.services.drift_service",
+    "app.services.narrative_service",
+]
+
+def import_services() -> None:
+    for name in SERVICE_MODULES:
+        importlib.import_module(name)
+
+async def prewarm(tickers: List[str]) -> None:
+    """Background startup work: service imports, the narrative client, then hot tickers' processed data.
+
+    Failures are logged and skipped; a ticker that fails here is simply built on its first request.
+    """
+    await asyncio.to_thread(import_services)
+    from app.services.executors import run_cpu
+    from app.services.ingestion_service import IngestionService
+    from app.services.narrative_service import get_narrative_service
+    from app.services.pipeline_service import PipelineService
+
+    await asyncio.to_thread(get_narrative_service)
+    for ticker in tickers:
+        try:
+            if not await IngestionService.ensure_raw_async(ticker):
+                logger.warning(f"Prewarm skipped {ticker}: raw data unavailable")
+                continue
+            result = await run_cpu(PipelineService.refresh_processed, ticker)
+            logger.info(f"Prewarmed {ticker} | {result['status']}")
+        except Exception as e:
+            logger.warning(f"Prewarm failed for {ticker}: {e}")
@@ -0,0 +1,41 @@
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.services import executors, processed_store, raw_store
+from app.services.raw_store import RawStore
+from app.tests.factories import make_companyfacts
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Redirects raw/processed storage to a temporary directory."""
+    raw_dir, processed_dir = tmp_path / "raw", tmp_path / "processed"
+    raw_dir.mkdir()
+    processed_dir.mkdir()
+    monkeypatch.setattr(raw_store, "DATA_RAW_DIR", raw_dir)
+    monkeypatch.setattr(processed_store, "DATA_PROCESSED_DIR", processed_dir)
+    return {"raw": raw_dir, "processed": processed_dir}
+
+
+@pytest.fixture
+def cached_raw(data_dirs):
+    """Writes a synthetic raw payload for AAPL into the raw cache."""
+    def _write(ticker: str = "AAPL", **kwargs) -> dict:
+        payload = make_companyfacts(**kwargs)
+        RawStore.save(ticker, json.dumps(payload).encode(), payload["cik"])
+        return payload
+    return _write
+
+
+@pytest.fixture(autouse=True)
+def thread_pools(monkeypatch):
+    """Runs route work on threads: spawned worker processes would not see monkeypatched paths."""
+    pools = {
+        "_cpu_pool": executors.BoundedPool("cpu", lambda: ThreadPoolExecutor(max_workers=4), 64, 30.0),
+        "_io_pool": executors.BoundedPool("io", lambda: ThreadPoolExecutor(max_workers=4), 64, 30.0),
+    }
+    for name, pool in pools.items():
+        monkeypatch.setattr(executors, name, pool)
+    yield pools
+    for pool in pools.values():
+        pool.shutdown()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from app.core.backtest import drift_surfaces, feature_tensor, forward_deterioration, sweep_weights, weight_grid
+from app.core.drift_engine import CATEGORIES, calculate_drift, classify_drift, compute_momentum_vector
+from app import weight_sweep
+from app.services.drift_service import drift_columns, get_drift_profile
+from app.services.pipeline_service import PipelineService
+
+FEATURES = ["revenue_growth", "ocf_growth", "accrual_ratio"]
+
+
+def test_drift_surfaces_match_per_weight_vector_path():
+    rng = np.random.default_rng(1)
+    frames = {f"T{i}": pd.DataFrame(rng.normal(size=(6 + i, 3)), columns=FEATURES) for i in range(3)}
+    tensor = feature_tensor(frames, FEATURES, periods=8)
+    weights = weight_grid(3, 4)
+    assert len(weights) == 15 and np.allclose(weights.sum(axis=1), 1)
+
+    surfaces = drift_surfaces(tensor, weights, narrative_momentum=0.1)
+    for k, w in enumerate(weights):
+        for i, df in enumerate(frames.values()):
+            expected = calculate_drift(compute_momentum_vector(df, dict(zip(FEATURES, w))).to_numpy(), 0.1)
+            np.testing.assert_allclose(surfaces[k, i, 8 - len(df):], expected[-8:])
+    # Shorter histories are padded at the start
+    assert np.isnan(surfaces[:, 0, :2]).all()
+
+
+def test_forward_deterioration():
+    outcomes = np.array([[[0.1], [0.2], [-0.5], [0.1], [0.3]]])
+    result = forward_deterioration(outcomes, horizon=2)
+    # Period 0 looks at periods 1-2 (mean -0.15), period 1 at 2-3, period 2 at 3-4
+    assert result["deteriorated"].tolist() == [[True, True, False, False, False]]
+    assert result["valid"].tolist() == [[True, True, True, False, False]]
+
+
+def test_sweep_hit_rates_match_classification_and_chunking():
+    rng = np.random.default_rng(2)
+    tensor = rng.normal(scale=0.4, size=(30, 12, 3))
+    tensor[0, :3] = np.nan
+    outcomes = rng.normal(size=(30, 12, 2))
+    weights = weight_grid(3, 6)
+
+    result = sweep_weights(tensor, weights, outcomes, narrative_momentum=0.2, horizon=3)
+    chunked = sweep_weights(tensor, weights, outcomes, narrative_momentum=0.2, horizon=3, chunk_bytes=1)
+    for key in ("critical_flags", "critical_hits", "moderate_flags", "moderate_hits"):
+        np.testing.assert_array_equal(result[key], chunked[key])
+
+    outcome = forward_deterioration(outcomes, horizon=3)
+    valid = outcome["valid"] & ~np.isnan(tensor).any(axis=-1)
+    codes = classify_drift(drift_surfaces(tensor, weights, 0.2))
+    for category in ("critical", "moderate"):
+        flagged = (codes == CATEGORIES.index(category)) & valid
+        np.testing.assert_array_equal(result[f"{category}_flags"], flagged.sum(axis=(1, 2)))
+        np.testing.assert_array_equal(result[f"{category}_hits"], (flagged & outcome["deteriorated"]).sum(axis=(1, 2)))
+    assert result["evaluated"] == valid.sum()
+
+
+def test_run_sweep_backtests_the_served_drift_surface(cached_raw, monkeypatch):
+    cached_raw("AAPL", periods=12)
+    cached_raw("MSFT", periods=12)
+    calls = []
+    monkeypatch.setattr(weight_sweep, "sweep_weights", lambda *args, **kwargs: calls.append(kwargs) or sweep_weights(*args, **kwargs))
+
+    summary = weight_sweep.run_sweep(["AAPL", "MSFT"], steps=4, periods=12, horizon=2)
+    profile = get_drift_profile()
+    served = drift_columns(PipelineService.load_frame("AAPL", "features"), profile)["narrative_momentum"]
+    assert calls[0]["narrative_momentum"] == summary["narrative_momentum"] == served[0] != 0
+    assert summary["tickers"] == 2
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from app.core.feature_engineering import engineering_financial_features, engineering_panel_features
+from app.core.normalization import normalize_financial_data, PILLAR_MAPPING
+from app.services.ingestion_service import IngestionService
+from app.tests.factories import make_companyfacts
+
+
+def _normalized(ticker: str, periods: int, scale: float) -> pd.DataFrame:
+    facts = IngestionService.extract_facts_to_df(ticker, make_companyfacts(periods=periods), tags=PILLAR_MAPPING)
+    facts["value"] *= scale
+    return normalize_financial_data(facts)
+
+
+def test_panel_matches_per_ticker_features():
+    frames = {"AAPL": _normalized("AAPL", 9, 1.0), "MSFT": _normalized("MSFT", 6, 3.0), "GOOG": _normalized("GOOG", 12, 0.5)}
+    panel = pd.concat(frames.values(), ignore_index=True).sample(frac=1, random_state=0)
+
+    result = engineering_panel_features(panel)
+
+    assert result["ticker"].tolist() == sorted(result["ticker"])
+    for ticker, frame in frames.items():
+        expected = engineering_financial_features(frame).reset_index(drop=True)
+        got = result[result["ticker"] == ticker].reset_index(drop=True)[expected.columns]
+        pd.testing.assert_frame_equal(got, expected, check_flags=False)
+
+
+def test_panel_matches_per_ticker_features_with_a_missing_pillar():
+    aapl, msft = _normalized("AAPL", 8, 1.0), _normalized("MSFT", 8, 3.0)
+    # A period that did not report revenue: growth on both sides of it is unknown, not measured against an older period
+    aapl.loc[4, "revenue"] = np.nan
+    result = engineering_panel_features(pd.concat([msft, aapl], ignore_index=True))
+
+    for ticker, frame in {"AAPL": aapl, "MSFT": msft}.items():
+        expected = engineering_financial_features(frame).reset_index(drop=True)
+        got = result[result["ticker"] == ticker].reset_index(drop=True)[expected.columns]
+        pd.testing.assert_frame_equal(got, expected, check_flags=False)
+    assert result.loc[result["ticker"] == "AAPL", "revenue_growth"].iloc[5] == 0
+
+
+def test_growth_does_not_bleed_across_tickers_and_amendments_dedupe():
+    aapl, msft = _normalized("AAPL", 4, 1.0), _normalized("MSFT", 4, 3.0)
+    amended = aapl.iloc[[1]].assign(filed="2018-08-15", revenue=2_000.0)
+    result = engineering_panel_features(pd.concat([msft, aapl, amended], ignore_index=True))
+
+    first_rows = result.groupby("ticker").head(1)
+    assert (first_rows["revenue_growth"] == 0).all()
+    aapl_rows = result[result["ticker"] == "AAPL"]
+    assert aapl_rows["fp"].tolist() == ["Q1", "Q2", "Q3", "FY"]
+    assert aapl_rows["revenue"].iloc[1] == 2_000.0
+    assert aapl_rows["revenue_growth"].iloc[1] == 1.0
+
+
+def test_float32_option():
+    result = engineering_panel_features(_normalized("AAPL", 8, 1.0), float32=True)
+    assert result["revenue_growth"].dtype == np.float32
+    assert result["fy"].dtype == np.int64
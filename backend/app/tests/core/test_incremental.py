@@ -0,0 +1,90 @@
+import pandas as pd
+from app.core.incremental import build_incremental_state, incremental_update
+from app.core.normalization import PILLAR_MAPPING
+from app.services.ingestion_service import IngestionService
+from app.services.pipeline_service import PipelineService
+from app.tests.factories import make_companyfacts
+
+
+def _facts(payload):
+    return IngestionService.extract_facts_to_df("AAPL", payload, tags=PILLAR_MAPPING)
+
+
+def _assert_same(frames, expected):
+    for name in ("facts", "normalized", "features"):
+        pd.testing.assert_frame_equal(frames[name], expected[name], check_flags=False)
+
+
+def test_incremental_append_matches_full_recompute():
+    base = PipelineService.build_frames("AAPL", _facts(make_companyfacts(periods=9)))
+    new_facts = _facts(make_companyfacts(periods=14))
+
+    frames, state = incremental_update(base, build_incremental_state(base), new_facts)
+    _assert_same(frames, PipelineService.build_frames("AAPL", new_facts))
+    assert state["last_filed"] == new_facts["filed"].max()
+    assert state["facts_rows"] == len(new_facts)
+
+
+def test_new_periods_missing_an_optional_pillar():
+    payload = make_companyfacts(periods=10)
+    assets = payload["facts"]["us-gaap"]["Assets"]["units"]["USD"]
+    payload["facts"]["us-gaap"]["Assets"]["units"]["USD"] = assets[:6]
+    base = PipelineService.build_frames("AAPL", _facts(make_companyfacts(periods=6)))
+
+    frames, _ = incremental_update(base, build_incremental_state(base), _facts(payload))
+    _assert_same(frames, PipelineService.build_frames("AAPL", _facts(payload)))
+
+
+def test_missing_pillar_in_last_stored_period_matches_full_recompute():
+    def payload(periods):
+        data = make_companyfacts(periods=periods)
+        net_income = data["facts"]["us-gaap"]["NetIncomeLoss"]["units"]["USD"]
+        # The last period of the stored history did not report net income
+        del net_income[5]
+        return data
+
+    base = PipelineService.build_frames("AAPL", _facts(payload(6)))
+    assert base["normalized"]["net_income"].isna().iloc[-1]
+    new_facts = _facts(payload(10))
+
+    frames, _ = incremental_update(base, build_incremental_state(base), new_facts)
+    _assert_same(frames, PipelineService.build_frames("AAPL", new_facts))
+
+
+def test_revised_history_or_new_pillar_falls_back():
+    base_payload = make_companyfacts(periods=6)
+    del base_payload["facts"]["us-gaap"]["Assets"]
+    base = PipelineService.build_frames("AAPL", _facts(base_payload))
+    state = build_incremental_state(base)
+    assert state["filled_pillars"] == ["total_assets"]
+
+    # A newly reported pillar would change zero-filled history
+    assert incremental_update(base, state, _facts(make_companyfacts(periods=8))) is None
+
+    # Fewer historical facts than recorded means the payload was revised
+    revised = _facts(make_companyfacts(periods=6)).iloc[5:]
+    assert incremental_update(base, state, revised) is None
+
+
+def test_restated_value_at_same_row_count_falls_back():
+    base = PipelineService.build_frames("AAPL", _facts(make_companyfacts(periods=6)))
+    state = build_incremental_state(base)
+    restated = _facts(make_companyfacts(periods=8))
+    old = (restated["metric"] == "Revenues") & (restated["filed"] <= state["last_filed"])
+    restated.loc[old[old].index[0], "value"] += 1e6
+
+    assert int((restated["filed"] <= state["last_filed"]).sum()) == state["facts_rows"]
+    assert incremental_update(base, state, restated) is None
+    # Re-ordered but unchanged history still takes the incremental path
+    assert incremental_update(base, state, _facts(make_companyfacts(periods=8)).iloc[::-1]) is not None
+
+
+def test_pipeline_refresh_uses_incremental_path(cached_raw):
+    cached_raw("AAPL", periods=6)
+    PipelineService.refresh_processed("AAPL")
+    payload = cached_raw("AAPL", periods=9)
+    assert PipelineService.refresh_processed("AAPL", force=True)["periods"] == 9
+
+    stored = PipelineService.load_frame("AAPL", "features")
+    expected = PipelineService.build_frames("AAPL", _facts(payload))["features"]
+    pd.testing.assert_frame_equal(stored, expected, check_flags=False)
@@ -0,0 +1,33 @@
+import time
+from app.core.lexicon import score_transcript, is_ambiguous
+
+
+def test_scores_tone_risk_and_forward_looking_density():
+    scores = score_transcript(
+        "Demand was strong and margins improved. We expect growth next quarter. "
+        "Supply shortages remain a risk. Thank you."
+    )
+    assert scores["positive"] == 2
+    assert scores["negative"] == 1
+    assert scores["optimism"] == 1 / 3
+    assert scores["risk"] == 2
+    assert scores["forward_looking_density"] == 0.25
+
+
+def test_negated_positive_counts_as_negative():
+    scores = score_transcript("Results were not strong this quarter.")
+    assert (scores["positive"], scores["negative"], scores["optimism"]) == (0, 1, -1.0)
+
+
+def test_ambiguity_and_empty_text():
+    assert is_ambiguous(score_transcript(""))
+    assert is_ambiguous(score_transcript("strong strong weak weak strong weak"), band=0.2, min_hits=5)
+    assert not is_ambiguous(score_transcript("strong " * 10), band=0.2, min_hits=5)
+    assert score_transcript("")["forward_looking_density"] == 0.0
+
+
+def test_full_transcript_scores_in_milliseconds():
+    text = "Revenue was strong, we expect robust demand next year, although risks remain. " * 1000
+    started = time.perf_counter()
+    score_transcript(text)
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.normalization import pivot_pillars, _pivot_pillars_table, normalize_financial_data
+
+# One tag per pillar, so pivot_table's row-order "last" and tag precedence agree
+SINGLE_TAGS = ["Revenues", "NetIncomeLoss", "NetCashProvidedByUsedInOperatingActivities",
+               "PaymentsToAcquirePropertyPlantAndEquipment", "Assets", "UnmappedTag"]
+
+
+def _random_facts(rng: np.random.Generator, rows: int, tags=SINGLE_TAGS) -> pd.DataFrame:
+    fy = rng.integers(2015, 2020, rows).astype(float)
+    fy[rng.random(rows) < 0.03] = np.nan
+    values = rng.normal(1000, 300, rows).round()
+    values[rng.random(rows) < 0.1] = np.nan
+    fp = rng.choice(["Q1", "Q2", "Q3", "FY", None], rows, p=[0.24, 0.24, 0.24, 0.24, 0.04])
+    return pd.DataFrame({
+        "ticker": rng.choice(["AAPL", "MSFT", "GOOG"], rows),
+        "metric": rng.choice(tags, rows),
+        "value": values,
+        "unit": "USD",
+        "decimals": None,
+        "filed": rng.choice(pd.date_range("2016-01-01", periods=40, freq="MS").strftime("%Y-%m-%d"), rows),
+        "fy": fy,
+        "fp": fp,
+    })
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_pivot_table_without_conflicting_tags(seed):
+    rng = np.random.default_rng(seed)
+    facts = _random_facts(rng, int(rng.integers(1, 3000)))
+    pd.testing.assert_frame_equal(pivot_pillars(facts), _pivot_pillars_table(facts))
+
+
+def test_alternate_tags_resolve_by_mapping_precedence():
+    base = {"ticker": "AAPL", "unit": "USD", "decimals": None, "filed": "2023-02-01", "fy": 2022, "fp": "FY"}
+    rows = [
+        dict(base, metric="Revenues", value=100.0),
+        dict(base, metric="RevenueFromContractWithCustomerExcludingCostReportedOnSameLineAsRevenue", value=90.0),
+        dict(base, metric="SalesRevenueNet", value=None),
+    ]
+    for order in ([0, 1, 2], [2, 1, 0], [1, 0, 2]):
+        facts = pd.DataFrame([rows[i] for i in order])
+        assert pivot_pillars(facts)["revenue"].tolist() == [100.0]
+    # A later-listed tag still fills in when the preferred one is null
+    facts = pd.DataFrame([dict(rows[0], value=None), rows[1]])
+    assert pivot_pillars(facts)["revenue"].tolist() == [90.0]
+
+
+def test_unmapped_or_empty_input():
+    assert pivot_pillars(pd.DataFrame()).empty
+    facts = _random_facts(np.random.default_rng(0), 50, tags=["UnmappedTag"])
+    assert pivot_pillars(facts).empty
+    assert normalize_financial_data(facts).empty
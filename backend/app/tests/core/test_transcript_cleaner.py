@@ -0,0 +1,79 @@
+import io
+import time
+import random
+import pytest
+from app.core import transcript_parser
+from app.core.transcript_parser import clean_transcript_text, iter_clean_transcript, _clean_transcript_text_regex
+
+GOLDEN = [
+    "",
+    "Operator: Good day, and welcome to the Q3 call.\nTim Cook: Thank you, revenue grew 8%.",
+    "  John Doe:  spaced label\n\n\nJane Q. Smith-Jones: hyphenated, dotted",
+    "Operator\nJohn Doe: label spanning a line break",
+    "A: single-letter labels survive\nAB: two letters do not",
+    "lowercase: not a label\nMr. Smith said: something, then more",
+    "Prepared remarks here.\nQuestion-and-Answer Session\nAnalyst: is the guide conservative?",
+    "Remarks.\nquestion-AND-answer session follows\nmore text",
+    "Question-and-Answer Session: header written as a label",
+    "Tabs\tand\xa0non-breaking spaces:\r\nCRLF line endings, too.\r\n",
+    "The quarter went well\nDemand was strong\nNo punctuation anywhere\nCFO: closing, remarks",
+    "Trailing label with no newline CEO:",
+    "\n\n   \n",
+]
+
+
+def _fuzz_corpus(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    alphabet = ["A", "Bo", "c", "d.", "-", " ", "\n", "\n\n", ":", "1", ",", "Jo Doe:", "\t", "\xa0",
+                "Question-and-Answer Session", "question-AND-answer session", "x\r\n", "Q:"]
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("text", GOLDEN)
+def test_matches_legacy_on_golden_corpus(text):
+    assert clean_transcript_text(text) == _clean_transcript_text_regex(text)
+
+
+def test_matches_legacy_on_fuzzed_corpus():
+    for text in _fuzz_corpus(5000):
+        assert clean_transcript_text(text) == _clean_transcript_text_regex(text), repr(text)
+
+
+def test_streams_from_files_and_arbitrary_chunks(monkeypatch):
+    # Tiny blocks exercise whitespace collapsing across block boundaries
+    monkeypatch.setattr(transcript_parser, "CLEAN_BLOCK_CHARS", 7)
+    rng = random.Random(1)
+    for text in GOLDEN + _fuzz_corpus(500, seed=2):
+        expected = _clean_transcript_text_regex(text)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(3, len(text) + 1)))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert clean_transcript_text(io.StringIO(text)) == expected
+        assert "".join(iter_clean_transcript(chunks)) == expected
+
+
+def test_stops_reading_at_qa_section(monkeypatch):
+    # Input is read in blocks; nothing past the block holding the Q&A header is consumed
+    monkeypatch.setattr(transcript_parser, "CLEAN_BLOCK_CHARS", 1)
+    consumed = []
+
+    def lines():
+        for line in ["Operator: welcome, all.\n", "Question-and-Answer Session, 4:30 PM\n", "Analyst: next?\n"]:
+            consumed.append(line)
+            yield line
+
+    assert clean_transcript_text(lines()) == "welcome, all."
+    assert len(consumed) == 2
+
+
+def test_unpunctuated_runs_stay_linear():
+    text = "The quarter went well and demand was strong\n" * 20000 + "CFO: thanks, all.\n"
+    # The whole run up to the colon reads as one speaker label, as it does for the legacy regex
+    assert clean_transcript_text(text) == "thanks, all."
+
+
+def test_long_single_line_without_label_stays_linear():
+    # One line whose first stopping character is not a colon, so the label pattern must fail
+    line = "  Revenue " + "grew strongly and " * 50000 + "margins held 1\n"
+    started = time.perf_counter()
+    assert clean_transcript_text(line + "CFO: thanks.") == _clean_transcript_text_regex(line + "CFO: thanks.")
+    assert time.perf_counter() - started < 2.0
@@ -0,0 +1,47 @@
+import random
+from app.core.transcript_parser import chunk_transcript, aggregate_chunk_signals
+
+
+def _transcript(sentences: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    words = "revenue growth strong demand risk margin guidance outlook customers cloud".split()
+    return " ".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 30))) + "." for _ in range(sentences)
+    )
+
+
+def test_chunks_respect_budget_and_sentence_boundaries():
+    text = _transcript(2000)
+    chunks = chunk_transcript(text, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 2000 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+    assert " ".join(chunks) == text
+    assert chunk_transcript("short text.", max_tokens=500) == ["short text."]
+    assert chunk_transcript("", max_tokens=500) == []
+
+
+def test_overlong_sentence_is_hard_split():
+    text = "word " * 1000
+    chunks = chunk_transcript(text.strip(), max_tokens=100)
+    assert all(len(c) <= 400 for c in chunks)
+    assert " ".join(chunks) == text.strip()
+
+
+def test_edit_only_reshapes_nearby_chunks():
+    text = _transcript(2000)
+    sentences = text.split(". ")
+    sentences[len(sentences) // 2] = "an entirely rewritten guidance sentence"
+    edited = ". ".join(sentences)
+
+    before = set(chunk_transcript(text, max_tokens=500))
+    after = chunk_transcript(edited, max_tokens=500)
+    changed = [c for c in after if c not in before]
+    assert 1 <= len(changed) <= 3
+
+
+def test_aggregate_weights_optimism_and_sums_risk():
+    signals = [{"optimism": 1.0, "risk": 2}, {"optimism": -0.5, "risk": 1}]
+    assert aggregate_chunk_signals(signals, [300, 100]) == {"optimism": 0.625, "risk": 3}
+    assert aggregate_chunk_signals([], []) == {"optimism": 0.0, "risk": 0}
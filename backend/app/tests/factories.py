@@ -0,0 +1,96 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_companyfacts(periods: int = 8, cik: int = 320193, extra_tags: int = 0) -> dict:
+    """Builds a synthetic SEC companyfacts payload with quarterly 10-Q/10-K entries."""
+    base = {
+        "Revenues": 1_000.0,
+        "NetIncomeLoss": 200.0,
+        "NetCashProvidedByUsedInOperatingActivities": 250.0,
+        "PaymentsToAcquirePropertyPlantAndEquipment": 40.0,
+        "Assets": 5_000.0,
+    }
+    us_gaap = {}
+    for tag, start in base.items():
+        entries = []
+        for i in range(periods):
+            fy, q = 2018 + i // 4, i % 4 + 1
+            entries.append({
+                "end": f"{fy}-{q * 3:02d}-28",
+                "val": start * (1 + 0.05 * i) + (i % 3) * 7,
+                "accn": f"0000320193-{fy}-{q:06d}",
+                "fy": fy,
+                "fp": "FY" if q == 4 else f"Q{q}",
+                "form": "10-K" if q == 4 else "10-Q",
+                "filed": f"{fy}-{q * 3:02d}-28" if q < 4 else f"{fy + 1}-01-30",
+            })
+        us_gaap[tag] = {"label": tag, "description": f"{tag} description", "units": {"USD": entries}}
+    for j in range(extra_tags):
+        us_gaap[f"UnmappedTag{j}"] = {
+            "label": "x",
+            "units": {"USD": [{"val": j, "fy": 2018, "fp": "Q1", "form": "10-Q", "filed": "2018-03-28"}]},
+        }
+    return {
+        "cik": cik,
+        "entityName": "Synthetic Corp",
+        "facts": {
+            "dei": {"EntityCommonStockSharesOutstanding": {"units": {"shares": [{"val": 1, "form": "10-Q"}]}}},
+            "us-gaap": us_gaap,
+        },
+    }
+
+
+class StubSEC:
+    """Local companyfacts server that can throttle and delay responses, and answer conditional requests."""
+
+    def __init__(self, throttle_first: int = 0, delay: float = 0.0, etag: str = None):
+        self.requests = []
+        self.not_modified = 0
+        self.throttle_first = throttle_first
+        self.delay = delay
+        self.etag = etag
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append((self.path, self.client_address[1]))
+                if len(stub.requests) <= stub.throttle_first:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                time.sleep(stub.delay)
+                if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etag)
+                    self.end_headers()
+                    return
+                body = json.dumps(make_companyfacts(periods=2)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if stub.etag:
+                    self.send_header("ETag", stub.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
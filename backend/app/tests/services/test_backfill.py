@@ -0,0 +1,50 @@
+import json
+import asyncio
+from app.backfill import run_backfill, read_progress
+from app.services.ingestion_service import load_company_tickers
+from app.services.processed_store import ProcessedStore
+from app.services.rate_limiter import TokenBucket
+from app.services.sec_client import SECClient
+from app.tests.factories import StubSEC
+
+
+def test_backfill_builds_store_and_resumes(data_dirs, tmp_path):
+    universe_path = tmp_path / "company_tickers.json"
+    universe_path.write_text(json.dumps({
+        "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+        "1": {"cik_str": 789019, "ticker": "MSFT", "title": "Microsoft Corp"},
+        "2": {"cik_str": 1045810, "ticker": "NVDA", "title": "NVIDIA Corp"},
+    }))
+    universe = load_company_tickers(universe_path)
+    progress_path = tmp_path / "progress.jsonl"
+
+    def run():
+        client = SECClient(base_url=stub.url, rate_limiter=TokenBucket(rate=1000), backoff=0.01)
+        return asyncio.run(run_backfill(universe, workers=0, progress_path=progress_path, client=client))
+
+    with StubSEC() as stub:
+        summary = run()
+        assert summary["counts"] == {"built": 3}
+        assert summary["tickers_per_s"] > 0
+        assert len(stub.requests) == 3
+        assert all(ProcessedStore.read_manifest(t) for t in universe)
+        assert set(read_progress(progress_path)) == set(universe)
+
+        # Completed tickers are skipped on the next run
+        assert run()["completed"] == 0
+        assert len(stub.requests) == 3
+
+
+def test_backfill_runs_on_spawned_workers(data_dirs, tmp_path, monkeypatch):
+    # Spawned workers re-import app.config, so they find the test data through DATA_DIR
+    monkeypatch.setenv("DATA_DIR", str(data_dirs["raw"].parent))
+    universe = {"AAPL": 320193, "MSFT": 789019}
+
+    async def run():
+        client = SECClient(base_url=stub.url, rate_limiter=TokenBucket(rate=1000), backoff=0.01)
+        return await run_backfill(universe, workers=1, progress_path=tmp_path / "progress.jsonl", client=client)
+
+    with StubSEC() as stub:
+        summary = asyncio.run(run())
+    assert summary["counts"] == {"built": 2}
+    assert all(ProcessedStore.read_manifest(t) for t in universe)
@@ -0,0 +1,165 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.core.drift_engine import (
+    CATEGORIES, EXPLANATIONS, classify_drift, explain_drift_scores, generate_deterministic_explanation,
+    make_profile, parse_profiles, rolling_drift_statistics,
+)
+from app.core.feature_engineering import FEATURE_COLUMNS
+from app.main import app
+from app.services import drift_service
+from app.services.drift_service import DriftService
+from app.services.ingestion_service import IngestionService
+
+
+def test_batch_matches_single_ticker_path(cached_raw):
+    cached_raw("AAPL", periods=8)
+    cached_raw("MSFT", periods=5)
+
+    batch = DriftService.get_batch_drift(["AAPL", "MSFT", "AAPL"])
+    assert batch.tickers == ["AAPL", "MSFT"]
+    for i, ticker in enumerate(batch.tickers):
+        single = DriftService.get_latest_drift(ticker)
+        assert np.isclose(batch.drift_score[i], single.drift_score)
+        assert np.isclose(batch.financial_momentum[i], single.financial_momentum)
+        assert batch.explanation[i] == single.explanation
+
+
+def test_vectorized_explanations_match_thresholds():
+    scores = np.array([0.9, 0.5, 0.3, 0.2, 0.0, -0.2, -0.21, -3.0, np.nan])
+    expected = ["critical", "moderate", "moderate", "stable", "stable", "stable", "conservative", "conservative", "stable"]
+    assert [CATEGORIES[c] for c in classify_drift(scores)] == expected
+    assert explain_drift_scores(scores).tolist() == [EXPLANATIONS[c] for c in expected]
+    assert generate_deterministic_explanation({"drift_score": 0.3}) == EXPLANATIONS["moderate"]
+    # Any shape: a (tickers, periods) panel classifies in one call
+    assert classify_drift(scores[:8].reshape(2, 4)).shape == (2, 4)
+
+
+def test_profiles_override_defaults_and_reject_bad_thresholds():
+    default = make_profile("default", {"financial": {"revenue_growth": 1.0}, "narrative": {"optimism": 1.0}})
+    profiles = parse_profiles({"strict": {"thresholds": {"critical": 0.3}, "weights": {"financial": {"ocf_growth": 0.5}}}}, default)
+    assert profiles["strict"].weights["financial"] == {"revenue_growth": 1.0, "ocf_growth": 0.5}
+    assert CATEGORIES[classify_drift(0.4, profiles["strict"].thresholds)] == "critical"
+    assert CATEGORIES[classify_drift(0.4, profiles["default"].thresholds)] == "moderate"
+    with pytest.raises(ValueError):
+        parse_profiles({"bad": {"thresholds": {"moderate": 0.9}}}, default)
+    with pytest.raises(ValueError, match="revenue_grwoth"):
+        parse_profiles({"typo": {"weights": {"financial": {"revenue_grwoth": 0.5}}}}, default, FEATURE_COLUMNS)
+
+
+def test_invalid_profile_configuration_fails_startup(tmp_path, monkeypatch):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"typo": {"weights": {"financial": {"ocf_grwoth": 0.5}}}}))
+    monkeypatch.setattr(drift_service, "DRIFT_PROFILES_PATH", str(path))
+    monkeypatch.setattr(drift_service, "_profiles", None)
+    with pytest.raises(ValueError, match="ocf_grwoth"):
+        with TestClient(app):
+            pass
+    # Loaded lazily (worker processes), the same error is a server error rather than an unknown profile
+    with pytest.raises(RuntimeError):
+        drift_service.get_drift_profile("typo")
+
+
+def test_drift_endpoint_applies_named_profile(cached_raw, tmp_path, monkeypatch):
+    cached_raw("AAPL")
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"alarmist": {"thresholds": {"conservative": -100, "moderate": -99, "critical": -98}}}))
+    monkeypatch.setattr(drift_service, "_profiles", None)
+    drift_service.load_drift_profiles(str(path))
+    client = TestClient(app)
+
+    alarmist = client.get("/v1/drift/AAPL", params={"profile": "alarmist"}).json()
+    assert alarmist["explanation"] == EXPLANATIONS["critical"]
+    assert client.get("/v1/drift/AAPL").json()["drift_score"] == alarmist["drift_score"]
+    assert client.get("/v1/drift/AAPL", params={"profile": "missing"}).status_code == 404
+
+
+def test_batch_endpoint_reports_unavailable_tickers(cached_raw):
+    cached_raw("AAPL")
+    response = TestClient(app).post("/v1/drift/batch", json={"tickers": ["AAPL", "UNKNOWN"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tickers"] == ["AAPL"]
+    assert len(data["drift_score"]) == 1
+    assert "UNKNOWN" in data["errors"]
+
+
+def test_batch_endpoint_reports_failed_downloads_per_ticker(cached_raw, monkeypatch):
+    cached_raw("AAPL")
+    ensure_raw_async = IngestionService.ensure_raw_async
+
+    async def flaky_ensure(ticker):
+        if ticker == "GARBLED":
+            raise json.JSONDecodeError("Expecting value", "<html>", 0)
+        if ticker == "DISKFULL":
+            raise OSError("No space left on device")
+        return await ensure_raw_async(ticker)
+
+    monkeypatch.setattr(IngestionService, "ensure_raw_async", staticmethod(flaky_ensure))
+    response = TestClient(app).post("/v1/drift/batch", json={"tickers": ["AAPL", "GARBLED", "DISKFULL"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tickers"] == ["AAPL"]
+    assert data["errors"] == {"GARBLED": "Data unavailable for GARBLED", "DISKFULL": "Data unavailable for DISKFULL"}
+
+
+def test_batch_reports_corrupt_frames_per_ticker(cached_raw, monkeypatch):
+    cached_raw("AAPL")
+    load_frame = drift_service.PipelineService.load_frame
+    failures = {"BROKEN": KeyError("revenue_growth"), "UNREADABLE": OSError("truncated arrow file")}
+
+    def flaky_load(ticker, *args, **kwargs):
+        if ticker in failures:
+            raise failures[ticker]
+        return load_frame(ticker, *args, **kwargs)
+
+    monkeypatch.setattr(drift_service.PipelineService, "load_frame", staticmethod(flaky_load))
+    batch = DriftService.get_batch_drift(["AAPL", "BROKEN", "UNREADABLE"])
+    assert batch.tickers == ["AAPL"]
+    assert batch.errors == {"BROKEN": "Data unavailable for BROKEN", "UNREADABLE": "Data unavailable for UNREADABLE"}
+
+
+def test_history_rolling_statistics_match_pandas(cached_raw):
+    cached_raw("AAPL", periods=12)
+    history = DriftService.get_drift_history("AAPL", window=4)
+
+    assert history.periods[:5] == ["2018-Q1", "2018-Q2", "2018-Q3", "2018-FY", "2019-Q1"]
+    assert DriftService.get_latest_drift("AAPL").quarter == history.periods[-1]
+
+    drift = pd.Series(history.drift_score)
+    # Each period is scored against the four periods before it
+    expected_mean = drift.rolling(4).mean().shift(1)
+    expected_std = drift.rolling(4).std().shift(1)
+    assert history.rolling_mean[:4] == [None, None, None, None]
+    np.testing.assert_allclose(history.rolling_mean[4:], expected_mean[4:])
+    np.testing.assert_allclose(history.rolling_std[4:], expected_std[4:])
+
+
+def test_rolling_statistics_on_a_panel():
+    rng = np.random.default_rng(0)
+    panel = rng.normal(size=(5, 40))
+    panel[2, 30] = 25.0
+    stats = rolling_drift_statistics(panel, window=8, z_threshold=2.0)
+    for row in range(5):
+        expected = pd.Series(panel[row]).rolling(8).mean().shift(1).to_numpy()
+        np.testing.assert_allclose(stats["rolling_mean"][row], expected, equal_nan=True)
+    assert stats["regime_change"][2, 30]
+
+
+def test_spike_is_flagged_with_a_short_window():
+    # With the current period inside a 4-period window |z| could never exceed 1.5
+    drift = np.array([0.10, 0.12, 0.09, 0.11, 0.10, 0.95, 0.12])
+    stats = rolling_drift_statistics(drift, window=4, z_threshold=2.0)
+    assert stats["regime_change"].tolist() == [False, False, False, False, False, True, False]
+    assert stats["rolling_zscore"][5] > 50
+
+
+def test_history_endpoint(cached_raw):
+    cached_raw("AAPL", periods=10)
+    response = TestClient(app).get("/v1/drift/AAPL/history", params={"window": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["periods"]) == len(data["drift_score"]) == 10
+    assert data["rolling_zscore"][0] is None
@@ -0,0 +1,118 @@
+import time
+import asyncio
+import threading
+import multiprocessing
+import httpx
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import executors, response_cache
+from app.services.executors import BoundedPool, PoolSaturatedError
+from app.services.financial_service import FinancialService
+from app.services.response_cache import ResponseCache
+
+
+def _pool(max_pending: int, timeout: float = 5.0) -> BoundedPool:
+    return BoundedPool("test", lambda: ThreadPoolExecutor(max_workers=2), max_pending, timeout)
+
+
+def test_rejects_work_beyond_max_pending():
+    pool = _pool(max_pending=1)
+    gate = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(gate.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(time.sleep, 0)
+        gate.set()
+        await running
+        return await pool.run(sum, [1, 2])
+
+    assert asyncio.run(scenario()) == 3
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
+
+
+def test_timeout_keeps_slot_until_work_finishes():
+    pool = _pool(max_pending=4, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 0.3)
+        assert pool.stats()["pending"] == 1
+        await asyncio.sleep(0.4)
+
+    asyncio.run(scenario())
+    assert pool.stats() == {"pending": 0, "max_pending": 4, "rejected": 0, "timeouts": 1}
+    pool.shutdown()
+
+
+def test_health_stays_fast_while_cold_ticker_builds_and_saturation_is_429(cached_raw, monkeypatch):
+    cached_raw("AAPL")
+    cached_raw("MSFT")
+    monkeypatch.setattr(response_cache, "_default_cache", ResponseCache())
+    monkeypatch.setattr(executors, "_cpu_pool", _pool(max_pending=1))
+    original = FinancialService.get_financial_metrics
+
+    def slow_build(ticker):
+        time.sleep(0.5)
+        return original(ticker)
+
+    monkeypatch.setattr(FinancialService, "get_financial_metrics", staticmethod(slow_build))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            cold = asyncio.ensure_future(client.get("/v1/financials/AAPL"))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            health = await client.get("/health")
+            health_latency = time.perf_counter() - started
+            saturated = await client.get("/v1/financials/MSFT")
+            return (await cold), health, health_latency, saturated
+
+    cold, health, health_latency, saturated = asyncio.run(scenario())
+    assert cold.status_code == 200
+    assert health.status_code == 200
+    assert health_latency < 0.25
+    assert saturated.status_code == 429
+    assert saturated.headers["retry-after"] == "1"
+
+
+def test_route_timeout_is_504(cached_raw, monkeypatch):
+    cached_raw("AAPL")
+    monkeypatch.setattr(response_cache, "_default_cache", ResponseCache())
+    monkeypatch.setattr(executors, "_cpu_pool", _pool(max_pending=4, timeout=0.05))
+    original = FinancialService.get_financial_metrics
+
+    def slow_build(ticker):
+        time.sleep(0.3)
+        return original(ticker)
+
+    monkeypatch.setattr(FinancialService, "get_financial_metrics", staticmethod(slow_build))
+    response = TestClient(app).get("/v1/financials/AAPL")
+    assert response.status_code == 504
+
+
+def test_routes_run_on_spawned_worker_processes(cached_raw, data_dirs, monkeypatch):
+    # Spawned workers re-import app.config, so they find the test data through DATA_DIR
+    monkeypatch.setenv("DATA_DIR", str(data_dirs["raw"].parent))
+    cached_raw("AAPL", periods=12)
+    monkeypatch.setattr(response_cache, "_default_cache", ResponseCache())
+    pool = BoundedPool("cpu", lambda: ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")), 8, 120.0)
+    monkeypatch.setattr(executors, "_cpu_pool", pool)
+    client = TestClient(app)
+    try:
+        financials = client.get("/v1/financials/AAPL", params={"encoding": "compact"})
+        drift = client.get("/v1/drift/AAPL", params={"profile": "default"})
+        history = client.get("/v1/drift/AAPL/history", params={"window": 4})
+        metrics_text = client.get("/metrics").text
+    finally:
+        pool.shutdown()
+    assert financials.status_code == drift.status_code == history.status_code == 200
+    assert financials.json()["revenue_growth"]["dtype"] == "float32"
+    assert len(history.json()["periods"]) == 12
+    # Spans recorded in the worker are merged back into this process's registry
+    assert 'stage="financials.load_features"' in metrics_text
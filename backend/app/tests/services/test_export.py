@@ -0,0 +1,86 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from concurrent.futures import ThreadPoolExecutor
+from app.services import executors, export_service
+from app.services.executors import BoundedPool
+from app.services.drift_service import DriftService
+from app.services.export_service import EXPORT_COLUMNS
+
+
+def test_csv_export_streams_every_ticker(cached_raw, monkeypatch):
+    cached_raw("AAPL", periods=8)
+    cached_raw("MSFT", periods=5)
+    monkeypatch.setattr("app.routers.export.EXPORT_CHUNK_TICKERS", 1)
+    client = TestClient(app)
+
+    response = client.post("/v1/export", json={"tickers": ["AAPL", "NOPE", "MSFT"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    df = pd.read_csv(io.BytesIO(response.content), comment="#")
+    assert list(df.columns) == EXPORT_COLUMNS
+    trailer = response.text.splitlines()[-1]
+    assert trailer.startswith("# export ")
+    assert json.loads(trailer[len("# export "):]) == {"complete": True, "skipped": {"NOPE": "Data unavailable for NOPE"}}
+    assert df["ticker"].value_counts().to_dict() == {"AAPL": 8, "MSFT": 5}
+
+    history = DriftService.get_drift_history("AAPL")
+    aapl = df[df["ticker"] == "AAPL"]
+    assert aapl["period"].tolist() == history.periods
+    np.testing.assert_allclose(aapl["drift_score"], history.drift_score)
+
+    # Without tickers, everything in the raw cache is exported
+    everything = pd.read_csv(io.BytesIO(client.post("/v1/export", json={}).content), comment="#")
+    assert set(everything["ticker"]) == {"AAPL", "MSFT"}
+
+
+def test_arrow_export_falls_back_to_ndjson(cached_raw, monkeypatch):
+    cached_raw("AAPL", periods=6)
+    monkeypatch.setattr(export_service, "pa", None)
+    response = TestClient(app).post("/v1/export", json={"tickers": ["AAPL"], "format": "arrow"})
+    assert response.headers["x-export-format"] == "ndjson"
+    *rows, trailer = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 6 and list(rows[0]) == EXPORT_COLUMNS
+    assert trailer == {"export": {"complete": True, "skipped": {}}}
+    assert rows[0]["drift_category"] in {"conservative", "stable", "moderate", "critical"}
+
+
+def test_arrow_export_is_a_valid_ipc_stream(cached_raw):
+    pa = pytest.importorskip("pyarrow")
+    cached_raw("AAPL", periods=6)
+    cached_raw("MSFT", periods=4)
+    response = TestClient(app).post("/v1/export", json={"tickers": ["AAPL", "MSFT"], "format": "arrow"})
+    reader = pa.ipc.open_stream(response.content)
+    table = reader.read_all()
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.num_rows == 10
+
+    # The last (empty) batch carries the trailer
+    batches = pa.ipc.open_stream(response.content)
+    last = None
+    while True:
+        try:
+            last = batches.read_next_batch_with_custom_metadata()
+        except StopIteration:
+            break
+    assert last.batch.num_rows == 0
+    assert json.loads(last.custom_metadata[b"export"]) == {"complete": True, "skipped": {}}
+
+
+def test_saturated_pool_delays_chunks_instead_of_truncating(cached_raw, monkeypatch):
+    for ticker in ("AAPL", "MSFT", "NVDA"):
+        cached_raw(ticker, periods=4)
+    monkeypatch.setattr("app.routers.export.EXPORT_CHUNK_TICKERS", 1)
+    monkeypatch.setattr("app.routers.export.EXPORT_RETRY_SECONDS", 0.01)
+    # One slot: prefetched chunks are turned away until the previous one finishes
+    monkeypatch.setattr(executors, "_cpu_pool", BoundedPool("cpu", lambda: ThreadPoolExecutor(max_workers=1), 1, 30.0))
+    response = TestClient(app).post("/v1/export", json={"tickers": ["AAPL", "MSFT", "NVDA"], "format": "ndjson"})
+
+    *rows, trailer = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["ticker"] for row in rows} == {"AAPL", "MSFT", "NVDA"}
+    assert trailer == {"export": {"complete": True, "skipped": {}}}
+    assert executors._cpu_pool.stats()["rejected"] > 0
@@ -0,0 +1,37 @@
+import io
+import json
+import pandas as pd
+from app.core.json_stream import JSONStream, iter_members
+from app.core.normalization import PILLAR_MAPPING
+from app.services.ingestion_service import IngestionService
+from app.tests.factories import make_companyfacts
+
+
+def test_streamed_extraction_matches_full_load(cached_raw):
+    payload = cached_raw("AAPL", extra_tags=50)
+    raw_path = IngestionService.raw_path("AAPL")
+
+    streamed = IngestionService.stream_facts_to_df("AAPL", raw_path)
+    pd.testing.assert_frame_equal(streamed, IngestionService.extract_facts_to_df("AAPL", payload))
+
+    filtered = IngestionService.stream_facts_to_df("AAPL", raw_path, tags=PILLAR_MAPPING)
+    assert set(filtered["metric"]) <= set(PILLAR_MAPPING)
+    expected = streamed[streamed["metric"].isin(PILLAR_MAPPING)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(filtered, expected)
+
+
+def test_json_stream_survives_tiny_chunks():
+    payload = make_companyfacts(periods=3)
+    payload["cik"] = 1234567
+    stream = JSONStream(io.StringIO(json.dumps(payload, indent=2)), chunk_size=5)
+
+    seen = {}
+    for key in iter_members(stream):
+        seen[key] = stream.decode()
+    assert seen == payload
+
+
+def test_no_matching_tags_yields_empty_frame(cached_raw):
+    cached_raw("AAPL")
+    df = IngestionService.stream_facts_to_df("AAPL", IngestionService.raw_path("AAPL"), tags=["NotATag"])
+    assert df.empty
@@ -0,0 +1,107 @@
+import tracemalloc
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import metrics, response_cache
+from app.services.metrics import MetricsRegistry
+from app.services.response_cache import ResponseCache
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", fresh)
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    return fresh
+
+
+def test_render_prometheus_text(registry):
+    metrics.inc("drift_cache_requests_total", cache="response", result="hit")
+    metrics.inc("drift_cache_requests_total", 2, cache="response", result="hit")
+    registry.observe("drift_stage_seconds", 0.003, (("stage", "drift.score"),))
+    registry.observe("drift_stage_seconds", 7.0, (("stage", "drift.score"),))
+
+    text = registry.render()
+    assert "# TYPE drift_cache_requests_total counter" in text
+    assert 'drift_cache_requests_total{cache="response",result="hit"} 3' in text
+    assert "# TYPE drift_stage_seconds histogram" in text
+    assert 'drift_stage_seconds_bucket{stage="drift.score",le="0.0025"} 0' in text
+    assert 'drift_stage_seconds_bucket{stage="drift.score",le="0.005"} 1' in text
+    assert 'drift_stage_seconds_bucket{stage="drift.score",le="10.0"} 2' in text
+    assert 'drift_stage_seconds_bucket{stage="drift.score",le="+Inf"} 2' in text
+    assert 'drift_stage_seconds_count{stage="drift.score"} 2' in text
+
+
+def test_disabled_metrics_record_nothing(registry, monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    with metrics.span("drift.score"):
+        metrics.inc("drift_llm_calls_total", outcome="ok")
+    assert metrics.span("drift.score") is metrics.span("pipeline.features")
+    assert registry.render() == "\n"
+
+
+def test_spans_feed_request_timings_and_worker_snapshots_merge(registry):
+    timings = []
+    token = metrics._request_timings.set(timings)
+    try:
+        payload = metrics.run_collected(lambda: [metrics.inc("drift_sec_retries_total"), 42][1])
+        with metrics.span("drift.score"):
+            pass
+        with metrics.span("drift.score"):
+            pass
+    finally:
+        metrics._request_timings.reset(token)
+
+    # run_collected drains what the "worker" recorded; merging puts it back here
+    assert registry.counters == {}
+    assert metrics.merge_collected(payload) == 42
+    assert registry.counters[("drift_sec_retries_total", ())] == 1
+    assert [stage for stage, _ in timings] == ["drift.score", "drift.score"]
+    header = metrics.server_timing_header(timings, 0.5)
+    assert header.startswith("drift.score;dur=") and header.endswith("total;dur=500.00")
+    assert header.count("drift.score") == 1
+
+
+def test_nested_span_peaks_propagate_to_parent(registry):
+    tracemalloc.start()
+    try:
+        with metrics.span("outer"):
+            with metrics.span("inner"):
+                block = bytearray(4 << 20)
+                del block
+    finally:
+        tracemalloc.stop()
+    inner = registry.gauges[("drift_stage_peak_memory_bytes", (("stage", "inner"),))]
+    outer = registry.gauges[("drift_stage_peak_memory_bytes", (("stage", "outer"),))]
+    assert inner >= 4 << 20
+    assert outer >= inner
+
+
+def test_metrics_endpoint_and_server_timing(cached_raw, registry, monkeypatch):
+    cached_raw("AAPL")
+    monkeypatch.setattr(response_cache, "_default_cache", ResponseCache())
+    monkeypatch.setattr(metrics, "SERVER_TIMING", True)
+    client = TestClient(app)
+
+    response = client.get("/v1/drift/AAPL")
+    assert response.status_code == 200
+    stages = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+    assert {"drift.load_features", "pipeline.normalize", "pipeline.features", "total"} <= set(stages)
+
+    text = client.get("/metrics").text
+    assert 'drift_http_request_seconds_count{route="/v1/drift/{ticker}"} 1' in text
+    assert 'drift_cache_requests_total{cache="processed",result="miss"} 1' in text
+    assert 'drift_cache_requests_total{cache="response",result="miss"} 1' in text
+    assert 'drift_stage_seconds_count{stage="ingest.stream_facts"} 1' in text
+    assert "process_peak_rss_bytes" in text
+
+
+def test_route_label_is_the_route_template(registry):
+    client = TestClient(app)
+    # A ticker equal to a path segment must not be substituted into the template
+    client.get("/v1/drift/drift/history", params={"window": 2})
+    client.get("/no/such/route")
+    text = client.get("/metrics").text
+    assert 'route="/v1/drift/{ticker}/history"' in text
+    assert 'route="unmatched"' in text
+    assert "{ticker}/{ticker}" not in text
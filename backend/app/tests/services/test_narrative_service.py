@@ -0,0 +1,242 @@
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from app.models.schemas import TranscriptBatchResponse
+from app.services import executors, narrative_service
+from app.services.narrative_service import NarrativeService
+from app.services.signal_cache import SignalCache
+
+
+class FakeLLM:
+    """Stands in for openai.OpenAI; scores optimism by the count of 'strong'."""
+
+    def __init__(self, fail: int = 0):
+        self.calls = []
+        self.fail = fail
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if len(self.calls) <= self.fail:
+            raise RuntimeError("upstream unavailable")
+        text = kwargs["messages"][-1]["content"]
+        content = json.dumps({"optimism": min(text.count("strong") / 10, 1.0), "risk": text.count("risk")})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_identical_text_hits_cache_across_instances(tmp_path):
+    llm = FakeLLM()
+    cache = SignalCache(root=tmp_path)
+    first = NarrativeService(client=llm, cache=cache).extract_signals("strong demand, some risk")
+    # A fresh memory tier still finds the entry on disk
+    second = NarrativeService(client=llm, cache=SignalCache(root=tmp_path)).extract_signals("strong demand, some risk")
+
+    assert first == second == {"optimism": 0.1, "risk": 1}
+    assert len(llm.calls) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_failures_are_not_cached_and_model_invalidation(tmp_path):
+    llm = FakeLLM(fail=1)
+    cache = SignalCache(root=tmp_path)
+    service = NarrativeService(client=llm, cache=cache)
+
+    assert service.extract_signals("strong") == {"optimism": 0.0, "risk": 0}
+    assert service.extract_signals("strong") == {"optimism": 0.1, "risk": 0}
+    assert service.extract_signals("strong") == {"optimism": 0.1, "risk": 0}
+    assert len(llm.calls) == 2
+    assert cache.stats()["hits"] == 1
+
+    cache.invalidate(model=llm.calls[0]["model"])
+    service.extract_signals("strong")
+    assert len(llm.calls) == 3
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    cache = SignalCache(root=tmp_path, memory_entries=2, max_bytes=2000)
+    for i in range(100):
+        cache.put(f"{i:064x}", "model-a", {"optimism": 0.5, "risk": i, "pad": "x" * 20})
+    total = sum(p.stat().st_size for p in tmp_path.rglob("*.json"))
+    assert total <= 2000
+    assert cache.stats()["evictions"] > 0
+    assert cache.get(f"{99:064x}", "model-a") is not None
+
+
+def test_overwriting_an_entry_does_not_inflate_disk_usage(tmp_path):
+    cache = SignalCache(root=tmp_path, max_bytes=2000)
+    cache.put(f"{0:064x}", "model-a", {"optimism": 0.5, "risk": 0})
+    for i in range(200):
+        cache.put(f"{1:064x}", "model-a", {"optimism": 0.5, "risk": i % 10})
+    assert cache.stats()["evictions"] == 0
+    assert cache._disk_bytes == sum(p.stat().st_size for p in tmp_path.rglob("*.json"))
+
+
+def test_lookups_do_not_wait_on_disk_scans(tmp_path, monkeypatch):
+    cache = SignalCache(root=tmp_path, max_bytes=10)
+    cache.put(f"{0:064x}", "model-a", {"optimism": 0.5, "risk": 0})
+    scanning, release = threading.Event(), threading.Event()
+    scan = cache._scan
+
+    def slow_scan():
+        scanning.set()
+        release.wait(5)
+        return scan()
+
+    monkeypatch.setattr(cache, "_scan", slow_scan)
+    writer = threading.Thread(target=cache.put, args=(f"{1:064x}", "model-a", {"optimism": 0.1, "risk": 1}))
+    writer.start()
+    assert scanning.wait(5)
+    try:
+        started = time.perf_counter()
+        assert cache.get(f"{1:064x}", "model-a") == {"optimism": 0.1, "risk": 1}
+        assert time.perf_counter() - started < 1
+    finally:
+        release.set()
+        writer.join()
+    assert cache.stats()["evictions"] > 0
+
+
+def test_memory_tier_is_keyed_and_invalidated_per_model(tmp_path):
+    cache = SignalCache(root=tmp_path)
+    key = f"{1:064x}"
+    cache.put(key, "model-a", {"optimism": 0.1, "risk": 1})
+    cache.put(key, "model-b", {"optimism": 0.9, "risk": 2})
+    assert cache.get(key, "model-a") == {"optimism": 0.1, "risk": 1}
+    assert cache.get(key, "model-c") is None
+
+    cache.invalidate(model="model-a")
+    assert cache.stats()["memory_entries"] == 1
+    assert cache.get(key, "model-a") is None
+    assert cache.get(key, "model-b") == {"optimism": 0.9, "risk": 2}
+    assert cache.stats()["disk_hits"] == 0
+
+
+def test_memory_tier_is_isolated_from_caller_mutation(tmp_path):
+    cache = SignalCache(root=tmp_path)
+    key = f"{1:064x}"
+    value = {"optimism": 0.5, "risk": 1, "tags": ["demand"]}
+    cache.put(key, "model-a", value)
+    value["risk"] = 9
+    value["tags"].append("risk")
+
+    first = cache.get(key, "model-a")
+    first["optimism"] = -1.0
+    first["tags"].clear()
+    assert cache.get(key, "model-a") == {"optimism": 0.5, "risk": 1, "tags": ["demand"]}
+
+
+def test_batch_preserves_order_and_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(narrative_service, "DATA_TRANSCRIPTS_DIR", tmp_path)
+    monkeypatch.setattr(narrative_service, "RETRY_BASE_DELAY", 0.0)
+    llm = FakeLLM(fail=2)
+    service = NarrativeService(client=llm, cache=SignalCache(root=tmp_path / "cache"))
+    items = [("AAPL", f"2023 Q{i}", "Operator: welcome.\n" + "strong " * i) for i in range(1, 6)]
+
+    results = asyncio.run(service.process_batch(items, clean_in_processes=False, max_concurrency=3))
+
+    assert [r["fiscal_period"] for r in results] == [p for _, p, _ in items]
+    assert [r["optimism"] for r in results] == [0.1, 0.2, 0.3, 0.4, 0.5]
+    assert all(r["error"] is None for r in results)
+    assert len(llm.calls) == 7
+    assert (tmp_path / "AAPL_2023_q3_clean.txt").read_text() == "welcome. strong strong strong"
+
+
+def test_long_transcript_is_chunked_and_chunks_cached(tmp_path):
+    llm = FakeLLM()
+    service = NarrativeService(client=llm, cache=SignalCache(root=tmp_path), chunk_tokens=100)
+    sentences = [f"Segment {i} saw {'strong ' * (i % 3)}demand and {'risk ' * (i % 2)}ahead." for i in range(200)]
+    text = " ".join(sentences)
+
+    signals = service.extract_signals(text)
+    first_calls = len(llm.calls)
+    assert first_calls > 1
+    assert signals["risk"] == text.count("risk")
+    # The guidance at the end of the call is scored, not truncated away
+    assert all("TEXT: " in c["messages"][-1]["content"] for c in llm.calls)
+    assert any("Segment 199" in c["messages"][-1]["content"] for c in llm.calls)
+
+    sentences[100] = "Segment 100 saw strong strong strong demand."
+    asyncio.run(service.extract_signals_async(" ".join(sentences)))
+    assert 1 <= len(llm.calls) - first_calls <= 3
+
+
+def test_lexicon_scorer_runs_offline(tmp_path):
+    service = NarrativeService(client=None, cache=SignalCache(root=tmp_path), scorer="llm")
+    # Without an API key the LLM scorer falls back to the lexicon instead of neutral signals
+    service.client = None
+    signals = service.extract_signals("Demand was strong. Margins improved despite risk.")
+    assert signals == {"optimism": 1.0, "risk": 1}
+
+
+def test_hybrid_escalates_only_ambiguous_transcripts(tmp_path):
+    llm = FakeLLM()
+    service = NarrativeService(client=llm, cache=SignalCache(root=tmp_path), scorer="hybrid")
+
+    clear = service.extract_signals("Strong demand, record margins, robust growth, great execution, solid cash.")
+    assert clear["optimism"] == 1.0
+    assert llm.calls == []
+
+    asyncio.run(service.extract_signals_async("Strong demand but weak pricing."))
+    assert len(llm.calls) == 1
+
+
+def test_narrative_history_from_stored_transcripts(tmp_path, monkeypatch):
+    monkeypatch.setattr(narrative_service, "DATA_TRANSCRIPTS_DIR", tmp_path)
+    service = NarrativeService(client=None, cache=SignalCache(root=tmp_path / "cache"), scorer="lexicon")
+    assert service.get_narrative_history("AAPL") is None
+
+    service.process_transcript("AAPL", "2023 Q1", "CEO: Results were weak. We expect a difficult year.")
+    service.process_transcript("AAPL", "2023 Q2", "CEO: Demand was strong. Margins improved.")
+    history = service.get_narrative_history("AAPL")
+
+    assert history["periods"] == ["2023_q1", "2023_q2"]
+    assert history["optimism_score"] == [-1.0, 1.0]
+    assert history["risk_mentions"] == [2, 0]
+    assert history["forward_looking_density"] == [0.5, 0.0]
+    assert len(history["narrative_momentum"]) == 2
+
+
+def test_history_reads_persisted_signals_in_fiscal_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(narrative_service, "DATA_TRANSCRIPTS_DIR", tmp_path)
+    llm = FakeLLM()
+    service = NarrativeService(client=llm, cache=SignalCache(root=tmp_path / "cache"), scorer="llm")
+    for period, text in [("2023 FY", "strong strong strong"), ("2023 Q1", "strong"), ("2024 Q1", "risk"), ("2023 Q3", "strong strong")]:
+        service.process_transcript("AAPL", period, text)
+    assert len(llm.calls) == 4
+
+    # A service with an empty signal cache reads the persisted signals instead of calling the LLM
+    reader = NarrativeService(client=llm, cache=SignalCache(root=tmp_path / "other"), scorer="llm")
+    history = reader.get_narrative_history("AAPL")
+    assert len(llm.calls) == 4
+    assert history["periods"] == ["2023_q1", "2023_q3", "2023_fy", "2024_q1"]
+    assert history["optimism_score"] == [0.1, 0.2, 0.3, 0.0]
+
+    # Transcripts stored without signals are scored once, then read back
+    (tmp_path / "AAPL_2024_q1_signals.json").unlink()
+    reader.get_narrative_history("AAPL")
+    reader.get_narrative_history("AAPL")
+    assert len(llm.calls) == 4 + 1
+
+
+def test_batch_reuses_the_shared_clean_pool_and_rounds_fractional_risk(tmp_path, monkeypatch):
+    monkeypatch.setattr(narrative_service, "DATA_TRANSCRIPTS_DIR", tmp_path)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(executors, "_clean_executor", pool)
+    monkeypatch.setattr(executors, "NARRATIVE_CLEAN_WORKERS", 2)
+    llm = FakeLLM()
+    llm.chat.completions.create = lambda **kwargs: SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"optimism": 0.25, "risk": 2.6}'))])
+    service = NarrativeService(client=llm, cache=SignalCache(root=tmp_path / "cache"), scorer="llm")
+    items = [("AAPL", "2023 Q1", "CEO: fine."), ("AAPL", "2023 Q2", "CEO: also fine.")]
+
+    for _ in range(2):
+        results = asyncio.run(service.process_batch(items))
+        # One LLM reply with a fractional count no longer fails the whole response
+        TranscriptBatchResponse(results=results)
+        assert [r["risk"] for r in results] == [3, 3]
+    # The shared pool outlives each batch
+    assert pool.submit(sum, [1, 2]).result() == 3
+    pool.shutdown()
@@ -0,0 +1,38 @@
+import os
+import pandas as pd
+from app.core.normalization import PILLAR_MAPPING
+from app.services.ingestion_service import IngestionService
+from app.services.pipeline_service import PipelineService
+from app.services.processed_store import ProcessedStore
+
+
+def test_cold_and_warm_frames_match(cached_raw):
+    payload = cached_raw("AAPL")
+    cold = PipelineService.load_frame("AAPL", "features")
+    warm = PipelineService.load_frame("AAPL", "features")
+
+    facts = IngestionService.extract_facts_to_df("AAPL", payload, tags=PILLAR_MAPPING)
+    expected = PipelineService.build_frames("AAPL", facts)["features"]
+    pd.testing.assert_frame_equal(cold, expected)
+    pd.testing.assert_frame_equal(warm, expected)
+
+    pd.testing.assert_frame_equal(PipelineService.load_frame("AAPL", "facts"), facts)
+
+
+def test_column_subset_is_served_from_store(cached_raw):
+    cached_raw("AAPL")
+    PipelineService.load_frame("AAPL", "features")
+    subset = PipelineService.load_frame("AAPL", "features", columns=["revenue_growth", "fp"])
+    assert list(subset.columns) == ["revenue_growth", "fp"]
+    assert len(subset) == 8
+
+
+def test_raw_change_invalidates_processed_frames(cached_raw):
+    cached_raw("AAPL", periods=4)
+    assert len(PipelineService.load_frame("AAPL", "normalized")) == 4
+
+    cached_raw("AAPL", periods=6)
+    raw_path = IngestionService.raw_path("AAPL")
+    os.utime(raw_path, ns=(0, raw_path.stat().st_mtime_ns + 1_000_000))
+    assert not ProcessedStore.is_current("AAPL", ProcessedStore.source_fingerprint(raw_path))
+    assert len(PipelineService.load_frame("AAPL", "normalized")) == 6
@@ -0,0 +1,58 @@
+import json
+import asyncio
+from app.services.ingestion_service import IngestionService, RAW_PERSISTED_LISTENERS
+from app.services.processed_store import ProcessedStore
+from app.services.rate_limiter import TokenBucket
+from app.services.raw_store import RawStore
+from app.services.sec_client import SECClient
+from app.tests.factories import StubSEC, make_companyfacts
+
+
+def test_compressed_payload_replaces_legacy_file(data_dirs):
+    payload = make_companyfacts(extra_tags=200)
+    body = json.dumps(payload, indent=2).encode()
+    legacy = data_dirs["raw"] / "AAPL_raw.json"
+    legacy.write_bytes(body)
+    assert IngestionService.raw_path("AAPL") == legacy
+    assert "mtime_ns" in ProcessedStore.source_fingerprint(legacy)
+    assert IngestionService.stream_facts_to_df("AAPL", legacy).shape[0] > 0
+
+    meta = RawStore.save("AAPL", body, cik=320193, etag='"v1"')
+    raw_path = IngestionService.raw_path("AAPL")
+    assert raw_path.name == "AAPL_raw.json.gz" and not legacy.exists()
+    assert raw_path.stat().st_size * 5 < len(body)
+    assert RawStore.load(raw_path) == payload
+    assert RawStore.index() == [meta]
+    assert ProcessedStore.source_fingerprint(raw_path)["sha256"] == meta["sha256"]
+
+    # Identical content keeps the version, so downstream caches stay valid
+    version = IngestionService.raw_version("AAPL")
+    assert RawStore.update("AAPL", body, cik=320193, etag='"v2"') is False
+    assert IngestionService.raw_version("AAPL") == version
+    assert RawStore.read_meta(raw_path)["etag"] == '"v2"'
+    assert RawStore.update("AAPL", json.dumps(make_companyfacts(periods=3)).encode()) is True
+    assert IngestionService.raw_version("AAPL") != version
+
+
+def test_refresh_uses_conditional_requests(data_dirs):
+    persisted = []
+    RAW_PERSISTED_LISTENERS.append(persisted.append)
+    try:
+        with StubSEC(etag='"v1"') as stub:
+            client = SECClient(base_url=stub.url, rate_limiter=TokenBucket(rate=1000), backoff=0.01)
+
+            async def run():
+                data = await IngestionService.download_raw_async("AAPL", 320193, client)
+                outcome = await IngestionService.refresh_raw_async("AAPL", 320193, client)
+                await client.aclose()
+                return data, outcome
+
+            data, outcome = asyncio.run(run())
+    finally:
+        RAW_PERSISTED_LISTENERS.remove(persisted.append)
+
+    assert data["entityName"] == "Synthetic Corp"
+    assert outcome == "unchanged"
+    assert len(stub.requests) == 2 and stub.not_modified == 1
+    assert persisted == ["AAPL"]
+    assert RawStore.read_meta(RawStore.path("AAPL"))["cik"] == 320193
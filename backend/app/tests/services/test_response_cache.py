@@ -0,0 +1,119 @@
+import time
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.schemas import HealthResponse
+from app.services import ingestion_service, response_cache
+from app.services.ingestion_service import _notify_raw_persisted
+from app.services.response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _run(cache, key, version, compute):
+    return asyncio.run(cache.get_or_compute(key, version, lambda: asyncio.to_thread(compute)))
+
+
+def test_lru_ttl_and_versioning():
+    clock = Clock()
+    cache = ResponseCache(max_entries=2, ttl=10, clock=clock)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return HealthResponse(status="ok", version=str(len(calls)))
+
+    first = _run(cache, ("financials", "AAPL"), "v1", compute)
+    assert _run(cache, ("financials", "AAPL"), "v1", compute) == first
+    # A newer raw payload is a different version, so it recomputes
+    _run(cache, ("financials", "AAPL"), "v2", compute)
+    assert len(calls) == 2
+
+    clock.now = 11
+    _run(cache, ("financials", "AAPL"), "v2", compute)
+    _run(cache, ("drift", "AAPL"), "v2", compute)
+    _run(cache, ("drift", "MSFT"), "v1", compute)
+    assert len(calls) == 5
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["hit_ratio"] == 1 / 6
+
+
+def test_concurrent_misses_share_one_computation_and_errors_are_not_cached():
+    cache = ResponseCache()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return HealthResponse(status="ok", version="1")
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_or_compute(("drift", "AAPL"), "v1", lambda: asyncio.to_thread(slow)) for _ in range(10)))
+
+    entries = asyncio.run(burst())
+    assert len(calls) == 1
+    assert len({e.etag for e in entries}) == 1
+    assert cache.stats()["coalesced"] == 9
+
+    def broken():
+        raise ValueError("Data unavailable")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            _run(cache, ("drift", "MSFT"), "v1", broken)
+    assert cache.stats()["misses"] == 3
+
+
+def test_cancelled_leader_does_not_fail_coalesced_waiters():
+    cache = ResponseCache()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return HealthResponse(status="ok", version="1")
+
+    async def scenario():
+        leader = asyncio.ensure_future(cache.get_or_compute(("drift", "AAPL"), "v1", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute(("drift", "AAPL"), "v1", slow))
+        await asyncio.sleep(0)
+        # The client behind the first request disconnects mid-computation
+        leader.cancel()
+        entry = await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return entry
+
+    entry = asyncio.run(scenario())
+    assert entry.body == b'{"status":"ok","version":"1"}'
+    assert cache.stats()["coalesced"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_routes_serve_etags_and_invalidate_on_new_payload(cached_raw, monkeypatch):
+    cache = ResponseCache()
+    monkeypatch.setattr(response_cache, "_default_cache", cache)
+    monkeypatch.setattr(ingestion_service, "RAW_PERSISTED_LISTENERS", [cache.invalidate])
+    cached_raw("AAPL", periods=8)
+    client = TestClient(app)
+
+    first = client.get("/v1/financials/AAPL")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/v1/financials/AAPL", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/v1/drift/AAPL/history", params={"window": 4}).status_code == 200
+    assert cache.stats()["entries"] == 2
+
+    _notify_raw_persisted("AAPL")
+    assert cache.stats()["entries"] == 0
+    cached_raw("AAPL", periods=10)
+    refreshed = client.get("/v1/financials/AAPL", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert client.get("/cache/stats").json()["misses"] == 3
@@ -0,0 +1,76 @@
+import time
+import asyncio
+import threading
+import pytest
+from app.services.rate_limiter import TokenBucket
+from app.services.sec_client import SECClient, retry_after_seconds
+from app.tests.factories import StubSEC
+
+
+def _client(url: str, **kwargs) -> SECClient:
+    return SECClient(base_url=url, rate_limiter=TokenBucket(rate=1000), backoff=0.01, **kwargs)
+
+
+def test_concurrent_requests_for_same_cik_are_coalesced():
+    with StubSEC(delay=0.2) as stub:
+        client = _client(stub.url)
+
+        async def run():
+            results = await asyncio.gather(*[client.fetch_companyfacts(320193) for _ in range(5)])
+            await client.aclose()
+            return results
+
+        results = asyncio.run(run())
+    assert len(stub.requests) == 1
+    assert stub.requests[0][0] == "/api/xbrl/companyfacts/CIK0000320193.json"
+    assert all(r["entityName"] == "Synthetic Corp" for r in results)
+
+
+def test_retry_after_is_honoured_and_connections_reused():
+    with StubSEC(throttle_first=2) as stub:
+        client = _client(stub.url)
+
+        async def run():
+            first = await client.fetch_companyfacts(1)
+            second = await client.fetch_companyfacts(2)
+            await client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+    assert first is not None and second is not None
+    assert len(stub.requests) == 4
+    # Keep-alive: every request arrived over the same client socket
+    assert len({port for _, port in stub.requests}) == 1
+
+
+def test_client_from_previous_event_loop_is_closed():
+    with StubSEC() as stub:
+        client = _client(stub.url)
+        assert asyncio.run(client.fetch_companyfacts(1))["entityName"] == "Synthetic Corp"
+        first = client._client
+
+        async def run():
+            result = await client.fetch_companyfacts(2)
+            await client.aclose()
+            return result
+
+        assert asyncio.run(run())["entityName"] == "Synthetic Corp"
+    assert first.is_closed
+    assert len(stub.requests) == 2
+
+
+def test_token_bucket_enforces_rate_across_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # One token up front, the remaining ten paced at 50/s
+    assert time.monotonic() - start >= 0.19
+
+
+@pytest.mark.parametrize("value,expected", [("3", 3.0), (None, 1.5), ("garbage", 1.5)])
+def test_retry_after_parsing(value, expected):
+    assert retry_after_seconds(value, 1.5) == expected
@@ -0,0 +1,71 @@
+import base64
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.schemas import DriftHistoryResponse, FinancialsCompactResponse, FinancialsResponse
+from app.services.serialization import dump_json, float_array_fields, render
+
+
+def _decode(packed):
+    dtype = {"float32": "<f4", "float64": "<f8"}[packed["dtype"]]
+    return np.frombuffer(base64.b64decode(packed["data"]), dtype=dtype).reshape(packed["shape"])
+
+
+def test_constructed_models_match_pydantic_json_and_pack_float_fields():
+    values = np.random.default_rng(0).normal(size=40)
+    constructed = FinancialsResponse.model_construct(
+        ticker="AAPL", quarterly_index=[f"{2014 + i // 4}Q{i % 4 + 1}" for i in range(40)],
+        revenue_growth=values, ocf_growth=values[::-1], accrual_ratio=values[::2].repeat(2), free_cash_flow=values * 1e9,
+    )
+    validated = FinancialsResponse(**{k: v.tolist() if hasattr(v, "tolist") else v for k, v in constructed.__dict__.items()})
+    assert json.loads(dump_json(constructed)) == json.loads(validated.model_dump_json())
+
+    assert float_array_fields(FinancialsResponse) == {
+        "revenue_growth": "float32", "ocf_growth": "float32", "accrual_ratio": "float32", "free_cash_flow": "float64",
+    }
+    compact = json.loads(render(constructed, "compact"))
+    assert compact["quarterly_index"] == validated.quarterly_index
+    np.testing.assert_array_equal(_decode(compact["revenue_growth"]), values.astype(np.float32))
+    # Dollar amounts keep full precision
+    np.testing.assert_array_equal(_decode(compact["free_cash_flow"]), values * 1e9)
+    assert len(render(constructed, "compact")) < len(render(constructed, "json")) / 2
+
+    dollars = FinancialsResponse.model_construct(**dict(constructed.__dict__, free_cash_flow=np.array([99_803_000_123.0])))
+    assert _decode(json.loads(render(dollars, "compact"))["free_cash_flow"])[0] == 99_803_000_123.0
+
+    # Optional floats are sent as NaN; other list fields stay JSON
+    history = DriftHistoryResponse.model_construct(
+        ticker="AAPL", window=2, periods=["a", "b"], financial_momentum=[1.0, 2.0], narrative_momentum=[0.0, 0.0],
+        drift_score=[-1.0, -2.0], rolling_mean=[None, -1.5], rolling_std=[None, 0.5], rolling_zscore=[None, -1.0],
+        regime_change=[False, True], explanation=["x", "y"],
+    )
+    packed = json.loads(render(history, "compact"))
+    assert packed["regime_change"] == [False, True]
+    decoded = _decode(packed["rolling_mean"])
+    assert np.isnan(decoded[0]) and decoded[1] == -1.5
+
+
+def test_financials_compact_encoding_round_trips(cached_raw):
+    cached_raw("AAPL", periods=8)
+    client = TestClient(app)
+
+    plain = client.get("/v1/financials/AAPL")
+    compact = client.get("/v1/financials/AAPL", params={"encoding": "compact"})
+    assert plain.status_code == compact.status_code == 200
+    assert plain.headers["etag"] != compact.headers["etag"]
+    expected, payload = plain.json(), compact.json()
+    assert payload["quarterly_index"] == expected["quarterly_index"]
+    for field in ("revenue_growth", "ocf_growth", "accrual_ratio", "free_cash_flow"):
+        np.testing.assert_allclose(_decode(payload[field]), expected[field], rtol=1e-6)
+
+    assert payload["free_cash_flow"]["dtype"] == "float64"
+    FinancialsCompactResponse.model_validate(payload)
+
+    assert client.get("/v1/financials/AAPL", params={"encoding": "msgpack"}).status_code == 422
+    schema = client.get("/openapi.json").json()
+    ok = schema["paths"]["/v1/financials/{ticker}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {ref["$ref"].rsplit("/", 1)[-1] for ref in ok["anyOf"]} == {"FinancialsResponse", "FinancialsCompactResponse"}
+    narrative = client.get("/v1/narrative/AAPL", params={"encoding": "compact"}).json()
+    assert narrative["risk_mentions"] == [5, 8, 7]
+    np.testing.assert_allclose(_decode(narrative["optimism_score"]), [0.2, 0.4, 0.35], rtol=1e-6)
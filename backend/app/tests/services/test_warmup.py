@@ -0,0 +1,28 @@
+import sys
+import json
+import asyncio
+import subprocess
+from pathlib import Path
+from app.services import warmup
+from app.services.processed_store import ProcessedStore
+from app.services.ingestion_service import IngestionService
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+
+def test_importing_app_defers_heavy_dependencies(tmp_path):
+    probe = "import sys, json, app.main; print(json.dumps([m for m in ('pandas', 'numpy', 'openai', 'requests') if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True, cwd=BACKEND_DIR,
+                         env={"PATH": "", "DATA_DIR": str(tmp_path / "data"), "PYTHONPATH": str(BACKEND_DIR)})
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+    # Directories are created by the startup hook, not at import
+    assert not (tmp_path / "data").exists()
+
+
+def test_prewarm_builds_processed_frames_and_skips_failures(cached_raw, caplog):
+    cached_raw("AAPL")
+    asyncio.run(warmup.prewarm(["AAPL", "NOPE"]))
+
+    fingerprint = ProcessedStore.source_fingerprint(IngestionService.raw_path("AAPL"))
+    assert ProcessedStore.is_current("AAPL", fingerprint)
+    assert "Prewarm skipped NOPE" in caplog.text
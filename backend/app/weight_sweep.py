@@ -0,0 +1,89 @@
+"""Historical sweep of financial momentum weights.
+
+Loads engineered features for a ticker universe from the processed store (run
+app.backfill first), evaluates every weight vector on a simplex grid and
+reports which would have flagged CRITICAL/MODERATE drift ahead of revenue or
+operating cash flow deterioration.
+
+    python -m app.weight_sweep --steps 50 --periods 40 --horizon 4
+"""
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import pandas as pd
+from app.config import CIK_MAPPING
+from app.core.backtest import OUTCOME_FEATURES, feature_tensor, sweep_weights, top_candidates, weight_grid
+from app.services.drift_service import DriftService, get_drift_profile
+from app.services.ingestion_service import load_company_tickers
+from app.services.pipeline_service import PipelineService
+
+logger = logging.getLogger(__name__)
+
+
+def load_features(tickers: List[str], columns: List[str]) -> Dict[str, pd.DataFrame]:
+    """Feature frames for the tickers that have data; the rest are logged and skipped."""
+    frames = {}
+    for ticker in tickers:
+        try:
+            frames[ticker] = PipelineService.load_frame(ticker, "features", columns=columns)
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Sweep skipped {ticker}: {e}")
+    return frames
+
+
+def run_sweep(
+    tickers: List[str],
+    steps: int = 20,
+    periods: int = 40,
+    horizon: int = 4,
+    profile: Optional[str] = None,
+    top: int = 10,
+) -> Dict[str, Any]:
+    drift_profile = get_drift_profile(profile)
+    features = list(drift_profile.weights["financial"])
+    frames = load_features(tickers, list(dict.fromkeys(features + OUTCOME_FEATURES)))
+    if not frames:
+        raise ValueError("No feature frames available for the sweep")
+
+    tensor = feature_tensor(frames, features, periods)
+    outcomes = feature_tensor(frames, OUTCOME_FEATURES, periods)
+    # The narrative side the API pairs with financial momentum, so hit rates describe served drift
+    narrative = float(DriftService.narrative_momentum(1, drift_profile)[0])
+    result = sweep_weights(tensor, weight_grid(len(features), steps), outcomes, narrative_momentum=narrative,
+                           thresholds=drift_profile.thresholds, horizon=horizon)
+    return {
+        "tickers": len(frames),
+        "candidates": len(result["weights"]),
+        "evaluated_cells": int(result["evaluated"]),
+        "base_rate": float(result["base_rate"]),
+        "profile": drift_profile.name,
+        "narrative_momentum": narrative,
+        "top_critical": top_candidates(result, features, "critical", n=top),
+        "top_moderate": top_candidates(result, features, "moderate", n=top),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backtest financial momentum weight vectors over historical drift.")
+    parser.add_argument("--universe", help="company_tickers.json or a ticker[,cik] per line file")
+    parser.add_argument("--tickers", nargs="*", help="Explicit tickers (defaults to CIK_MAPPING)")
+    parser.add_argument("--steps", type=int, default=20, help="Grid resolution: weights are multiples of 1/steps")
+    parser.add_argument("--periods", type=int, default=40, help="Trailing fiscal periods per ticker")
+    parser.add_argument("--horizon", type=int, default=4, help="Periods after a flag in which deterioration counts")
+    parser.add_argument("--profile", help="Drift profile supplying thresholds and the feature set")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+    if args.universe:
+        tickers = list(load_company_tickers(Path(args.universe)))
+    else:
+        tickers = [t.upper() for t in args.tickers] if args.tickers else list(CIK_MAPPING)
+    summary = run_sweep(tickers, args.steps, args.periods, args.horizon, args.profile, args.top)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Deterministic synthetic inputs for the benchmark suite."""
+import random
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from app.core.normalization import PILLAR_MAPPING
+
+FISCAL_PERIODS = ["Q1", "Q2", "Q3", "FY"]
+SPEAKERS = ["Operator", "Tim Cook", "Luca Maestri", "Erik Woodring", "Amit Daryanani"]
+WORDS = "revenue growth strong demand margin guidance outlook customers services cloud quarter".split()
+
+
+def synthetic_companyfacts(
+    periods: int = 40,
+    tags: Optional[List[str]] = None,
+    extra_tags: int = 200,
+    comparatives: int = 2,
+    cik: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """A companyfacts payload with ``periods`` quarterly filings.
+
+    ``tags`` defaults to every mapped tag; ``extra_tags`` unmapped tags pad the
+    payload the way real filers' hundreds of disclosures do, and each filing also
+    repeats ``comparatives`` prior-period values under its own fy/fp/filed.
+    """
+    rng = random.Random(seed)
+    tags = list(PILLAR_MAPPING) if tags is None else tags
+    tags = tags + [f"UnmappedDisclosure{j}" for j in range(extra_tags)]
+    us_gaap = {}
+    for tag in tags:
+        level = rng.uniform(1e8, 1e10)
+        entries = []
+        for i in range(periods):
+            fy, q = 2000 + i // 4, i % 4 + 1
+            filed = f"{fy}-{q * 3:02d}-28" if q < 4 else f"{fy + 1}-01-30"
+            for back in range(comparatives + 1):
+                entries.append({
+                    "end": f"{fy - back}-{q * 3:02d}-28",
+                    "val": round(level * (1 + 0.02 * (i - back)) * rng.uniform(0.95, 1.05)),
+                    "accn": f"{cik:010d}-{fy % 100:02d}-{i:06d}",
+                    "fy": fy,
+                    "fp": FISCAL_PERIODS[q - 1],
+                    "form": "10-K" if q == 4 else "10-Q",
+                    "filed": filed,
+                })
+        us_gaap[tag] = {"label": tag, "description": f"{tag} description", "units": {"USD": entries}}
+    return {"cik": cik, "entityName": f"Synthetic {cik}", "facts": {"us-gaap": us_gaap}}
+
+
+def synthetic_universe(tickers: int, **kwargs: Any) -> Dict[str, int]:
+    """Ticker -> CIK names for a synthetic universe; payloads come from synthetic_companyfacts(cik=...)."""
+    return {f"SYN{i:04d}": 900_000 + i for i in range(tickers)}
+
+
+def synthetic_facts(tickers: int = 1, filings: int = 120, comparatives: int = 4, seed: int = 0) -> pd.DataFrame:
+    """Long-form facts shaped like companyfacts extraction output, built column-wise for large panels.
+
+    Every filing reports each mapped tag plus ``comparatives`` prior-period values
+    under the same (fy, fp, filed), as 10-K/10-Q comparatives do.
+    """
+    rng = np.random.default_rng(seed)
+    tags = list(PILLAR_MAPPING) + ["AccountsPayableCurrent", "Goodwill", "LongTermDebt"]
+    per_ticker = filings * len(tags) * (comparatives + 1)
+    filing = np.tile(np.repeat(np.arange(filings), len(tags) * (comparatives + 1)), tickers)
+    filed = pd.Timestamp("1990-01-01") + pd.to_timedelta(filing * 91, unit="D")
+    return pd.DataFrame({
+        "ticker": np.repeat([f"T{i:05d}" for i in range(tickers)], per_ticker),
+        "metric": np.tile(np.repeat(tags, comparatives + 1), filings * tickers),
+        "value": rng.normal(1e9, 2e8, per_ticker * tickers).round(),
+        "unit": "USD",
+        "decimals": None,
+        "filed": filed.strftime("%Y-%m-%d"),
+        "fy": 1990 + filing // 4,
+        "fp": np.asarray(FISCAL_PERIODS)[filing % 4],
+    })
+
+
+def synthetic_transcript(lines: int, seed: int = 0, punctuation: float = 0.9) -> str:
+    """Speaker turns of prose; ``punctuation`` is the share of lines carrying commas or figures.
+
+    Lines without them are the ones the legacy speaker-label regex rescans.
+    """
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+        if rng.random() < punctuation:
+            sentence = f"{sentence}, up {rng.randint(1, 40)}% year over year."
+        else:
+            sentence += "."
+        if i % 12 == 0:
+            sentence = f"{rng.choice(SPEAKERS)}: {sentence}"
+        out.append(sentence)
+    return "\n".join(out) + "\n"
+
+
+def unpunctuated_run(lines: int) -> str:
+    """A long stretch of capitalised, comma-free lines: quadratic for the legacy label regex."""
+    return "The quarter went well and demand was strong\n" * lines + "Thanks, all.\n"
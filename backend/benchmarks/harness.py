@@ -0,0 +1,74 @@
+"""Timing, result files and regression checks shared by the benchmarks."""
+import json
+import time
+import platform
+import subprocess
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """Wall-clock statistics for ``fn`` in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return latency_summary(samples)
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples_ms, dtype=float)
+    if values.size == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "min_ms": round(float(values.min()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(suite: str, results: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """Stores a run as JSON with enough metadata to compare it against later runs."""
+    stamp = datetime.now(timezone.utc)
+    path = path or RESULTS_DIR / f"{suite}-{stamp.strftime('%Y%m%dT%H%M%SZ')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "suite": suite,
+        "created": stamp.isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2, metric: str = "p50_ms") -> List[str]:
+    """Names of benchmarks whose ``metric`` regressed by more than ``threshold`` (0.2 = 20%)."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name, {}).get(metric)
+        after = result.get(metric) if isinstance(result, dict) else None
+        if before and after and after > before * (1 + threshold):
+            regressions.append(f"{name}: {metric} {before:.3f} -> {after:.3f} ({after / before - 1:+.0%})")
+    return regressions
@@ -0,0 +1,176 @@
+"""HTTP load driver: the app in-process against a local stub SEC backend.
+
+    python -m benchmarks.load --tickers 20 --requests 2000 --concurrency 32
+
+Configuration is read at import time, so the data directory, SEC base URL and
+ticker registry are pointed at throwaway locations before the app is imported.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+COMPANYFACTS_PATH = re.compile(r"/api/xbrl/companyfacts/CIK(\d+)\.json")
+
+
+class StubSECServer:
+    """Serves synthetic companyfacts for any CIK, generating each payload once."""
+
+    def __init__(self, periods: int = 40, extra_tags: int = 200):
+        self.periods = periods
+        self.extra_tags = extra_tags
+        self.requests = 0
+        self._payloads: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                match = COMPANYFACTS_PATH.fullmatch(self.path)
+                status, body = (200, stub.payload(int(match.group(1)))) if match else (404, b"")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def payload(self, cik: int) -> bytes:
+        from benchmarks.generators import synthetic_companyfacts
+
+        with self._lock:
+            self.requests += 1
+            if cik not in self._payloads:
+                facts = synthetic_companyfacts(periods=self.periods, extra_tags=self.extra_tags, cik=cik, seed=cik)
+                self._payloads[cik] = json.dumps(facts).encode()
+            return self._payloads[cik]
+
+    def __enter__(self) -> "StubSECServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def _drive(client: Any, paths: List[str], concurrency: int) -> Dict[str, Any]:
+    """Issues ``paths`` with at most ``concurrency`` requests in flight."""
+    from benchmarks.harness import latency_summary
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    queue = iter(paths)
+
+    async def worker() -> None:
+        for path in queue:
+            started = time.perf_counter()
+            try:
+                status = (await client.get(path)).status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        **latency_summary(latencies),
+        "requests_per_s": round(len(paths) / elapsed, 1) if elapsed else 0.0,
+        "status": dict(statuses),
+    }
+
+
+def _phases(tickers: List[str], requests: int, seed: int) -> List[Tuple[str, List[str]]]:
+    """(name, paths) for each phase; cold phases hit every ticker once."""
+    rng = random.Random(seed)
+    return [
+        ("load.health", ["/health"] * requests),
+        ("load.cold.financials", [f"/v1/financials/{t}" for t in tickers]),
+        ("load.cold.drift", [f"/v1/drift/{t}" for t in tickers]),
+        ("load.warm.financials", [f"/v1/financials/{rng.choice(tickers)}" for _ in range(requests)]),
+        ("load.warm.drift", [f"/v1/drift/{rng.choice(tickers)}" for _ in range(requests)]),
+        ("load.warm.drift_history", [f"/v1/drift/{rng.choice(tickers)}/history" for _ in range(requests // 4)]),
+    ]
+
+
+async def _run_phases(tickers: List[str], requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    import httpx
+    from app.main import app
+    from app.services.executors import shutdown_pools
+
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for name, paths in _phases(tickers, requests, seed):
+                results[name] = await _drive(client, paths, concurrency)
+            results["load.cache_stats"] = (await client.get("/cache/stats")).json()
+    finally:
+        shutdown_pools()
+    return results
+
+
+def run(tickers: int = 20, requests: int = 2000, concurrency: int = 32, periods: int = 40,
+        extra_tags: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """Cold and warm phases over the financials and drift routes.
+
+    Must run before anything imports ``app``: configuration is bound on first import.
+    """
+    if "app.config" in sys.modules:
+        raise RuntimeError("benchmarks.load must configure the app before it is imported; run it in its own process")
+
+    names = [f"SYN{i:04d}" for i in range(tickers)]
+    with tempfile.TemporaryDirectory(prefix="drift-bench-") as workdir, StubSECServer(periods, extra_tags) as sec:
+        registry = Path(workdir) / "tickers.csv"
+        registry.write_text("".join(f"{t},{900_000 + i}\n" for i, t in enumerate(names)))
+        os.environ.update({
+            "DATA_DIR": str(Path(workdir) / "data"),
+            "SEC_BASE_URL": sec.url,
+            "SEC_COMPANY_TICKERS_PATH": str(registry),
+        })
+        results = asyncio.run(_run_phases(names, requests, concurrency, seed))
+        results["load.config"] = {
+            "tickers": tickers, "requests": requests, "concurrency": concurrency,
+            "periods": periods, "extra_tags": extra_tags, "sec_requests": sec.requests,
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test the API against a stubbed SEC backend.")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per warm phase")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--periods", type=int, default=40)
+    parser.add_argument("--extra-tags", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results here instead of stdout")
+    args = parser.parse_args(argv)
+    results = run(args.tickers, args.requests, args.concurrency, args.periods, args.extra_tags, args.seed)
+    if args.output:
+        args.output.write_text(json.dumps(results))
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Per-stage timings of the ingestion -> drift pipeline on synthetic inputs.
+
+    python -m benchmarks.micro --periods 40 --extra-tags 200
+"""
+import json
+import argparse
+import numpy as np
+from typing import Any, Dict, List, Optional
+from app.config import MOMENTUM_WEIGHTS
+from app.core.normalization import normalize_financial_data
+from app.core.feature_engineering import engineering_financial_features
+from app.core.backtest import sweep_weights, weight_grid
+from app.core.drift_engine import classify_drift, compute_momentum_vector
+from app.core.transcript_parser import clean_transcript_text
+from app.services.ingestion_service import IngestionService
+from benchmarks.generators import synthetic_companyfacts, synthetic_transcript
+from benchmarks.harness import time_call
+
+
+def run(periods: int = 40, extra_tags: int = 200, transcript_lines: int = 2000, repeat: int = 20) -> Dict[str, Any]:
+    """Times each stage on the output of the previous one, so inputs match production shapes."""
+    payload = synthetic_companyfacts(periods=periods, extra_tags=extra_tags)
+    facts_df = IngestionService.extract_facts_to_df("SYN", payload)
+    normalized_df = normalize_financial_data(facts_df)
+    features_df = engineering_financial_features(normalized_df)
+    transcript = synthetic_transcript(transcript_lines)
+    # A universe-by-period panel of drift scores, as classified in what-if runs
+    drift_panel = np.random.default_rng(0).normal(scale=0.4, size=(5000, periods))
+    # ~1000 candidate weight vectors over 500 tickers x periods x 3 features
+    sweep_tensor = np.random.default_rng(1).normal(scale=0.3, size=(500, periods, 3))
+    sweep_candidates = weight_grid(3, 44)
+
+    cases = {
+        "extract_facts_to_df": lambda: IngestionService.extract_facts_to_df("SYN", payload),
+        "normalize_financial_data": lambda: normalize_financial_data(facts_df),
+        "engineering_financial_features": lambda: engineering_financial_features(normalized_df),
+        "compute_momentum_vector": lambda: compute_momentum_vector(features_df, MOMENTUM_WEIGHTS["financial"]),
+        "classify_drift": lambda: classify_drift(drift_panel),
+        "sweep_weights": lambda: sweep_weights(sweep_tensor, sweep_candidates, sweep_tensor[..., :2]),
+        "clean_transcript_text": lambda: clean_transcript_text(transcript),
+    }
+    return {f"micro.{name}": time_call(fn, repeat) for name, fn in cases.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark the pipeline stages.")
+    parser.add_argument("--periods", type=int, default=40)
+    parser.add_argument("--extra-tags", type=int, default=200, help="Unmapped tags padding each payload")
+    parser.add_argument("--transcript-lines", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.periods, args.extra_tags, args.transcript_lines, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
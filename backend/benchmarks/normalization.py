@@ -0,0 +1,47 @@
+"""pivot_pillars against the original pivot_table implementation on synthetic SEC facts.
+
+    python -m benchmarks.normalization --tickers 1 --filings 120
+"""
+import time
+import json
+import argparse
+from typing import Callable, Dict, Any, List, Optional
+from app.core.normalization import pivot_pillars, _pivot_pillars_table
+from benchmarks.generators import synthetic_facts
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(tickers: int = 1, filings: int = 120, comparatives: int = 4, repeat: int = 5) -> Dict[str, Any]:
+    facts = synthetic_facts(tickers, filings, comparatives)
+    legacy = _time(lambda: _pivot_pillars_table(facts), repeat)
+    vectorized = _time(lambda: pivot_pillars(facts), repeat)
+    return {
+        "rows": len(facts),
+        "tickers": tickers,
+        "filings_per_ticker": filings,
+        "pivot_table_seconds": round(legacy, 4),
+        "vectorized_seconds": round(vectorized, 4),
+        "speedup": round(legacy / vectorized, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fact normalization.")
+    parser.add_argument("--tickers", type=int, default=1)
+    parser.add_argument("--filings", type=int, default=120)
+    parser.add_argument("--comparatives", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.tickers, args.filings, args.comparatives, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Runs the benchmark suites, stores the results as JSON and checks them against a baseline.
+
+    python -m benchmarks.run --suite all --output benchmarks/results/latest.json
+    python -m benchmarks.run --suite startup --repeat 5
+    python -m benchmarks.run --suite micro --baseline benchmarks/results/baseline.json --threshold 0.2
+
+Exits with status 1 when any benchmark's metric regressed past the threshold.
+"""
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from benchmarks.harness import compare, write_results
+
+
+def _run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    # A fresh interpreter: the load driver configures the app before importing it
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "load.json"
+        subprocess.run([
+            sys.executable, "-m", "benchmarks.load",
+            "--tickers", str(args.tickers), "--requests", str(args.requests),
+            "--concurrency", str(args.concurrency), "--output", str(output),
+        ], check=True, cwd=Path(__file__).resolve().parent.parent)
+        return json.loads(output.read_text())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run benchmark suites and compare against a baseline.")
+    parser.add_argument("--suite", choices=["micro", "load", "startup", "all"], default="micro")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<suite>-<time>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--metric", default="p50_ms", help="Latency statistic compared against the baseline")
+    parser.add_argument("--repeat", type=int, default=20, help="Micro-benchmark repetitions (startup runs at most 5)")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {}
+    if args.suite in ("micro", "all"):
+        from benchmarks import micro
+        results.update(micro.run(repeat=args.repeat))
+    if args.suite in ("load", "all"):
+        results.update(_run_load(args))
+    if args.suite in ("startup", "all"):
+        from benchmarks import startup
+        results.update(startup.run(repeat=min(args.repeat, 5)))
+
+    path = write_results(args.suite, results, args.output)
+    print(f"Results written to {path}")
+    for name, result in results.items():
+        if "p50_ms" in result:
+            throughput = f"  {result['requests_per_s']:>9.1f} req/s" if "requests_per_s" in result else ""
+            print(f"{name:<40} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms{throughput}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(path) as f:
+            current = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.metric)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
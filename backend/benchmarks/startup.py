@@ -0,0 +1,85 @@
+"""Cold-start cost: importing app.main, and process start to the first /health response.
+
+    python -m benchmarks.startup --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from benchmarks.harness import latency_summary
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["pandas", "numpy", "openai", "requests"]
+
+IMPORT_PROBE = f"""
+import sys, time, json
+started = time.perf_counter()
+import app.main
+print(json.dumps({{"ms": (time.perf_counter() - started) * 1000, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _environment(data_dir: str) -> Dict[str, str]:
+    return {**os.environ, "DATA_DIR": data_dir, "PYTHONPATH": str(BACKEND_DIR)}
+
+
+def time_import(data_dir: str) -> Dict[str, Any]:
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True,
+                         cwd=BACKEND_DIR, env=_environment(data_dir))
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def time_first_response(data_dir: str, timeout: float = 60.0) -> float:
+    """Milliseconds from spawning uvicorn until /health answers 200."""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_environment(data_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="drift-startup-") as data_dir:
+        imports = [time_import(data_dir) for _ in range(repeat)]
+        first_response = [time_first_response(data_dir) for _ in range(repeat)]
+    return {
+        "startup.import_app_main": {**latency_summary([i["ms"] for i in imports]), "heavy_modules_loaded": imports[-1]["loaded"]},
+        "startup.first_health_response": latency_summary(first_response),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure import time and time to first response.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Transcript cleaner throughput on synthetic earnings-call transcripts.
+
+    python -m benchmarks.transcript_cleaner --lines 100000
+"""
+import io
+import time
+import json
+import argparse
+from typing import Callable, Dict, Any, List, Optional
+from app.core.transcript_parser import clean_transcript_text, _clean_transcript_text_regex
+from benchmarks.generators import synthetic_transcript, unpunctuated_run
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(lines: int = 100_000, repeat: int = 3, punctuation: float = 0.9, pathological_lines: int = 4000) -> Dict[str, Any]:
+    text = synthetic_transcript(lines, punctuation=punctuation)
+    mb = len(text.encode("utf-8")) / 1e6
+    assert clean_transcript_text(text) == _clean_transcript_text_regex(text)
+
+    cases = {
+        "legacy_regex": lambda: _clean_transcript_text_regex(text),
+        "streaming_str": lambda: clean_transcript_text(text),
+        "streaming_file": lambda: clean_transcript_text(io.StringIO(text)),
+    }
+    results: Dict[str, Any] = {"lines": lines, "mb": round(mb, 2), "punctuation": punctuation}
+    for name, fn in cases.items():
+        seconds = _time(fn, repeat)
+        results[name] = {"seconds": round(seconds, 4), "mb_per_s": round(mb / seconds, 1)}
+
+    if pathological_lines:
+        worst = unpunctuated_run(pathological_lines)
+        results["unpunctuated_run"] = {
+            "lines": pathological_lines,
+            "legacy_regex_seconds": round(_time(lambda: _clean_transcript_text_regex(worst), 1), 4),
+            "streaming_seconds": round(_time(lambda: clean_transcript_text(worst), repeat), 4),
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the transcript cleaner.")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--punctuation", type=float, default=0.9, help="Share of lines with label-stopping characters")
+    parser.add_argument("--pathological-lines", type=int, default=4000, help="Unpunctuated run length (0 to skip)")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.lines, args.repeat, args.punctuation, args.pathological_lines), indent=2))
+
+
+if __name__ == "__main__":
+    main()
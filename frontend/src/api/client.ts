@@ -1,5 +1,6 @@
 import axios from 'axios';
 import { FinancialsResponse, NarrativeResponse, DriftResponse } from './types';
+import { decodeCompact } from './compact';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/v1';
 
@@ -10,14 +11,17 @@ const apiClient = axios.create({
     },
 });
 
+// Float series are requested as packed float32 arrays and decoded here
+const compact = { params: { encoding: 'compact' } };
+
 export const fetchFinancials = async (ticker: string): Promise<FinancialsResponse> => {
-    const response = await apiClient.get<FinancialsResponse>(`/financials/${ticker}`);
-    return response.data;
+    const response = await apiClient.get<Record<string, unknown>>(`/financials/${ticker}`, compact);
+    return decodeCompact<FinancialsResponse>(response.data);
 };
 
 export const fetchNarrative = async (ticker: string): Promise<NarrativeResponse> => {
-    const response = await apiClient.get<NarrativeResponse>(`/narrative/${ticker}`);
-    return response.data;
+    const response = await apiClient.get<Record<string, unknown>>(`/narrative/${ticker}`, compact);
+    return decodeCompact<NarrativeResponse>(response.data);
 };
 
 export const fetchDrift = async (ticker: string): Promise<DriftResponse> => {
@@ -0,0 +1,41 @@
+// Decoder for `?encoding=compact` responses: float arrays arrive as
+// { dtype: 'float32' | 'float64', shape: [n], data: <base64 little-endian values> }.
+// Ratios are float32; dollar amounts stay float64 so they decode exactly.
+
+export interface PackedArray {
+    dtype: 'float32' | 'float64';
+    shape: number[];
+    data: string;
+}
+
+const isPackedArray = (value: unknown): value is PackedArray =>
+    typeof value === 'object' &&
+    value !== null &&
+    ((value as PackedArray).dtype === 'float32' || (value as PackedArray).dtype === 'float64') &&
+    Array.isArray((value as PackedArray).shape) &&
+    typeof (value as PackedArray).data === 'string';
+
+export const decodePacked = (packed: PackedArray): number[] => {
+    const binary = atob(packed.data);
+    const view = new DataView(new ArrayBuffer(binary.length));
+    for (let i = 0; i < binary.length; i++) {
+        view.setUint8(i, binary.charCodeAt(i));
+    }
+    const length = packed.shape.reduce((n, dim) => n * dim, 1);
+    const wide = packed.dtype === 'float64';
+    const values = new Array<number>(length);
+    for (let i = 0; i < length; i++) {
+        // Explicit little-endian reads, independent of host byte order
+        values[i] = wide ? view.getFloat64(i * 8, true) : view.getFloat32(i * 4, true);
+    }
+    return values;
+};
+
+// Replaces every packed array in a response with a plain number[].
+export const decodeCompact = <T>(payload: Record<string, unknown>): T => {
+    const decoded: Record<string, unknown> = {};
+    for (const [key, value] of Object.entries(payload)) {
+        decoded[key] = isPackedArray(value) ? decodePacked(value) : value;
+    }
+    return decoded as T;
+};
@@ -1,5 +1,5 @@
 export interface FinancialsResponse {
-    ticker: str;
+    ticker: string;
     quarterly_index: string[];
     revenue_growth: number[];
     ocf_growth: number[];
@@ -13,6 +13,7 @@ export interface NarrativeResponse {
     risk_mentions: number[];
     forward_looking_density: number[];
     narrative_momentum: number[];
+    periods?: string[] | null;
 }
 
 export interface DriftResponse {